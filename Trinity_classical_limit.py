@@ -1,26 +1,20 @@
 from manim import * 
 import numpy as np
 from waveform import * 
+from bloch_sphere import * # bloch_sphere.py
+from spin_ensemble import * # spin_ensemble.py
+from scheduled_motion import * # scheduled_motion.py
+from level_of_detail import * # level_of_detail.py
+from wavefunction import * # wavefunction.py
+from collective_spin import * # collective_spin.py
 
 # manim -pqh Trinity_classical_limit.py ClassicalLimitAnimation
 class ClassicalLimitAnimation(ThreeDScene):
     def construct(self):
         
-        # rotation_tracker = ValueTracker(0.0) # For tracking how far the vector has spun
-        axis_x = ValueTracker(1.0)
-        axis_y = ValueTracker(0.0)
-        axis_z = ValueTracker(0.0)
-        vector_spin_rate = ValueTracker(1.0)
         sphere_shake_rate = ValueTracker(20)
         sphere_shake_amplitude = ValueTracker(0.5)
         
-        def rotate_spin_vector(mob, dt):
-            """Rotates the Mobject about the 'rotation_axis', at 'rate' rotations per second"""
-            angle_increment = dt * vector_spin_rate.get_value() * 2 * PI  # Rotation increment per frame
-            rotation_axis = np.array([axis_x.get_value(),axis_y.get_value(),axis_z.get_value()])
-            mob.rotate(angle_increment, axis=rotation_axis, about_point=ORIGIN)
-            # rotation_tracker.increment_value(angle_increment)
-
         # def shake_object(mob, dt):
         #     """Shakes Mobject about the 'shake_direction', at 'rate' cycles per second"""
         #     movement_increment = sphere_shake_amplitude.get_value() * dt * np.cos(dt * sphere_shake_rate.get_value() * 2 * PI)  # Rotation increment per frame
@@ -29,18 +23,7 @@ class ClassicalLimitAnimation(ThreeDScene):
         
         self.set_camera_orientation(phi=80 * DEGREES,theta=30*DEGREES, distance = 6)
         sphere_radius = float(2)
-        sphere_mesh = Surface(
-            lambda u, v: self.sphere_param(u,v,sphere_radius),
-            u_range = [0,PI],
-            v_range=[0,TAU],
-            resolution=(24,48)
-        )
-        sphere_mesh.set_style(
-            stroke_width=1,
-            stroke_opacity=0.3,
-            fill_opacity=0.1
-        )
-        sphere_mesh.set_color(BLUE)
+        sphere_mesh = BlochSphere(radius=sphere_radius, resolution=lod_resolution((24,48)), color=BLUE)
         
         particle_label = Text("particle", font_size=36).move_to([0,2.5,0]) # Particle label
 
@@ -60,20 +43,21 @@ class ClassicalLimitAnimation(ThreeDScene):
         # self.add_fixed_orientation_mobjects(x_label, y_label, z_label)
         self.wait(1)
         
-        arrow_3d.add_updater(lambda mob, dt: rotate_spin_vector(mob, dt))
+        # Spin the vector about the x axis, at 'rate' rotations per second
+        vector_spin = ScheduledRotation(arrow_3d, RateSchedule(rate=0.6), axis=RIGHT, about_point=ORIGIN)
+        arrow_3d.add_updater(vector_spin.updater)
         # arrow_3d.add_updater(lambda mob, dt: shake_object(mob, dt))
         # sphere_mesh.add_updater(lambda mob, dt: shake_object(mob, dt))
         
-        vector_spin_rate.set_value(0.6)
         sphere_shake_amplitude.set_value(0.5)
         self.wait(0.25)
-        vector_spin_rate.set_value(-1.2)
+        vector_spin.set_rate(-1.2)
         sphere_shake_amplitude.set_value(1)
         self.wait(0.25)
-        vector_spin_rate.set_value(0.6)
+        vector_spin.set_rate(0.6)
         sphere_shake_amplitude.set_value(0.5)
         self.wait(0.25)
-        vector_spin_rate.set_value(0)
+        vector_spin.set_rate(0)
 
         # wave_3d = Surface(
         #     lambda u, v: self.gaussian_3d(u,v, amplitude=1.5, spread=1.0),
@@ -134,7 +118,13 @@ class ClassicalLimitAnimation(ThreeDScene):
         
         self.wait(1)
         
-        wave_line_2d = self.create_1d_wave_function(x_min=-4, x_max = 4).rotate(PI/2, axis=[0,1,0], about_point=ORIGIN).rotate(PI/2, axis=[1,0,0], about_point=ORIGIN)
+        # Position packet and its FFT momentum partner, linked so squeezing one widens the other
+        wave_packets = WavePacketPair(x_range=(-4, 4), spread=5, twist=0.5)
+        barrier_potential = lambda x: 10 * ((x > 1.5) & (x < 1.8))
+        barrier = Rectangle(width=0.3, height=2, stroke_width=0, fill_color=GREY, fill_opacity=0.4).move_to([1.65, 0, 0])
+        VGroup(wave_packets, barrier).rotate(PI/2, axis=[0,1,0], about_point=ORIGIN).rotate(PI/2, axis=[1,0,0], about_point=ORIGIN)
+        wave_line_2d = wave_packets.position_curve
+        momentum_wave = wave_packets.momentum_curve
         # wave_line_2d.move_to(IN*2)
 
         self.play(
@@ -146,8 +136,19 @@ class ClassicalLimitAnimation(ThreeDScene):
         self.wait(1)
         
         position_label = Text('Position', font_size=36).move_to([0,0,3])
-        momentum_label = Text('Position', font_size=36).move_to([0,0,-1])
-        self.play(FadeIn(position_label, momentum_label))
+        momentum_label = Text('Momentum', font_size=36).move_to([0,0,-1])
+        self.play(FadeIn(position_label, momentum_label), FadeIn(momentum_wave))
+        self.add(wave_packets)
+
+        # Squeeze the position packet to 0.3x its width; the momentum packet broadens by 1/0.3
+        self.play(wave_packets.spread_tracker.animate.set_value(5 * 0.3**2), run_time=2)
+        self.wait(1)
+
+        # Let the squeezed packet evolve under the Schrodinger equation: it disperses, and part of it tunnels through the barrier
+        self.play(FadeIn(barrier))
+        wave_packets.evolve(potential=barrier_potential, time_scale=0.5)
+        self.wait(3)
+        wave_packets.clear_updaters()
 
         # bracket_left = Line(UP, DOWN).set_stroke(width=5).move_to(LEFT*5 + DOWN*2)
         # bracket_right = Line(UP, DOWN).set_stroke(width=5).move_to(LEFT*5 + DOWN*2)
@@ -194,14 +195,8 @@ class ClassicalLimitAnimation(ThreeDScene):
         #     sphere_mesh.animate.set_opacity(0.3),
         #     run_time=2
         # )
-        # ensemble_arrows = VGroup()
-        # n_spins =6
-        # for i in range(n_spins):
-        #     theta = np.random.uniform(0,PI)
-        #     phi = np.random.uniform(0,TAU)
-        #     direction = self.spherical_to_cartesian(sphere_radius*0.9, theta, phi)
-        #     arrow = Arrow3D(ORIGIN, direction).set_color(BLUE)
-        #     ensemble_arrows.add(arrow)
+        # ensemble_arrows = SpinEnsemble(random_spins(n_spins=6, length=sphere_radius*0.9), color=BLUE)
+        # ensemble_arrows.face_camera(self.camera)
 
         # self.play(
         #     FadeIn(ensemble_arrows, scale = 0.5), 
@@ -209,31 +204,44 @@ class ClassicalLimitAnimation(ThreeDScene):
         # )
         # self.wait(1)
 
-        def squeeze_updater(mob, alpha):
-            for i, arrow in enumerate(mob):
-                end = arrow.get_end()
-                r = np.linalg.norm(end)
-                x, y, z = end /r if r !=0 else (0,0,1)
+        # def squeeze_evolution(spins, alpha):
+        #     return squeeze_spins(spins, squeeze_factor=1-0.8*alpha, stretch_factor=1+0.5*alpha)
 
-                z_new = z * (1 -0.8*alpha)
-                y_new = y * (1+0.5*alpha)
-                new_end = np.array([x*r, y_new*r, z_new*r])
+        # self.play(EvolveSpins(ensemble_arrows, squeeze_evolution), run_time=3)
+        # self.wait(1)
 
-                arrow.put_start_and_end_on(ORIGIN, new_end)
+        self.play(
+            FadeOut(wave_packets),
+            FadeOut(barrier),
+            FadeOut(position_label),
+            FadeOut(momentum_label),
+            run_time=1
+        )
 
-        # self.play(UpdateFromAlphaFunc(ensemble_arrows, squeeze_updater), run_time=3)
-        # self.wait(1)
+        # N = 100 spins twisted by chi Jz^2, simulated in the Dicke basis: the uncertainty circle at the
+        # collective spin's tip squeezes into an ellipse, drawn to scale over the state's Husimi Q on the sphere
+        n_spins = 100
+        collective_spin = CollectiveSpin(n_spins=n_spins, chi=0.02, theta=PI/2, phi=-PI/12)
+        spin_view = CollectiveSpinView(collective_spin, radius=sphere_radius, noise_radius=sphere_radius/np.sqrt(n_spins), color=YELLOW)
+        spin_view.face_camera(self.camera)
+        husimi_sphere = HusimiSphere(collective_spin.psi, radius=sphere_radius, resolution=lod_resolution((48,96)))
+        self.play(FadeIn(spin_view), FadeIn(husimi_sphere), FadeOut(sphere_mesh), run_time=1)
+        spin_view.add_updater(collective_spin.updater(spin_view))
+        husimi_sphere.add_updater(lambda mob: mob.set_state(collective_spin.psi))
 
         spin_squeeze_eq = MathTex(r"\Delta J_{\perp} \sim \frac{1}{\sqrt{N}}")
         self.add_fixed_in_frame_mobjects(spin_squeeze_eq)
         spin_squeeze_eq.to_edge(UP)
         self.play(Write(spin_squeeze_eq), run_time=2)
+        spin_view.clear_updaters()
+        husimi_sphere.clear_updaters()
         self.wait(2)
 
         self.play(
             # FadeOut(ensemble_arrows),
             FadeOut(spin_squeeze_eq),
-            FadeOut(sphere_mesh),
+            FadeOut(spin_view),
+            FadeOut(husimi_sphere),
             FadeOut(x_label),
             FadeOut(y_label),
             FadeOut(z_label),
@@ -242,42 +250,17 @@ class ClassicalLimitAnimation(ThreeDScene):
         self.wait()
 
 
-    def sphere_param(self, u, v, R):
-        x = R * np.sin(u) * np.cos(v)
-        y = R * np.sin(u) * np.sin(v)
-        z = R * np.cos(u)
-        return np.array([x, y, z])
-
     def gaussian_3d(self, x, y, amplitude=1, spread=1.0):
         z = amplitude * np.exp(-((x**2 + y**2)/(2*spread**2)))
         return np.array([x, y, z])
 
     def create_1d_wave_function(self, x_min=-4, x_max=4, color=BLUE_E, amplitude=1.0, spread = 5, twist = 0.5):
-        func = lambda x: amplitude * np.exp(-(1/spread) * x**2) * np.cos(2 * PI * twist * x)
-        resolution = 200
-        points = []
-        for i in range(resolution + 1):
-            x = x_min + (x_max - x_min)*i/resolution
-            y = func(x)
-            points.append([x, y, 0])
-        wave_line = VMobject()
-        wave_line.set_points_as_corners(points)
-        wave_line.set_stroke(color, width=2)
-        return wave_line
+        x = np.linspace(x_min, x_max, lod_samples(200) + 1)
+        return WavefunctionCurve(x, gaussian_packet(x, amplitude, spread, twist), color=color)
     
     def create_2d_wave_function(self, x_min=-4, x_max=4, color=BLUE_E, amplitude=1.0, spread = 5, twist = 0.5):
-        func = lambda x: [amplitude * np.exp(-(1/spread) * x**2) * np.cos(2 * PI * twist * x), amplitude * np.exp(-(1/spread) * x**2) * np.sin(2 * PI * twist * x)]
-        resolution = 200
-        points = []
-        for i in range(resolution + 1):
-            x = x_min + (x_max - x_min)*i/resolution
-            y = func(x)[0]
-            z = func(x)[0]
-            points.append([x, y, z])
-        wave_line = VMobject()
-        wave_line.set_points_as_corners(points)
-        wave_line.set_stroke(color, width=2)
-        return wave_line
+        x = np.linspace(x_min, x_max, lod_samples(200) + 1)
+        return WavefunctionCurve(x, gaussian_packet(x, amplitude, spread, twist), complex_plane=True, color=color)
 
     def spherical_to_cartesian(self, r, theta, phi):
         x = r * np.sin(theta) * np.cos(phi)
@@ -0,0 +1,166 @@
+from manim import *
+import numpy as np
+from spin_ensemble import arrow_points, camera_direction
+
+
+def _grid_axis(axis_range):
+    """The sample positions along one axis, with the end included like ArrowVectorField does."""
+    start, end, step = (list(axis_range) + [0.5])[:3]
+    return np.arange(start, end + step, step)
+
+
+class ArrowField(VGroup):
+    """
+    A field of arrows on a grid, like ArrowVectorField, whose field and length
+    functions can be swapped at any time.
+
+    The field is evaluated once for the whole grid, as an (N, 3) array of
+    positions, and every arrow's shaft and tip are written into two shared point
+    buffers that the arrows' mobjects view. Changing the field recomputes those
+    buffers in place instead of building new Arrow mobjects, and `RetargetField`
+    animates between two fields by blending their vectors.
+
+    Like ArrowVectorField, arrows start at their grid point, shafts thin out for
+    short arrows, and tips are a quarter of the arrow at most. Tips are flat and
+    turned towards `view_direction`. Move the field with shift/move_to.
+
+    Attributes:
+        func (function): Maps positions to field vectors. Called with an (N, 3) array;
+            may return one vector for a uniform field.
+        length_func (function): Maps field magnitudes to drawn arrow lengths, elementwise.
+        positions (np.ndarray): The (N, 3) grid positions the field is evaluated at.
+        vectors (np.ndarray): The (N, 3) drawn arrow vectors.
+        view_direction (np.ndarray): The direction the tips face.
+    """
+
+    def __init__(
+        self,
+        func,
+        x_range=None,
+        y_range=None,
+        z_range=None,
+        length_func=lambda norm: 0.45 * sigmoid(norm),
+        color=WHITE,
+        stroke_width=6,
+        max_stroke_width_to_length_ratio=5,
+        tip_length=DEFAULT_ARROW_TIP_LENGTH,
+        max_tip_length_to_length_ratio=0.25,
+        view_direction=OUT,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.func = func
+        self.length_func = length_func
+        self.stroke_width = stroke_width
+        self.max_stroke_width_to_length_ratio = max_stroke_width_to_length_ratio
+        self.tip_length = tip_length
+        self.max_tip_length_to_length_ratio = max_tip_length_to_length_ratio
+        self.view_direction = np.asarray(view_direction, dtype=float)
+
+        x_range = x_range or [np.floor(-config["frame_width"] / 2), np.ceil(config["frame_width"] / 2)]
+        y_range = y_range or [np.floor(-config["frame_height"] / 2), np.ceil(config["frame_height"] / 2)]
+        axes = [_grid_axis(x_range), _grid_axis(y_range), _grid_axis(z_range) if z_range else np.zeros(1)]
+        self.positions = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, 3)
+        self._offset = np.zeros(3)
+
+        # Every arrow's points are views into these buffers
+        n_arrows = len(self.positions)
+        self._shaft_points = np.zeros((n_arrows, 4, 3))
+        self._tip_points = np.zeros((n_arrows, 3, 4, 3))
+        self.shafts = [VMobject(stroke_color=color) for _ in range(n_arrows)]
+        self.tips = [VMobject(fill_color=color, fill_opacity=1, stroke_width=0) for _ in range(n_arrows)]
+        self.add(*[VGroup(shaft, tip) for shaft, tip in zip(self.shafts, self.tips)])
+        self.set_vectors(self.evaluate())
+
+    def get_offset(self):
+        """How far the field has been moved from its grid, read from the first arrow's start."""
+        if len(self.shafts) and len(self.shafts[0].points):
+            return self.shafts[0].points[0] - self.positions[0]
+        return self._offset
+
+    def evaluate(self, func=None, length_func=None):
+        """
+        Evaluates a field on the grid in one vectorized call.
+
+        Args:
+            func (function): The field, by default the current one.
+            length_func (function): The length function, by default the current one.
+
+        Returns:
+            np.ndarray: The (N, 3) arrow vectors.
+        """
+        func = self.func if func is None else func
+        length_func = self.length_func if length_func is None else length_func
+        field = np.broadcast_to(np.asarray(func(self.positions), dtype=float), self.positions.shape)
+        norms = np.linalg.norm(field, axis=1, keepdims=True)
+        scales = np.divide(length_func(norms), norms, out=np.zeros_like(norms), where=norms > 0)
+        return field * scales
+
+    def set_vectors(self, vectors):
+        """
+        Redraws every arrow from an (N, 3) array of arrow vectors, writing into the shared buffers.
+
+        Returns:
+            ArrowField: self, for chaining.
+        """
+        self._offset = self.get_offset()
+        self.vectors = np.array(vectors, dtype=float)
+        lengths = np.linalg.norm(self.vectors, axis=1, keepdims=True)
+        tip_lengths = np.minimum(self.tip_length, self.max_tip_length_to_length_ratio * lengths)
+        arrow_points(
+            self.positions + self._offset, self.vectors, tip_lengths, tip_lengths, self.view_direction,
+            shaft_out=self._shaft_points, tip_out=self._tip_points,
+        )
+        stroke_widths = np.minimum(self.stroke_width, self.max_stroke_width_to_length_ratio * lengths[:, 0])
+        for shaft, tip, shaft_points, tip_points, width in zip(
+            self.shafts, self.tips, self._shaft_points, self._tip_points, stroke_widths
+        ):
+            shaft.points = shaft_points
+            tip.points = tip_points.reshape(-1, 3)
+            shaft.stroke_width = width
+        return self
+
+    def set_func(self, func=None, length_func=None):
+        """
+        Swaps the field and/or length function and redraws the arrows.
+
+        Returns:
+            ArrowField: self, for chaining.
+        """
+        self.func = self.func if func is None else func
+        self.length_func = self.length_func if length_func is None else length_func
+        return self.set_vectors(self.evaluate())
+
+    def face_camera(self, camera):
+        """Turns the tips towards a 3D camera."""
+        self.view_direction = camera_direction(camera)
+        return self.set_vectors(self.vectors)
+
+
+class RetargetField(Animation):
+    """
+    Animates an ArrowField to a new field and/or length function by blending the
+    arrow vectors of the old and new fields, so each frame is one in-place redraw.
+
+    Attributes:
+        func (function): The new field, or None to keep the current one.
+        length_func (function): The new length function, or None to keep the current one.
+    """
+
+    def __init__(self, field, func=None, length_func=None, **kwargs):
+        self.func = func
+        self.length_func = length_func
+        super().__init__(field, **kwargs)
+
+    def begin(self):
+        self.start_vectors = self.mobject.vectors.copy()
+        self.end_vectors = self.mobject.evaluate(self.func, self.length_func)
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        alpha = self.rate_func(alpha)
+        self.mobject.set_vectors(self.start_vectors + alpha * (self.end_vectors - self.start_vectors))
+
+    def finish(self):
+        super().finish()
+        self.mobject.set_func(self.func, self.length_func)
@@ -3,6 +3,12 @@ import numpy as np
 import random
 import matplotlib as plt
 from magnetic_field import * # magnetic_field.py
+from numeric_readout import * # numeric_readout.py
+from bloch_sphere import * # bloch_sphere.py
+from arrow_field import * # arrow_field.py
+from scheduled_motion import * # scheduled_motion.py
+from level_of_detail import * # level_of_detail.py
+from section_cache import * # section_cache.py
 
 
 # Camera Fix from https://gist.github.com/abul4fia/1419b181e8e3410ef78e6acc25c3df94#file-fixed_fixing-py-L13
@@ -24,7 +30,7 @@ def make_fixed(*mobs):
         for submob in mob.family_members_with_points():
             submob.fixed = True
 
-class DipoleRotation(ThreeDScene):
+class DipoleRotation(SectionCacheMixin, ThreeDScene):
     def __init__(self, camera_class=MyCamera, ambient_camera_rotation=None,
                  default_angled_camera_orientation_kwargs=None, **kwargs):
         super().__init__(camera_class=camera_class, **kwargs)
@@ -35,27 +41,8 @@ class DipoleRotation(ThreeDScene):
         phi_deg = 60
         theta_deg = 315
         
-        rotation_tracker = ValueTracker(0) # For tracking how far the magnet has spun
-        
-        def rotate_and_track(mob, dt):
-            """Rotates the Mobject about the z hat direction, at 'rate' rotations per second"""
-            angle_increment = dt * magnet_spin_rate.get_value() * 2 * PI  # Rotation increment per frame
-            mob.rotate(angle_increment, axis=OUT)
-            rotation_tracker.increment_value(angle_increment)
-        
         sphere_radius = 1
-        sphere_mesh = Surface(
-            lambda u, v: self.sphere_param(u,v,sphere_radius),
-            u_range = [0,PI],
-            v_range=[0,TAU],
-            resolution=(12,24)
-        )
-        sphere_mesh.set_style(
-            stroke_width=1,
-            stroke_opacity=0.3,
-            fill_opacity=0.1
-        )
-        sphere_mesh.set_color(GRAY_A)
+        sphere_mesh = BlochSphere(radius=sphere_radius, resolution=lod_resolution((12,24)), color=GRAY_A)
         
         # Axes labels
         x_label = Text("x").scale(0.4).move_to([2.2,0,0])
@@ -110,9 +97,11 @@ class DipoleRotation(ThreeDScene):
         )
         
         
-        self.play(FadeIn(B_label_blue), FadeIn(curve_group))
-        self.wait(0.5)
-        self.play(FadeOut(B_label_blue), FadeOut(curve_group))
+        def field_lines():
+            self.play(FadeIn(B_label_blue), FadeIn(curve_group))
+            self.wait(0.5)
+            self.play(FadeOut(B_label_blue), FadeOut(curve_group))
+        self.cached_section("field lines", field_lines)
         
         # Create the bar magnet
         magnet_length = 1.6
@@ -145,18 +134,12 @@ class DipoleRotation(ThreeDScene):
         
         downward_field = lambda pos: IN
         
-        magnet_spin_rate = ValueTracker(1)
-        
         def length_func(length):
             return 0.45 * sigmoid(length)
-        vector_field = ArrowVectorField(downward_field, x_range=[-2,2,0.5], y_range=[-2,2,0.5], color=GREEN, length_func=length_func).shift(1*OUT)
-        vector_field_2 = ArrowVectorField(downward_field, x_range=[-2,2,0.5], y_range=[-2,2,0.5], color=GREEN, length_func=length_func).shift(1*OUT)
         def double_length_func(length):
             return 2 * 0.45 * sigmoid(length)
-        long_vector_field = ArrowVectorField(downward_field, x_range=[-2,2,0.5], y_range=[-2,2,0.5], color=GREEN, length_func=double_length_func).shift(1*OUT)
-        [vector.rotate(theta_deg * DEGREES, axis=OUT) for vector in vector_field]
-        [vector.rotate(theta_deg * DEGREES, axis=OUT) for vector in long_vector_field]
-        [vector.rotate(theta_deg * DEGREES, axis=OUT) for vector in vector_field_2]
+        vector_field = ArrowField(downward_field, x_range=[-2,2,0.5], y_range=[-2,2,0.5], color=GREEN, length_func=length_func).shift(1*OUT)
+        vector_field.face_camera(self.camera)
         
         dot_field = VGroup()
         for x in np.arange(-2, 2.25, 0.5):
@@ -172,35 +155,38 @@ class DipoleRotation(ThreeDScene):
         # Add the vector field to the scene
         self.play(Create(vector_field),FadeIn(B_label_green))
         
-        # Rotate the prism about its z-axis (or any axis you choose)
-        magnet_spin_rate.set_value(0.5)
-        magnet.add_updater(lambda mob, dt: rotate_and_track(mob, dt))
-        
-        self.wait(1)
-        
-        self.play(
-            Transform(vector_field, long_vector_field),B_label_green.animate.set_stroke(width=2), magnet_spin_rate.animate.set_value(1))
-        
-        self.wait(1)
-        self.play(
-            Transform(vector_field, vector_field_2),B_label_green.animate.set_stroke(width=.5), magnet_spin_rate.animate.set_value(0.5))
-        
-        
-        self.wait(1.25)
-        
-        magnet_spin_rate.set_value(0)
+        # Rotate the prism about its z-axis (or any axis you choose), at 'rate' rotations per second
+        magnet_spin = ScheduledRotation(magnet, RateSchedule(rate=0.5), axis=OUT)
+        magnet.add_updater(magnet_spin.updater)
+        
+        def spin_up():
+            self.wait(1)
+            
+            magnet_spin.ramp_rate(1, duration=1)
+            self.play(
+                RetargetField(vector_field, length_func=double_length_func),B_label_green.animate.set_stroke(width=2), run_time=1)
+            
+            self.wait(1)
+            magnet_spin.ramp_rate(0.5, duration=1)
+            self.play(
+                RetargetField(vector_field, length_func=length_func),B_label_green.animate.set_stroke(width=.5), run_time=1)
+            
+            
+            self.wait(1.25)
+        self.cached_section("spin up", spin_up)
+        
+        magnet_spin.set_rate(0)
         self.move_camera(phi=0 * DEGREES, theta=270 * DEGREES, added_anims=[FadeOut(z_label), FadeOut(axes.z_axis), Transform(vector_field, dot_field)])
         
         self.wait(1)
         
         precession_clock_tracker = ValueTracker(0) # For tracking how far the magnet has spun
         
-        theta_label = Tex(r"$\theta_1$").move_to([1.4 * np.cos(rotation_tracker.get_value()),1.4 * np.sin(rotation_tracker.get_value()),0]).scale(0.5)
-        theta_marker = Line(start=[1 * np.cos(rotation_tracker.get_value()),1 * np.sin(rotation_tracker.get_value()),0], end=[1.2 * np.cos(rotation_tracker.get_value()),1.2 * np.sin(rotation_tracker.get_value()),0])
-        t_marker = MarkupText(text = f"t = {precession_clock_tracker.get_value()}.00 s", font_size=36).move_to([4.25, 0, 0])
-        t_marker.add_updater(
-            lambda mob: mob.become(MarkupText(f"t = {precession_clock_tracker.get_value():.2f} s").move_to([4.25, 0, 0]))
-        )
+        theta_1 = magnet_spin.angle
+        theta_label = Tex(r"$\theta_1$").move_to([1.4 * np.cos(theta_1),1.4 * np.sin(theta_1),0]).scale(0.5)
+        theta_marker = Line(start=[1 * np.cos(theta_1),1 * np.sin(theta_1),0], end=[1.2 * np.cos(theta_1),1.2 * np.sin(theta_1),0])
+        t_marker = NumericReadout(precession_clock_tracker.get_value(), prefix="t = ", suffix=" s", font_size=36).move_to([4.25, 0, 0])
+        t_marker.add_updater(lambda mob: mob.set_value(precession_clock_tracker.get_value()))
         
         def update_time(dt):
             precession_clock_tracker.increment_value(dt)
@@ -226,7 +212,7 @@ class DipoleRotation(ThreeDScene):
         self.play(Write(theta_label), Write(theta_marker), Write(t_marker), inside_dots.animate.set_opacity(0.5))
         self.wait(1)
 
-        magnet_spin_rate.set_value(0.25)
+        magnet_spin.set_rate(0.25)
         self.add_updater(update_time)
         
         self.wait(1.01)
@@ -234,30 +220,27 @@ class DipoleRotation(ThreeDScene):
         magnet.clear_updaters()
         self.remove_updater(update_time)
         
-        theta2_label = Tex(r"$\theta_2$").move_to([1.4 * np.cos(rotation_tracker.get_value()),1.4 * np.sin(rotation_tracker.get_value()),0]).scale(0.5)
-        theta2_marker = Line(start=[1 * np.cos(rotation_tracker.get_value()),1 * np.sin(rotation_tracker.get_value()),0], end=[1.2 * np.cos(rotation_tracker.get_value()),1.2 * np.sin(rotation_tracker.get_value()),0])
+        theta_2 = magnet_spin.angle
+        theta2_label = Tex(r"$\theta_2$").move_to([1.4 * np.cos(theta_2),1.4 * np.sin(theta_2),0]).scale(0.5)
+        theta2_marker = Line(start=[1 * np.cos(theta_2),1 * np.sin(theta_2),0], end=[1.2 * np.cos(theta_2),1.2 * np.sin(theta_2),0])
         self.play(Write(theta2_label), Write(theta2_marker))
         self.wait(1)
         
-        omega_eq = Tex(r"$\omega = \Delta \theta / \Delta t$").move_to([-4,0.5,0])
-        B_eq = Tex(r"$B = \omega / \gamma$").move_to([-4,-0.5,0])
+        def equations():
+            omega_eq = Tex(r"$\omega = \Delta \theta / \Delta t$").move_to([-4,0.5,0])
+            B_eq = Tex(r"$B = \omega / \gamma$").move_to([-4,-0.5,0])
+            
+            const_label = Text("constant", font_size=24, color=BLUE).move_to([-3.2,-1.5,0])
+            const_arrow = Vector([0,0.5,0], color=BLUE).move_to([-3.2,-1.1,0])
+            self.play(FadeIn(omega_eq, shift=LEFT), FadeIn(B_eq, shift=LEFT))
+            self.play(Write(const_label), Write(const_arrow), B_eq[0][4].animate.set_color(BLUE), run_time=1)
+            
+            self.wait(1)
+            
+            self.play(FadeOut(*self.mobjects),FadeOut(t_marker))
+        self.cached_section("equations", equations)
         
-        const_label = Text("constant", font_size=24, color=BLUE).move_to([-3.2,-1.5,0])
-        const_arrow = Vector([0,0.5,0], color=BLUE).move_to([-3.2,-1.1,0])
-        self.play(FadeIn(omega_eq, shift=LEFT), FadeIn(B_eq, shift=LEFT))
-        self.play(Write(const_label), Write(const_arrow), B_eq[0][4].animate.set_color(BLUE), run_time=1)
         
-        self.wait(1)
-        
-        self.play(FadeOut(*self.mobjects),FadeOut(t_marker))
-        
-        
-    def sphere_param(self, u, v, R):
-        x = R * np.sin(u) * np.cos(v)
-        y = R * np.sin(u) * np.sin(v)
-        z = R * np.cos(u)
-        return np.array([x, y, z])
-
     def fix_orientations(self, *mob):
         self.add_fixed_orientation_mobjects(*mob)
         self.remove(*mob)
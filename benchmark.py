@@ -0,0 +1,300 @@
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import time
+import numpy as np
+from render_all import PROJECT_DIR, VIDEO_ORDER, discover_scenes
+
+# Times every project scene and custom mobject headless, and compares against a stored baseline
+# python benchmark.py --save-baseline      (once, on a known-good commit)
+# python benchmark.py --check              (afterwards; exits 1 on regressions)
+
+BASELINE_PATH = os.path.join(PROJECT_DIR, "benchmark_baseline.json")
+RESULTS_PATH = os.path.join(PROJECT_DIR, "benchmark_results.json")
+
+# Fixed render settings, so numbers are comparable between runs
+BENCHMARK_CONFIG = {
+    "quality": "low_quality",
+    "write_to_movie": False,
+    "save_last_frame": False,
+    "disable_caching": True,
+    "preview": False,
+    "verbosity": "ERROR",
+    "progress_bar": "none",
+}
+
+# Mobjects at their authored detail whatever the quality above, so results stay comparable with
+# baselines saved before sample counts scaled with the render quality (level_of_detail.py).
+# Spawned case processes inherit it.
+os.environ["LOD_SCALE"] = "1"
+
+# Metrics where a larger number is worse, and how much larger counts as a regression
+REGRESSION_TOLERANCE = {
+    "construct_s": 0.10,
+    "render_s": 0.10,
+    "frame_mean_ms": 0.10,
+    "frame_p95_ms": 0.15,
+    "update_mean_ms": 0.10,
+    "update_p95_ms": 0.15,
+    "peak_rss_mb": 0.10,
+    "mobject_count": 0.0,
+    "point_count": 0.0,
+}
+
+# Mobject sweeps: (name, module, class, list of constructor kwargs)
+MOBJECT_SWEEPS = [
+    ("WaveFunc3d", "waveform", "WaveFunc3d", [{"turns": turns} for turns in (3, 12, 48)]),
+    ("LaserPulse", "laserbeam", "LaserPulse", [{"n_samples": n} for n in (100, 400, 1600)]),
+    ("CarbonLattice", "carbon_lattice", "CarbonLattice", [
+        {"lattice_xrange": list(range(n)), "lattice_yrange": list(range(n)), "lattice_zrange": list(range(n))}
+        for n in (2, 4, 6)
+    ]),
+    ("BlochSphere", "bloch_sphere", "BlochSphere", [
+        {"resolution": resolution, "wireframe": wireframe}
+        for resolution in ((12, 24), (24, 48)) for wireframe in (False, True)
+    ]),
+    ("SpinEnsemble", "spin_ensemble", "SpinEnsemble", [
+        {"spins": np.tile([[0.0, 0.6, 0.8]], (n, 1))} for n in (100, 1000, 10000)
+    ]),
+    ("MyCurves", "magnetic_field", "MyCurves", [
+        {"x1_values": list(np.linspace(0, 2 * np.pi, n, endpoint=False))} for n in (8, 32, 64)
+    ]),
+    ("WavePacketPair", "wavefunction", "WavePacketPair", [{"n_samples": n} for n in (200, 800, 3200)]),
+]
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def _summarize(times, prefix):
+    """Mean and 95th percentile of a list of durations, in ms."""
+    if not times:
+        return {}
+    times_ms = 1000 * np.asarray(times)
+    return {f"{prefix}_mean_ms": float(times_ms.mean()), f"{prefix}_p95_ms": float(np.percentile(times_ms, 95))}
+
+
+def _count(mobjects):
+    """Counts the mobjects and points in the families of some mobjects."""
+    family = [sub for mob in mobjects for sub in mob.get_family()]
+    return {"mobject_count": len(family), "point_count": int(sum(len(sub.points) for sub in family))}
+
+
+def bench_scene(scene_name):
+    """
+    Renders one project scene headless and times it.
+
+    Args:
+        scene_name (str): The scene class name.
+
+    Returns:
+        dict: The metrics for the scene: "construct_s", the time in setup and construct
+            without the frames they draw; "render_s", the whole render; and per-frame times.
+    """
+    from manim import tempconfig
+
+    file_name, _ = discover_scenes()[scene_name]
+    module = importlib.import_module(os.path.splitext(file_name)[0])
+    with tempconfig(BENCHMARK_CONFIG):
+        scene = getattr(module, scene_name)()
+
+        # Time every frame the renderer draws
+        frame_times = []
+        render_frame = scene.renderer.render
+
+        def timed_render(*args, **kwargs):
+            start = time.perf_counter()
+            render_frame(*args, **kwargs)
+            frame_times.append(time.perf_counter() - start)
+
+        scene.renderer.render = timed_render
+
+        # Time setup and construct, less the frames drawn from inside them
+        construct_times = []
+
+        def timed(stage):
+            def timed_stage(*args, **kwargs):
+                n_frames = len(frame_times)
+                start = time.perf_counter()
+                stage(*args, **kwargs)
+                construct_times.append(time.perf_counter() - start - sum(frame_times[n_frames:]))
+
+            return timed_stage
+
+        scene.setup = timed(scene.setup)
+        scene.construct = timed(scene.construct)
+        start = time.perf_counter()
+        scene.render()
+        render_s = time.perf_counter() - start
+
+    return {
+        "construct_s": sum(construct_times),
+        "render_s": render_s,
+        "frames": len(frame_times),
+        **_summarize(frame_times, "frame"),
+        **_count(scene.mobjects),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def bench_mobject(module_name, class_name, kwargs, n_frames=60):
+    """
+    Builds one custom mobject and times its construction and its per-frame updates.
+    Mobjects with a growth or pulse animation are stepped through it frame by frame.
+
+    Args:
+        module_name (str): The module defining the mobject.
+        class_name (str): The mobject class name.
+        kwargs (dict): Constructor arguments.
+        n_frames (int): How many frames to step through.
+
+    Returns:
+        dict: The metrics for the mobject.
+    """
+    from manim import tempconfig
+    from manim.animation.animation import prepare_animation
+
+    module = importlib.import_module(module_name)
+    with tempconfig(BENCHMARK_CONFIG):
+        start = time.perf_counter()
+        mob = getattr(module, class_name)(**kwargs)
+        construct_s = time.perf_counter() - start
+
+        if hasattr(mob, "animate_spiral_creation"):
+            animation = mob.animate_spiral_creation()
+        elif hasattr(mob, "animate_pulse"):
+            animation = mob.animate_pulse()
+        elif hasattr(mob, "spread_tracker"):
+            animation = mob.spread_tracker.animate.set_value(0.09 * mob.spread_tracker.get_value())
+        else:
+            animation = None
+
+        update_times = []
+        if animation is not None:
+            animation = prepare_animation(animation)
+            animation.begin()
+            for alpha in np.linspace(0, 1, n_frames):
+                start = time.perf_counter()
+                animation.interpolate(alpha)
+                mob.update(1 / n_frames)
+                update_times.append(time.perf_counter() - start)
+            animation.finish()
+
+    return {
+        "construct_s": construct_s,
+        **_summarize(update_times, "update"),
+        **_count([mob]),
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _run_case(case):
+    """Runs one benchmark case; errors are recorded rather than raised."""
+    kind, args = case
+    sys.path.insert(0, PROJECT_DIR)
+    try:
+        if kind == "scene":
+            return bench_scene(*args)
+        return bench_mobject(*args)
+    except Exception as error:
+        return {"error": f"{type(error).__name__}: {error}"}
+
+
+def benchmark_cases(scenes=VIDEO_ORDER, include_mobjects=True):
+    """
+    Lists the cases to run.
+
+    Returns:
+        dict: Case name -> (kind, arguments).
+    """
+    cases = {f"scene/{scene}": ("scene", (scene,)) for scene in scenes}
+    if include_mobjects:
+        for name, module_name, class_name, sweep in MOBJECT_SWEEPS:
+            for kwargs in sweep:
+                label = ",".join(f"{key}={len(value) if isinstance(value, (list, np.ndarray)) else value}" for key, value in kwargs.items())
+                cases[f"mobject/{name}[{label}]"] = ("mobject", (module_name, class_name, kwargs))
+    return cases
+
+
+def run_benchmarks(cases):
+    """
+    Runs every case in a fresh process, so peak RSS and import state are per case.
+
+    Args:
+        cases (dict): Case name -> (kind, arguments).
+
+    Returns:
+        dict: Case name -> metrics.
+    """
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for name, case in cases.items():
+        with context.Pool(1) as pool:
+            results[name] = pool.apply(_run_case, (case,))
+        print(f"{name}: {_format_metrics(results[name])}")
+    return results
+
+
+def compare(results, baseline):
+    """
+    Compares results against a baseline.
+
+    Args:
+        results (dict): Case name -> metrics.
+        baseline (dict): Case name -> metrics from an earlier run.
+
+    Returns:
+        list: (case, metric, baseline value, current value) for every regression.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        previous = baseline.get(name)
+        if previous is None or "error" in metrics or "error" in previous:
+            continue
+        for metric, tolerance in REGRESSION_TOLERANCE.items():
+            if metric in metrics and metric in previous:
+                if metrics[metric] > previous[metric] * (1 + tolerance):
+                    regressions.append((name, metric, previous[metric], metrics[metric]))
+    return regressions
+
+
+def _format_metrics(metrics):
+    return ", ".join(
+        f"{key}={value:.3g}" if isinstance(value, float) else f"{key}={value}"
+        for key, value in metrics.items()
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark project scenes and custom mobjects.")
+    parser.add_argument("--scenes", nargs="*", default=VIDEO_ORDER, help="scene names to benchmark")
+    parser.add_argument("--no-mobjects", action="store_true", help="skip the custom mobject sweeps")
+    parser.add_argument("--output", default=RESULTS_PATH, help="where to write the results JSON")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 if anything regressed")
+    args = parser.parse_args()
+
+    results = run_benchmarks(benchmark_cases(args.scenes, not args.no_mobjects))
+    with open(args.output, "w") as output_file:
+        json.dump(results, output_file, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file))
+        for name, metric, previous, current in regressions:
+            print(f"REGRESSION {name} {metric}: {previous:.4g} -> {current:.4g}")
+        if not regressions:
+            print("No regressions against the baseline")
+        if args.check and regressions:
+            sys.exit(1)
@@ -0,0 +1,131 @@
+from manim import *
+from functools import lru_cache
+import numpy as np
+from level_of_detail import lod_resolution
+
+# uv positions of the 4 Bezier control points along a straight uv segment, as Surface places them
+_SEGMENT_ALPHAS = np.linspace(0, 1, 4)
+
+
+def sphere_points(u, v, radius=1):
+    """
+    Points on a sphere, evaluated for whole arrays of angles at once.
+
+    Args:
+        u (np.ndarray): Polar angles, from 0 at +z to PI at -z.
+        v (np.ndarray): Azimuthal angles, from +x towards +y.
+        radius (float): The sphere radius.
+
+    Returns:
+        np.ndarray: An array of shape u.shape + (3,).
+    """
+    sin_u = np.sin(u)
+    return radius * np.stack([sin_u * np.cos(v), sin_u * np.sin(v), np.cos(u)], axis=-1)
+
+
+def _segment_points(uv_start, uv_end):
+    """Maps straight uv segments onto the unit sphere as cubic Beziers, shape (..., 4, 3)."""
+    uv = uv_start[..., None, :] + _SEGMENT_ALPHAS[:, None] * (uv_end - uv_start)[..., None, :]
+    return sphere_points(uv[..., 0], uv[..., 1])
+
+
+@lru_cache(maxsize=None)
+def _face_points(resolution):
+    """
+    The Bezier points of every face of a unit sphere tessellated like `Surface` does it,
+    cached per resolution and shared read-only by every sphere.
+
+    Returns:
+        np.ndarray: An (n_u * n_v, 16, 3) array, faces ordered u-major like `Surface`.
+    """
+    n_u, n_v = resolution
+    u_values = np.linspace(0, PI, n_u + 1)
+    v_values = np.linspace(0, TAU, n_v + 1)
+    u1, v1 = np.meshgrid(u_values[:-1], v_values[:-1], indexing="ij")
+    u2, v2 = np.meshgrid(u_values[1:], v_values[1:], indexing="ij")
+    # Corners (u1, v1) -> (u2, v1) -> (u2, v2) -> (u1, v2) -> (u1, v1)
+    corners = np.stack([
+        np.stack([u1, v1], axis=-1),
+        np.stack([u2, v1], axis=-1),
+        np.stack([u2, v2], axis=-1),
+        np.stack([u1, v2], axis=-1),
+    ], axis=2).reshape(n_u * n_v, 4, 2)
+    points = _segment_points(corners, np.roll(corners, -1, axis=1)).reshape(n_u * n_v, 16, 3)
+    points.flags.writeable = False
+    return points
+
+
+@lru_cache(maxsize=None)
+def _wireframe_points(resolution):
+    """
+    The Bezier points of the tessellation's grid lines: the inner circles of latitude, then
+    the meridians. Each line is one subpath of a single path.
+
+    Returns:
+        np.ndarray: An (n_points, 3) array.
+    """
+    n_u, n_v = resolution
+    u_values = np.linspace(0, PI, n_u + 1)
+    v_values = np.linspace(0, TAU, n_v + 1)
+
+    latitude_u, latitude_v = np.meshgrid(u_values[1:-1], v_values, indexing="ij")
+    latitudes = np.stack([latitude_u, latitude_v], axis=-1)
+    meridian_v, meridian_u = np.meshgrid(v_values[:-1], u_values, indexing="ij")
+    meridians = np.stack([meridian_u, meridian_v], axis=-1)
+
+    points = np.concatenate([
+        _segment_points(latitudes[:, :-1], latitudes[:, 1:]).reshape(-1, 3),
+        _segment_points(meridians[:, :-1], meridians[:, 1:]).reshape(-1, 3),
+    ])
+    points.flags.writeable = False
+    return points
+
+
+class BlochSphere(VGroup):
+    """
+    A translucent sphere for showing spin directions, with the same faces a
+    `Surface` of the sphere would have. The mesh is evaluated with one vectorized
+    call and cached per resolution, so further spheres only scale a shared array.
+
+    With `wireframe=True` the sphere is only its grid lines, drawn as one stroked
+    path: far cheaper to rasterize than hundreds of depth-sorted faces, and close
+    to identical when the fill is faint.
+
+    Attributes:
+        radius (float): The sphere radius.
+        resolution (tuple): The number of faces along the polar and azimuthal angles, by default
+            (12, 24) scaled to the render quality.
+        wireframe (bool): Whether the sphere is drawn as grid lines only.
+    """
+
+    def __init__(
+        self,
+        radius=1,
+        resolution=None,
+        color=BLUE,
+        stroke_width=1,
+        stroke_opacity=0.3,
+        fill_opacity=0.1,
+        wireframe=False,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.radius = radius
+        self.resolution = tuple(lod_resolution((12, 24)) if resolution is None else resolution)
+        self.wireframe = wireframe
+
+        if wireframe:
+            grid = VMobject()
+            grid.points = radius * _wireframe_points(self.resolution)
+            self.add(grid)
+            self.set_stroke(color, stroke_width, stroke_opacity)
+        else:
+            face_points = radius * _face_points(self.resolution)
+            faces = []
+            for points in face_points:
+                face = ThreeDVMobject()
+                face.points = points
+                faces.append(face)
+            self.add(*faces)
+            self.set_fill(color, fill_opacity)
+            self.set_stroke(color, stroke_width, stroke_opacity)
@@ -2,8 +2,35 @@ from manim import *
 import numpy as np
 import random
 import matplotlib as plt
+from level_of_detail import lod_resolution
 
 class CarbonLattice(VGroup):
+    """
+    A diamond carbon lattice stored as NumPy arrays.
+    Sites, bonds and per-site styling live in arrays, and every atom is
+    instanced from one shared sphere mesh by offsetting its face points, so
+    large supercells never build a `Sphere` per atom.
+    Call `update_index` after moving, scaling or rotating the lattice so that
+    lookups by scene position follow it.
+
+    Attributes:
+        site_coords (np.ndarray): (N, 3) integer site coordinates, in units of a quarter of `scaling`.
+            These also key the site and bond lookup index, so finding a site or bond is O(1).
+        site_sublattice (np.ndarray): (N,) 0 for cube-corner sites, 1 for the tetrahedral sites.
+        site_positions (np.ndarray): (N, 3) atom centers in scene coordinates.
+        bond_sites (np.ndarray): (M, 2) indices of the two sites joined by each bond.
+        bond_starts (np.ndarray): (M, 3) bond start points, inset from the atom surface.
+        bond_ends (np.ndarray): (M, 3) bond end points, inset from the atom surface.
+        site_colors (np.ndarray): (N, 3) RGB fill color of each atom.
+        site_opacities (np.ndarray): (N,) fill opacity of each atom.
+        site_hidden (np.ndarray): (N,) whether each atom is left out of `diamond_lattice`.
+        atom_mesh (Sphere): The shared mesh every atom is instanced from.
+        atoms (list): The atom mobject of every site, hidden or not.
+        bonds (list): The bond Line of every bond, in `bond_sites` order.
+        diamond_lattice (VGroup): The visible atoms.
+        lattice_bonds (VGroup): One VGroup of four bond Lines per unit cell.
+    """
+
     def __init__(
         self,
         lattice_xrange = [-1,0],
@@ -12,79 +39,320 @@ class CarbonLattice(VGroup):
         scaling=3.0,
         atom_color=BLACK,
         bond_color=WHITE,
+        atom_resolution=None,
+        bond_inset=0.1 / np.sqrt(3),
         **kwargs
     ):
+        super().__init__(**kwargs)
         self.lattice_xrange = lattice_xrange
         self.lattice_yrange = lattice_yrange
         self.lattice_zrange = lattice_zrange
         self.scaling = scaling
         self.atom_color = atom_color
         self.bond_color = bond_color
-        
-        self.diamond_lattice = VGroup()
-        self.lattice_bonds = VGroup()
-        
-        # Base objects
-        base_sphere = Sphere(radius=self.scaling * 0.1,resolution=8, color=BLACK).move_to(ORIGIN).set_fill(color=BLACK, opacity=1)
-        base_sphere.z_index = 2
-        base_bonds = VGroup(
-            Line([0 + (self.scaling * 0.1 /np.sqrt(3)),0 + (self.scaling * 0.1 /np.sqrt(3)),0 + (self.scaling * 0.1 /np.sqrt(3))], self.scaling*np.array([0.25 - ( 0.1 /np.sqrt(3)),0.25 - ( 0.1 /np.sqrt(3)),0.25 - ( 0.1 /np.sqrt(3))])),
-            Line(self.scaling*np.array([0.25 + ( 0.1 /np.sqrt(3)),0.25 - ( 0.1 /np.sqrt(3)),0.25 + ( 0.1 /np.sqrt(3))]),self.scaling*np.array([0.5 - ( 0.1 /np.sqrt(3)), 0 + ( 0.1 /np.sqrt(3)), 0.5 - ( 0.1 /np.sqrt(3))])),
-            Line(self.scaling*np.array([0.25 - ( 0.1 /np.sqrt(3)),0.25 + ( 0.1 /np.sqrt(3)),0.25 + ( 0.1 /np.sqrt(3))]),self.scaling*np.array([0 + ( 0.1 /np.sqrt(3)), 0.5 - ( 0.1 /np.sqrt(3)), 0.5 - ( 0.1 /np.sqrt(3))])),
-            Line(self.scaling*np.array([0.25 + ( 0.1 /np.sqrt(3)),0.25 + ( 0.1 /np.sqrt(3)),0.25 - ( 0.1 /np.sqrt(3))]),self.scaling*np.array([0.5 - ( 0.1 /np.sqrt(3)), 0.5 - ( 0.1 /np.sqrt(3)), 0 + ( 0.1 /np.sqrt(3))])),
+        self.bond_inset = bond_inset
+        self.atom_resolution = atom_resolution = lod_resolution(8) if atom_resolution is None else atom_resolution # 8 at full quality
+
+        # Unit cells are the listed (x, y, z) values; cube corners span one past them
+        cells = np.array(np.meshgrid(lattice_xrange, lattice_yrange, lattice_zrange, indexing="ij")).reshape(3, -1).T
+        corner_ranges = [np.arange(r[0], r[-1] + 2) for r in (lattice_xrange, lattice_yrange, lattice_zrange)]
+        corners = np.array(np.meshgrid(*corner_ranges, indexing="ij")).reshape(3, -1).T
+
+        # Sites in quarter-cell units: cube corners, then the tetrahedral site of each cell
+        self.site_coords = np.concatenate((2 * corners, 2 * cells + 1)).astype(int)
+        self.site_sublattice = np.repeat([0, 1], [len(corners), len(cells)])
+
+        # Each cell bonds its tetrahedral site to four surrounding corners
+        bond_offsets = np.array([[0, 0, 0], [2, 0, 2], [0, 2, 2], [2, 2, 0]])
+        centers = np.repeat(2 * cells + 1, 4, axis=0)
+        bonded_corners = (2 * cells)[:, None, :] + bond_offsets[None, :, :]
+        bonded_corners = bonded_corners.reshape(-1, 3)
+        # The first bond of a cell runs corner -> center, the other three center -> corner
+        corner_first = np.tile([True, False, False, False], len(cells))[:, None]
+        bond_coords = np.stack((
+            np.where(corner_first, bonded_corners, centers),
+            np.where(corner_first, centers, bonded_corners),
+        ), axis=1)
+
+        # Dense integer grids index sites by coordinate and bonds by the sum of
+        # their two site coordinates (twice the bond midpoint)
+        self._site_grid = _CoordinateGrid(self.site_coords)
+        self.bond_sites = self._site_grid.lookup(bond_coords.reshape(-1, 3)).reshape(-1, 2)
+        self._bond_grid = _CoordinateGrid(self.site_coords[self.bond_sites].sum(axis=1))
+
+        # Bond endpoints in site coordinates, inset from the atom surfaces
+        start_coords, end_coords = self.site_coords[self.bond_sites[:, 0]], self.site_coords[self.bond_sites[:, 1]]
+        inset = 4 * self.bond_inset * np.sign(end_coords - start_coords)
+        self._bond_start_coords = start_coords + inset
+        self._bond_end_coords = end_coords - inset
+
+        # Sites reachable by each neighbor shell, grouped by squared distance
+        reach = np.arange(-4, 5)
+        offsets = np.array(np.meshgrid(reach, reach, reach, indexing="ij")).reshape(3, -1).T
+        offsets = offsets[np.any(offsets != 0, axis=1)]
+        distances = np.sum(offsets**2, axis=1)
+        self._shell_offsets = [offsets[distances == d] for d in np.unique(distances)]
+        self._sublattice_sites = [np.flatnonzero(self.site_sublattice == k) for k in (0, 1)]
+
+        # Center the lattice on the origin, as move_to(ORIGIN) would
+        quarter = 0.25 * self.scaling
+        self._basis = quarter * np.identity(3)
+        self._origin = -quarter * (self.site_coords.min(axis=0) + self.site_coords.max(axis=0)) / 2
+        self._apply_frame()
+
+        # Per-site styling
+        self.site_colors = np.tile(color_to_rgb(atom_color), (len(self.site_coords), 1))
+        self.site_opacities = np.ones(len(self.site_coords))
+        self.site_hidden = np.zeros(len(self.site_coords), dtype=bool)
+
+        # Instance every atom from one shared mesh in a single broadcast
+        self.atom_mesh = Sphere(radius=self.scaling * 0.1, resolution=atom_resolution, color=atom_color).set_fill(color=atom_color, opacity=1)
+        template = self.atom_mesh[0]
+        atom_style = dict(
+            fill_color=atom_color,
+            fill_opacity=1,
+            stroke_color=template.get_stroke_color(),
+            stroke_width=template.get_stroke_width(),
+            stroke_opacity=template.get_stroke_opacity(),
         )
-        base_bonds.z_index = 1
-        for x in lattice_xrange:
-            for y in lattice_yrange:
-                for z in lattice_zrange:
-                    self.lattice_bonds.add(
-                        base_bonds.copy().shift(0.5*self.scaling*np.array([x,y,z]))
-                    )
-        #Make the solid shape
-        for x in range(lattice_xrange[0], lattice_xrange[-1] + 2):
-            for y in range(lattice_yrange[0], lattice_yrange[-1] + 2):
-                for z in range(lattice_zrange[0], lattice_zrange[-1] + 2):
-                    self.diamond_lattice.add(
-                        base_sphere.copy().shift(0.5*self.scaling*np.array([x,y,z]))
-                    )
-        for x in lattice_xrange:
-            for y in lattice_yrange:
-                for z in lattice_zrange:
-                    self.diamond_lattice.add(
-                        base_sphere.copy().shift(0.5*self.scaling*np.array([x+.5,y+.5,z+.5]))
-                    )
-                                
-        self.diamond_lattice.move_to([0,0,0])
+        mesh_points = np.array([face.points for face in self.atom_mesh])
+        # One styled atom without points, copied to every site: a copy skips the color setup
+        # that constructing each face would repeat
+        self._atom_template = VGroup(*[ThreeDVMobject(**atom_style) for _ in mesh_points])
+        self._atom_template.z_index = 2
+        atom_points = mesh_points[None] + self.site_positions[:, None, None, :]
+        self.atoms = [self._make_atom(points) for points in atom_points]
+
+        self.diamond_lattice = VGroup(*self.atoms)
         self.diamond_lattice.z_index = 2
-        self.lattice_bonds.move_to([0,0,0])
+
+        bonds = [
+            Line(start, end, color=self.bond_color)
+            for start, end in zip(self.bond_starts, self.bond_ends)
+        ]
+        self.bonds = bonds
+        self.lattice_bonds = VGroup(*[VGroup(*bonds[i:i + 4]) for i in range(0, len(bonds), 4)])
+        for bond_group in self.lattice_bonds:
+            bond_group.z_index = 1
         self.lattice_bonds.z_index = 2
 
-        
+        self.add(self.lattice_bonds, self.diamond_lattice)
 
+    def _apply_frame(self):
+        """
+        Recomputes the scene-space site and bond arrays from the lattice frame.
+        """
+        self._inverse_basis = np.linalg.inv(self._basis)
+        self.site_positions = self.site_coords @ self._basis + self._origin
+        self.bond_starts = self._bond_start_coords @ self._basis + self._origin
+        self.bond_ends = self._bond_end_coords @ self._basis + self._origin
+
+    def _make_atom(self, face_points):
+        """
+        Builds one atom from the shared mesh, shifted to its site, by copying the styled template.
+
+        Args:
+            face_points (np.ndarray): (F, P, 3) face points of the shifted mesh.
+
+        Returns:
+            VGroup: The atom, one ThreeDVMobject per mesh face.
+        """
+        atom = self._atom_template.copy()
+        for face, points in zip(atom.submobjects, face_points):
+            face.points = points
+        return atom
+
+    def set_site_style(self, indices, color=None, opacity=None, hidden=None):
+        """
+        Updates the per-site style arrays and applies them to the atoms.
+
+        Args:
+            indices (array-like): Site indices, or a boolean mask over sites.
+            color (Color): The new fill color, if any.
+            opacity (float): The new fill opacity, if any.
+            hidden (bool): Whether to hide or show the sites, if given.
+
+        Returns:
+            CarbonLattice: self, for chaining.
+        """
+        indices = np.arange(len(self.site_coords))[indices]
+        if color is not None:
+            self.site_colors[indices] = color_to_rgb(color)
+        if opacity is not None:
+            self.site_opacities[indices] = opacity
+        if hidden is not None:
+            self.site_hidden[indices] = hidden
+
+        for i in indices:
+            self.atoms[i].set_fill(color=rgb_to_color(self.site_colors[i]), opacity=self.site_opacities[i])
+        if hidden is not None:
+            self.diamond_lattice.submobjects = [
+                atom for atom, is_hidden in zip(self.atoms, self.site_hidden) if not is_hidden
+            ]
+        return self
+
+    def update_index(self):
+        """
+        Refits the lattice frame to the current atom positions, so that lookups
+        by scene position keep working after the lattice has been transformed.
+
+        Returns:
+            CarbonLattice: self, for chaining.
+        """
+        visible = np.flatnonzero(~self.site_hidden)
+        centers = np.array([self.atoms[i].get_center() for i in visible])
+        coords = np.column_stack((self.site_coords[visible], np.ones(len(visible))))
+        frame = np.linalg.lstsq(coords, centers, rcond=None)[0]
+        self._basis, self._origin = frame[:3], frame[3]
+        self._apply_frame()
+        return self
+
+    def site_at(self, pos, tolerance=0.05, strict=False):
+        """
+        Finds the site whose atom is centered at pos.
+
+        Args:
+            pos (array-like): A point in scene coordinates.
+            tolerance (float): How far pos may be from the site center.
+            strict (bool): Whether to raise instead of returning None when there is no site at pos.
+
+        Returns:
+            int: The site index, or None if there is no site at pos.
+
+        Raises:
+            ValueError: If strict and there is no site at pos.
+        """
+        coords = np.rint((np.asarray(pos, dtype=float) - self._origin) @ self._inverse_basis)
+        index = self._site_grid.lookup(coords[None].astype(int))[0]
+        if index < 0 or np.linalg.norm(self.site_positions[index] - pos) > tolerance:
+            if strict:
+                raise ValueError(f"No lattice site at {pos}")
+            return None
+        return index
+
+    def bond_at(self, pos, tolerance=0.05, strict=False):
+        """
+        Finds the bond whose midpoint is at pos.
+
+        Args:
+            pos (array-like): A point in scene coordinates.
+            tolerance (float): How far pos may be from the bond midpoint.
+            strict (bool): Whether to raise instead of returning None when there is no bond at pos.
+
+        Returns:
+            int: The bond index, or None if there is no bond at pos.
+
+        Raises:
+            ValueError: If strict and there is no bond at pos.
+        """
+        coords = np.rint(2 * (np.asarray(pos, dtype=float) - self._origin) @ self._inverse_basis)
+        index = self._bond_grid.lookup(coords[None].astype(int))[0]
+        if index >= 0:
+            midpoint = (self.bond_starts[index] + self.bond_ends[index]) / 2
+            if np.linalg.norm(midpoint - pos) <= tolerance:
+                return index
+        if strict:
+            raise ValueError(f"No lattice bond centered at {pos}")
+        return None
+
+    def sublattice_sites(self, sublattice):
+        """
+        Lists the sites on one sublattice.
+
+        Args:
+            sublattice (int): 0 for cube-corner sites, 1 for the tetrahedral sites.
+
+        Returns:
+            np.ndarray: The site indices.
+        """
+        return self._sublattice_sites[sublattice]
+
+    def neighbors(self, index, shell=1):
+        """
+        Lists the sites in a neighbor shell around a site. Shells are the
+        distinct distances at which other sites exist, nearest first.
+
+        Args:
+            index (int): The site index.
+            shell (int): Which neighbor shell to return, starting at 1.
+
+        Returns:
+            np.ndarray: The neighboring site indices, empty if the shell is out of reach.
+        """
+        found = 0
+        for offsets in self._shell_offsets:
+            sites = self._site_grid.lookup(self.site_coords[index] + offsets)
+            sites = sites[sites >= 0]
+            if len(sites):
+                found += 1
+                if found == shell:
+                    return sites
+        return np.empty(0, dtype=int)
+
+    def remove_atom(self, pos, strict=False):
+        '''Fades Out the atom at position pos.
+        Returns the FadeOut animation, or None if there is no atom at pos
+        (with strict, raises a ValueError instead)
+        '''
+        index = self.site_at(pos, strict=strict)
+        if index is None:
+            return None
+        return FadeOut(self.atoms[index])
         
-    def remove_atom(self, pos):
-        '''Fades Out the atom at position pos'''
-        for carbon in self.diamond_lattice:
-            if (carbon.get_center().tolist() == pos):
-                FadeOut(carbon)
-        
-    def remove_bond(self, pos):
-        '''Fades Out the bond at position pos'''
-        for bond_group in self.lattice_bonds:
-            for bond in bond_group:
-                # print(bond.get_center().tolist())
-                error_tolerance = 0.01
-                if all(abs(a - b) <= error_tolerance for a, b in zip(bond.get_center().tolist(), pos)):
-                    FadeOut(bond)
+    def remove_bond(self, pos, strict=False):
+        '''Fades Out the bond centered at position pos.
+        Returns the FadeOut animation, or None if there is no bond at pos
+        (with strict, raises a ValueError instead)
+        '''
+        index = self.bond_at(pos, strict=strict)
+        if index is None:
+            return None
+        return FadeOut(self.bonds[index])
         
-    def replace_atom(self, pos, replacement=Sphere):
+    def replace_atom(self, pos, replacement=Sphere, strict=False):
         '''Replaces the atom at position pos with another 
-        sphere object, usually of a different color or size
+        sphere object, usually of a different color or size.
+        A mobject class is built with the lattice atom size.
+        Returns the Transform animation, or None if there is no atom at pos
+        (with strict, raises a ValueError instead)
         '''
+        index = self.site_at(pos, strict=strict)
+        if index is None:
+            return None
         new_atom = replacement
+        if isinstance(new_atom, type):
+            new_atom = new_atom(radius=self.scaling * 0.1, resolution=self.atom_resolution)
+        new_atom.move_to(self.site_positions[index])
         new_atom.z_index = 2
-        
-        for carbon in self.diamond_lattice:
-            if (carbon.get_center().tolist() == pos):
-                Transform(carbon, new_atom)
-        
+        return Transform(self.atoms[index], new_atom)
+
+
+class _CoordinateGrid:
+    """
+    A dense lookup table from integer 3D coordinates to indices.
+
+    Args:
+        coords (np.ndarray): (K, 3) integer coordinates, indexed 0..K-1 in order.
+    """
+
+    def __init__(self, coords):
+        self.low = coords.min(axis=0)
+        self.shape = coords.max(axis=0) - self.low + 1
+        self.table = np.full(self.shape, -1)
+        self.table[tuple((coords - self.low).T)] = np.arange(len(coords))
+
+    def lookup(self, coords):
+        """
+        Maps integer coordinates to indices.
+
+        Args:
+            coords (np.ndarray): (J, 3) integer coordinates.
+
+        Returns:
+            np.ndarray: (J,) indices, -1 where a coordinate is not in the table.
+        """
+        coords = np.asarray(coords) - self.low
+        inside = np.all((coords >= 0) & (coords < self.shape), axis=1)
+        indices = np.full(len(coords), -1)
+        indices[inside] = self.table[tuple(coords[inside].T)]
+        return indices
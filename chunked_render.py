@@ -0,0 +1,245 @@
+import argparse
+import importlib
+import itertools
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from render_all import PROJECT_DIR, QUALITY_DIRS, concatenate
+
+# Renders one long scene as several chunks of its timeline in parallel, then stitches them together
+# python chunked_render.py lattice_engineering.py Lattice_Engineering_Animation --quality h --chunks 8
+
+# manim quality letter -> config.quality name
+QUALITY_NAMES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+# Every pass over a scene seeds `random` and numpy with this, so they all build the same scene
+RANDOM_SEED = 5318008
+
+
+def _load_scene_class(file_name, scene_name, project_dir):
+    """Imports a scene class from a project file inside a worker process."""
+    os.chdir(project_dir)
+    if project_dir not in sys.path:
+        sys.path.insert(0, project_dir)
+    module = importlib.import_module(os.path.splitext(file_name)[0])
+    return getattr(module, scene_name)
+
+
+def _frame_count(scene, fps):
+    """How many frames the play that just finished rendered, mirroring CairoRenderer."""
+    import numpy as np
+
+    if scene.is_current_animation_frozen_frame():
+        return int(scene.duration * fps)
+    return len(np.arange(0, scene.duration, 1 / fps))
+
+
+def _survey_scene(file_name, scene_name, quality, project_dir):
+    """
+    Runs a scene with every animation skipped, checkpointing its state at each play/wait boundary.
+    Runs in a worker process.
+
+    Returns:
+        dict: "checkpoints", one per play with its frame count, whether it is a frozen wait, and
+            the hash of the scene state before it; "sounds", the (time, path, gain) of every sound;
+            and the scene's "frame_rate".
+    """
+    from manim import config, tempconfig
+    from section_cache import scene_state_hash
+
+    with tempconfig({"quality": QUALITY_NAMES[quality], "write_to_movie": False, "save_last_frame": False}):
+        frame_rate = config.frame_rate
+        scene = _load_scene_class(file_name, scene_name, project_dir)(skip_animations=True, random_seed=RANDOM_SEED)
+        checkpoints = []
+        sounds = []
+        play = scene.renderer.play
+        add_sound = scene.add_sound
+
+        def checkpointed_play(scene, *args, **kwargs):
+            state = scene_state_hash(scene)
+            play(scene, *args, **kwargs)
+            checkpoints.append({
+                "frames": _frame_count(scene, frame_rate),
+                "static": bool(scene.is_current_animation_frozen_frame()),
+                "state": state,
+            })
+
+        def recorded_sound(sound_file, time_offset=0, gain=None, **kwargs):
+            # Skipped scenes drop their sounds, so note where each one starts in the full render
+            time = sum(checkpoint["frames"] for checkpoint in checkpoints) / frame_rate
+            sounds.append((time + time_offset, os.path.abspath(sound_file), gain))
+            add_sound(sound_file, time_offset, gain, **kwargs)
+
+        scene.renderer.play = checkpointed_play
+        scene.add_sound = recorded_sound
+        scene.render()
+    return {"checkpoints": checkpoints, "sounds": sounds, "frame_rate": frame_rate}
+
+
+def split_plays(checkpoints, chunks):
+    """
+    Splits a scene's plays into contiguous chunks of about equal rendering cost. Frozen waits
+    repeat one frame, so they count as a single frame.
+
+    Args:
+        checkpoints (list): The survey checkpoints, one per play.
+        chunks (int): How many chunks to aim for.
+
+    Returns:
+        list: (first play, last play) of every chunk, inclusive.
+    """
+    costs = [1 if checkpoint["static"] else max(1, checkpoint["frames"]) for checkpoint in checkpoints]
+    cumulative = list(itertools.accumulate(costs))
+    starts = [0]
+    for k in range(1, chunks):
+        target = cumulative[-1] * k / chunks
+        start = next(i for i, cost in enumerate(cumulative) if cost >= target) + 1
+        if start > starts[-1] and start < len(costs):
+            starts.append(start)
+    ends = [start - 1 for start in starts[1:]] + [len(costs) - 1]
+    return list(zip(starts, ends))
+
+
+def _render_chunk(file_name, scene_name, quality, first, last, state, chunk_dir, disable_caching, project_dir):
+    """
+    Renders plays first..last of a scene into its own directory. The plays before the chunk are
+    replayed with animations skipped, which restores the scene to the checkpoint without drawing
+    anything, and the restored state is checked against the survey's. Runs in a worker process.
+
+    Returns:
+        str: The path of the chunk's movie.
+    """
+    from manim import logger, tempconfig
+    from section_cache import scene_state_hash
+
+    settings = {
+        "quality": QUALITY_NAMES[quality],
+        "from_animation_number": first,
+        "upto_animation_number": last,
+        "video_dir": chunk_dir,
+        "output_file": scene_name,
+        "input_file": file_name,
+        "disable_caching": disable_caching,
+        "write_to_movie": True,
+        "preview": False,
+    }
+    with tempconfig(settings):
+        scene = _load_scene_class(file_name, scene_name, project_dir)(random_seed=RANDOM_SEED)
+        play = scene.renderer.play
+
+        def checked_play(scene, *args, **kwargs):
+            if first and scene.renderer.num_plays == first and scene_state_hash(scene) != state:
+                logger.warning(
+                    f"{scene_name} differs from its checkpoint at play {first}; the chunk may not line up "
+                    "(is the scene using unseeded randomness or the wall clock?)"
+                )
+            play(scene, *args, **kwargs)
+
+        scene.renderer.play = checked_play
+        scene.render()
+        return str(scene.renderer.file_writer.movie_file_path)
+
+
+def mix_sounds(sounds, duration, output_path):
+    """
+    Lays the scene's sounds over silence the length of the scene, like manim's file writer does.
+
+    Args:
+        sounds (list): The (time, path, gain) of every sound.
+        duration (float): The scene's duration in seconds.
+        output_path (str): Where to write the WAV track.
+    """
+    from pydub import AudioSegment
+
+    track = AudioSegment.silent(duration=int(1000 * duration))
+    for time, path, gain in sounds:
+        segment = AudioSegment.from_file(path)
+        if gain:
+            segment = segment.apply_gain(gain)
+        track = track.overlay(segment, position=int(1000 * time))
+    track.export(output_path, format="wav")
+
+
+def chunked_movie_path(file_name, scene_name, quality="h", project_dir=PROJECT_DIR):
+    """Where a chunked render leaves the scene's movie: the same place `manim render` would."""
+    return os.path.join(
+        project_dir, "media", "videos", os.path.splitext(file_name)[0], QUALITY_DIRS[quality], f"{scene_name}.mp4",
+    )
+
+
+def render_chunked(file_name, scene_name, quality="h", chunks=None, disable_caching=False, project_dir=PROJECT_DIR):
+    """
+    Renders one scene as chunks of its timeline in parallel worker processes.
+
+    A first pass runs the scene with animations skipped to checkpoint it at every play/wait
+    boundary: the frames each play renders, a hash of the scene state, and the sounds it adds.
+    The plays are split into chunks of about equal cost, each worker restores its chunk's starting
+    checkpoint by replaying the earlier plays without drawing, and renders only its own plays. The
+    chunk movies are joined without re-encoding and the scene's sounds are laid over the result.
+
+    Args:
+        file_name (str): The file defining the scene.
+        scene_name (str): The scene class name.
+        quality (str): The manim quality letter.
+        chunks (int): How many chunks to render at once, by default one per CPU core.
+        disable_caching (bool): Whether to render without manim's partial movie cache.
+        project_dir (str): The directory holding the scene files.
+
+    Returns:
+        str: The path of the stitched movie.
+    """
+    chunks = chunks or os.cpu_count() or 1
+    work_dir = os.path.join(project_dir, "media", "chunks", scene_name, QUALITY_DIRS[quality])
+    os.makedirs(work_dir, exist_ok=True)
+    output_path = chunked_movie_path(file_name, scene_name, quality, project_dir)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=chunks) as pool:
+        survey = pool.submit(_survey_scene, file_name, scene_name, quality, project_dir).result()
+        with open(os.path.join(work_dir, "checkpoints.json"), "w") as checkpoint_file:
+            json.dump(survey, checkpoint_file, indent=2)
+
+        checkpoints = survey["checkpoints"]
+        ranges = split_plays(checkpoints, chunks)
+        futures = [
+            pool.submit(
+                _render_chunk, file_name, scene_name, quality, first, last, checkpoints[first]["state"],
+                os.path.join(work_dir, f"chunk_{first:04d}"), disable_caching, project_dir,
+            )
+            for first, last in ranges
+        ]
+        movies = [future.result() for future in futures]
+
+    # Chunks only hear the sounds that start inside them, so the scene's audio is mixed separately
+    if not survey["sounds"]:
+        concatenate(movies, output_path, audio=False)
+        return output_path
+    video_path = os.path.join(work_dir, "video.mp4")
+    audio_path = os.path.join(work_dir, "audio.wav")
+    concatenate(movies, video_path, audio=False)
+    mix_sounds(survey["sounds"], sum(checkpoint["frames"] for checkpoint in checkpoints) / survey["frame_rate"], audio_path)
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-i", video_path, "-i", audio_path,
+         "-map", "0:v", "-map", "1:a", "-c:v", "copy", "-c:a", "aac", output_path],
+        check=True,
+    )
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render one scene as parallel chunks of its timeline.")
+    parser.add_argument("file", help="the file defining the scene")
+    parser.add_argument("scene", help="the scene class name")
+    parser.add_argument("--quality", choices=sorted(QUALITY_DIRS), default="h", help="manim quality letter")
+    parser.add_argument("--chunks", type=int, default=None, help="chunks to render at once (default: CPU cores)")
+    parser.add_argument("--disable_caching", action="store_true", help="render without manim's partial movie cache")
+    args = parser.parse_args()
+    print(render_chunked(args.file, args.scene, args.quality, args.chunks, args.disable_caching))
@@ -0,0 +1,431 @@
+from manim import *
+from functools import lru_cache
+import numpy as np
+from scipy.special import gammaln, jv
+from bloch_sphere import BlochSphere
+from level_of_detail import lod_resolution, lod_samples
+from spin_ensemble import SpinEnsemble, camera_direction
+
+# N spin-1/2s squeezed together, simulated in the N + 1 symmetric Dicke states instead of all 2^N:
+#     spin = CollectiveSpin(n_spins=1000, chi=0.01)           # one-axis twisting
+#     spin = CollectiveSpin(n_spins=1000, chi=0.01, omega=5)  # twist-and-turn
+#     view = CollectiveSpinView(spin, radius=2).face_camera(self.camera)
+#     view.add_updater(spin.updater(view))
+#     sphere = HusimiSphere(spin.psi, radius=2)               # colored by the state's Husimi Q
+#     sphere.add_updater(lambda mob: mob.set_state(spin.psi))
+
+
+def coherent_spin_state(n_spins, theta=PI / 2, phi=0):
+    """
+    The Dicke-basis amplitudes of N spin-1/2s all pointing along (theta, phi), each in the state
+    cos(theta/2)|up> + exp(i phi) sin(theta/2)|down>. Computed from log binomials, so they don't
+    overflow for large N.
+
+    Args:
+        n_spins (int): The number of spins N.
+        theta (float): The polar angle from +z.
+        phi (float): The azimuth from +x.
+
+    Returns:
+        np.ndarray: The N + 1 complex amplitudes of m = -N/2 .. N/2.
+    """
+    ups = np.arange(n_spins + 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_cos, log_sin = np.log(abs(np.cos(theta / 2))), np.log(abs(np.sin(theta / 2)))
+        # 0 * log(0) is taken as 0, so the poles give a single Dicke state
+        log_powers = np.where(ups > 0, ups * log_cos, 0) + np.where(ups < n_spins, (n_spins - ups) * log_sin, 0)
+    log_amplitudes = 0.5 * (gammaln(n_spins + 1) - gammaln(ups + 1) - gammaln(n_spins - ups + 1)) + log_powers
+    amplitudes = np.exp(log_amplitudes - log_amplitudes.max())
+    # Sign of cos/sin past theta = pi, and the phase of the down spins
+    amplitudes = amplitudes * np.sign(np.cos(theta / 2)) ** ups * np.sign(np.sin(theta / 2)) ** (n_spins - ups)
+    amplitudes = amplitudes * np.exp(1j * phi * (n_spins - ups))
+    return amplitudes / np.linalg.norm(amplitudes)
+
+
+class CollectiveSpin:
+    """
+    N spin-1/2s evolving under the twist-and-turn Hamiltonian
+
+        H = chi Jz^2 + omega Jx
+
+    in the Dicke basis |J, m>, J = N/2, m = -J .. J. The Hamiltonian keeps symmetric states
+    symmetric, so N + 1 amplitudes stand in for the 2^N of the product space. With omega = 0 it is
+    one-axis twisting, which is diagonal: each step is one multiplication by exact phases. With a
+    turn, H is tridiagonal and each step is a Chebyshev expansion of exp(-i H dt), accurate to
+    rounding however long the step. It takes as many tridiagonal products as the spectral
+    radius of H times dt, plus several dozen, and that radius, chi N^2 / 8 + |omega| N / 2, grows
+    quadratically with N: a 1/60 s frame at N = 10^4, chi = 1e-3 and omega = 0.5 is 319 products.
+    The phases and expansion coefficients are computed once for each step size and reused, and
+    the products run in preallocated buffers.
+
+    Attributes:
+        n_spins (int): The number of spins N.
+        m (np.ndarray): The Jz eigenvalues -N/2 .. N/2.
+        psi (np.ndarray): The N + 1 Dicke-basis amplitudes, evolved in place.
+        chi (float): The twisting strength.
+        omega (float): The turning rate about x.
+        time (float): How far psi has been evolved.
+    """
+
+    def __init__(self, n_spins, chi=1.0, omega=0.0, theta=PI / 2, phi=0):
+        self.n_spins = int(n_spins)
+        self.time = 0.0
+        spin = self.n_spins / 2
+        self.m = np.arange(self.n_spins + 1) - spin
+        # <m + 1|J+|m>, the off-diagonal of J+ = Jx + i Jy
+        self._raising = np.sqrt(spin * (spin + 1) - self.m[:-1] * (self.m[:-1] + 1))
+        self.psi = coherent_spin_state(self.n_spins, theta, phi)
+        # Jx psi, Jy psi and Jz psi, rewritten by every `statistics` call
+        self._moments = np.empty((3, self.n_spins + 1), dtype=complex)
+        # The two latest Chebyshev terms and a scratch row, rewritten by every `step` with a turn
+        self._chebyshev = np.empty((3, self.n_spins + 1), dtype=complex)
+        self.chi = chi
+        self.omega = omega
+        self.set_hamiltonian()
+
+    def set_hamiltonian(self, chi=None, omega=None):
+        """
+        Changes the twisting strength and turning rate from here on.
+
+        Returns:
+            CollectiveSpin: self, for chaining.
+        """
+        self.chi = self.chi if chi is None else chi
+        self.omega = self.omega if omega is None else omega
+        if self.omega:
+            # H mapped onto [-1, 1], where the Chebyshev polynomials live, from bounds on its spectrum
+            twist_bounds = sorted((0, self.chi * (self.n_spins / 2) ** 2))
+            turn_bound = abs(self.omega) * self.n_spins / 2
+            self._spectrum_center = 0.5 * (twist_bounds[0] + twist_bounds[1])
+            self._spectrum_radius = 0.5 * (twist_bounds[1] - twist_bounds[0]) + turn_bound
+            # The diagonals of H scaled, doubled for the recurrence; complex, so multiplying the
+            # Chebyshev terms by them needs no casting buffers
+            self._twice_off_diagonal = (self.omega * self._raising / self._spectrum_radius).astype(complex)
+            self._twice_diagonal = (2 * (self.chi * self.m**2 - self._spectrum_center) / self._spectrum_radius).astype(complex)
+        self._factors = (None, None)
+        return self
+
+    def _step_factors(self, dt):
+        """The twist phases, or the Chebyshev coefficients, for steps of dt, kept until the step size changes."""
+        if self._factors[0] != dt:
+            if not self.omega:
+                factors = np.exp(-1j * dt * self.chi * self.m**2)
+            else:
+                # exp(-i H dt) = exp(-i center dt) sum_k (2 - [k = 0]) (-i)^k J_k(radius dt) T_k(H scaled)
+                argument = self._spectrum_radius * dt
+                orders = np.arange(int(argument + 10 * argument ** (1 / 3) + 20))
+                bessels = jv(orders, argument)
+                orders = orders[: np.nonzero(np.abs(bessels) > 1e-16)[0][-1] + 1]
+                factors = (2 - (orders == 0)) * (-1j) ** orders * bessels[: len(orders)]
+                factors = factors * np.exp(-1j * self._spectrum_center * dt)
+            self._factors = (dt, factors)
+        return self._factors[1]
+
+    def _chebyshev_term(self, current, previous, scratch):
+        """Overwrites previous with 2 H current - previous, H scaled, the next Chebyshev term."""
+        previous *= -1
+        np.multiply(self._twice_off_diagonal, current[:-1], out=scratch[1:])
+        previous[1:] += scratch[1:]
+        np.multiply(self._twice_off_diagonal, current[1:], out=scratch[:-1])
+        previous[:-1] += scratch[:-1]
+        np.multiply(self._twice_diagonal, current, out=scratch)
+        previous += scratch
+
+    def step(self, dt):
+        """
+        Evolves psi in place by dt.
+
+        Returns:
+            CollectiveSpin: self, for chaining.
+        """
+        if dt <= 0:
+            return self
+        factors = self._step_factors(dt)
+        if not self.omega:
+            self.psi *= factors
+            self.time += dt
+            return self
+
+        # The Chebyshev recurrence T_k+1 = 2 H T_k - T_k-1, applied to psi; T_1 = H T_0 is
+        # half of the recurrence from T_-1 = 0
+        previous, current, scratch = self._chebyshev
+        previous[:] = self.psi
+        current[:] = 0
+        self._chebyshev_term(previous, current, scratch)
+        current *= 0.5
+        self.psi *= factors[0]
+        np.multiply(current, factors[1], out=scratch)
+        self.psi += scratch
+        for factor in factors[2:]:
+            self._chebyshev_term(current, previous, scratch)
+            previous, current = current, previous
+            np.multiply(current, factor, out=scratch)
+            self.psi += scratch
+        self.time += dt
+        return self
+
+    def statistics(self):
+        """
+        The collective spin's mean, its covariances, and its spread across the mean direction.
+
+        The squeezed and anti-squeezed axes are the directions perpendicular to the mean spin
+        with the least and most variance. A coherent spin state has variance N/4 along both.
+
+        Returns:
+            dict: "mean", <J> as an (3,) array; "covariance", the symmetrized (3, 3) covariance
+                of Jx, Jy, Jz; "variances", the (least, most) variance across the mean;
+                "squeezed_axis" and "anti_squeezed_axis", unit (3,) vectors; "squeezing", the
+                Wineland parameter N * least variance / |<J>|^2, below 1 when the spins are
+                squeezed enough to beat the standard quantum limit; and "kitagawa_ueda",
+                4 * least variance / N.
+        """
+        psi, moments = self.psi, self._moments
+        # J+ psi and J- psi, combined into Jx psi and Jy psi
+        moments[0, 0] = 0
+        moments[0, 1:] = self._raising * psi[:-1]
+        moments[1, :-1] = self._raising * psi[1:]
+        moments[1, -1] = 0
+        raised = moments[0].copy()
+        moments[0] += moments[1]
+        moments[0] *= 0.5
+        moments[1] -= raised
+        moments[1] *= 0.5j
+        np.multiply(self.m, psi, out=moments[2])
+
+        mean = (moments @ psi.conj()).real
+        # <Ji Jj> = <Ji psi|Jj psi> for Hermitian Ji; its real part is the symmetrized product
+        covariance = (moments.conj() @ moments.T).real - np.outer(mean, mean)
+
+        length = np.linalg.norm(mean)
+        direction = mean / length if length > 1e-12 else np.array([0.0, 0.0, 1.0])
+        first = np.cross(direction, RIGHT if abs(direction[0]) < 0.9 else UP)
+        first /= np.linalg.norm(first)
+        perpendicular = np.stack([first, np.cross(direction, first)])
+        variances, axes = np.linalg.eigh(perpendicular @ covariance @ perpendicular.T)
+        variances = np.maximum(variances, 0)
+        squeezed_axis, anti_squeezed_axis = (axes.T @ perpendicular)
+        return {
+            "mean": mean,
+            "covariance": covariance,
+            "variances": variances,
+            "squeezed_axis": squeezed_axis,
+            "anti_squeezed_axis": anti_squeezed_axis,
+            "squeezing": self.n_spins * variances[0] / max(length**2, 1e-12),
+            "kitagawa_ueda": 4 * variances[0] / self.n_spins,
+        }
+
+    def trajectory(self, times):
+        """
+        Evolves psi through increasing times and records its statistics at each.
+
+        Args:
+            times (np.ndarray): The times to record at, from the current `time` on.
+
+        Returns:
+            dict: "time" and the arrays of every `statistics` entry, stacked over time.
+        """
+        records = []
+        for t in times:
+            self.step(t - self.time)
+            records.append(self.statistics())
+        trajectory = {key: np.array([record[key] for record in records]) for key in records[0]}
+        trajectory["time"] = np.asarray(times, dtype=float)
+        return trajectory
+
+    def updater(self, view, time_scale=1.0):
+        """
+        An updater that evolves psi by each frame's dt and draws its statistics.
+
+        Args:
+            view (CollectiveSpinView): The mobject drawing the collective spin.
+            time_scale (float): Units of evolution time per second of scene time.
+
+        Returns:
+            function: The updater, to pass to `view.add_updater`.
+        """
+        def evolve(mob, dt):
+            self.step(dt * time_scale)
+            mob.set_statistics(self.statistics())
+        return evolve
+
+
+class CollectiveSpinView(VGroup):
+    """
+    A collective spin drawn on a Bloch sphere: an arrow along <J>, its length |<J>| / J of the
+    radius, and an uncertainty ellipse around its tip across the mean direction. The ellipse's
+    semi-axes are `noise_radius` times the standard deviations along the squeezed and
+    anti-squeezed axes relative to a coherent state's sqrt(N)/2, so a coherent spin starts as a
+    circle of `noise_radius` and squeezing turns it into an ellipse at the same scale, however
+    small the real spread of N spins is.
+
+    Attributes:
+        radius (float): The Bloch sphere's radius.
+        noise_radius (float): The radius of a coherent state's uncertainty circle.
+        arrow (SpinEnsemble): The arrow along the mean spin.
+        ellipse (VMobject): The uncertainty ellipse.
+    """
+
+    def __init__(
+        self,
+        collective_spin,
+        radius=1.0,
+        noise_radius=0.3,
+        center=ORIGIN,
+        color=YELLOW,
+        ellipse_color=None,
+        n_samples=None,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.radius = radius
+        self.noise_radius = noise_radius
+        self.n_spins = collective_spin.n_spins
+        self._center = np.asarray(center, dtype=float)
+        n_samples = lod_samples(64) if n_samples is None else n_samples
+        self._angles = np.linspace(0, TAU, n_samples + 1)[:, None]
+        self.arrow = SpinEnsemble(np.array([[0.0, 0.0, radius]]), origin=self._center, color=color)
+        self.ellipse = VMobject(
+            stroke_color=color if ellipse_color is None else ellipse_color,
+            stroke_width=3,
+            fill_color=color if ellipse_color is None else ellipse_color,
+            fill_opacity=0.3,
+        )
+        self.add(self.arrow, self.ellipse)
+        self.set_statistics(collective_spin.statistics())
+
+    def face_camera(self, camera):
+        """Turns the arrow's tip towards a 3D camera."""
+        self.arrow.view_direction = camera_direction(camera)
+        self.arrow.set_spins(self.arrow.spins)
+        return self
+
+    def set_statistics(self, statistics):
+        """
+        Redraws the arrow and the ellipse from `CollectiveSpin.statistics`.
+
+        Returns:
+            CollectiveSpinView: self, for chaining.
+        """
+        spin = self.radius * statistics["mean"] / (self.n_spins / 2)
+        self.arrow.set_spins(spin[None])
+        semi_axes = self.noise_radius * np.sqrt(statistics["variances"] / (self.n_spins / 4))
+        tip = self._center + spin
+        self.ellipse.set_points_as_corners(
+            tip
+            + semi_axes[0] * np.cos(self._angles) * statistics["squeezed_axis"]
+            + semi_axes[1] * np.sin(self._angles) * statistics["anti_squeezed_axis"]
+        )
+        return self
+
+
+@lru_cache(maxsize=None)
+def _husimi_weights(n_spins, resolution):
+    """
+    The coherent-state amplitudes at the polar angle of every face center, cached per N and
+    resolution and shared read-only. Row i holds the amplitudes of m = N/2 .. -N/2 at the i-th
+    polar angle, times the phase of half a face in azimuth, zero-padded to a multiple of n_v.
+
+    Returns:
+        np.ndarray: An (n_u, n_v * ceil((N + 1) / n_v)) complex array.
+    """
+    n_u, n_v = resolution
+    polar_angles = (np.arange(n_u) + 0.5) * PI / n_u
+    downs = np.arange(n_spins + 1)
+    weights = np.zeros((n_u, n_v * -(-(n_spins + 1) // n_v)), dtype=complex)
+    for row, theta in zip(weights, polar_angles):
+        row[: n_spins + 1] = coherent_spin_state(n_spins, theta)[::-1]
+    weights[:, : n_spins + 1] *= np.exp(-1j * PI * downs / n_v)
+    weights.flags.writeable = False
+    return weights
+
+
+def husimi_q(psi, resolution):
+    """
+    The Husimi Q distribution |<theta, phi|psi>|^2 of a Dicke-basis state at the centers of a
+    sphere's faces, tessellated like `BlochSphere`.
+
+    The coherent state's amplitude for m = N/2 - r carries a phase exp(i r phi). On a uniform grid of
+    n_v azimuths that phase repeats every n_v values of r, so the amplitudes times psi are folded
+    into n_v sums and a single FFT per polar angle gives the overlaps at every azimuth: one pass
+    over an (n_u, N + 1) array instead of an overlap per face.
+
+    Args:
+        psi (np.ndarray): The N + 1 Dicke-basis amplitudes of m = -N/2 .. N/2.
+        resolution (tuple): The number of faces along the polar and azimuthal angles.
+
+    Returns:
+        np.ndarray: An (n_u, n_v) array, u-major like the faces; 1 at the center of a coherent
+            state. Q normalized over the sphere is (N + 1) / (4 pi) times this.
+    """
+    n_u, n_v = resolution
+    weights = _husimi_weights(len(psi) - 1, tuple(resolution))
+    products = weights.copy()
+    products[:, : len(psi)] *= psi[::-1]
+    overlaps = np.fft.fft(products.reshape(n_u, -1, n_v).sum(axis=1), axis=1)
+    return overlaps.real**2 + overlaps.imag**2
+
+
+class HusimiSphere(BlochSphere):
+    """
+    A Bloch sphere whose faces are colored by the Husimi Q distribution of a Dicke-basis state,
+    so a squeezed state shows as a stretched spot rather than a single arrow. Faces brighten
+    through `colors` and turn more opaque where Q is high.
+
+    `set_state` writes every face's color into one shared array in a single vectorized pass, so
+    a squeezing animation can recolor thousands of faces each frame:
+
+        sphere.add_updater(lambda mob: mob.set_state(collective_spin.psi))
+
+    Attributes:
+        colors (list): The colors from Q = 0 to the peak of a coherent state.
+        opacity_range (tuple): The (least, most) fill opacity of a face.
+    """
+
+    def __init__(
+        self,
+        psi,
+        radius=1,
+        resolution=None,
+        colors=(DARK_BLUE, BLUE, YELLOW),
+        opacity_range=(0.1, 0.9),
+        stroke_opacity=0.1,
+        **kwargs
+    ):
+        self.colors = list(colors)
+        self.opacity_range = tuple(opacity_range)
+        super().__init__(
+            radius=radius,
+            resolution=lod_resolution((48, 96)) if resolution is None else resolution,
+            color=self.colors[0],
+            fill_opacity=self.opacity_range[0],
+            stroke_opacity=stroke_opacity,
+            **kwargs
+        )
+        self._faces = list(self.submobjects)
+        # Every face's fill_rgbas is a view of one row of this array
+        self._face_rgbas = np.zeros((len(self._faces), 1, 4))
+        self._face_rows = list(self._face_rgbas)
+        stops = np.array([color_to_rgb(color) for color in self.colors])
+        levels = np.linspace(0, 1, 256)
+        self._color_table = np.stack(
+            [np.interp(levels, np.linspace(0, 1, len(stops)), stops[:, channel]) for channel in range(3)], axis=1
+        )
+        self.set_state(psi)
+
+    def set_state(self, psi):
+        """
+        Recolors the faces by the Husimi Q distribution of a state.
+
+        Args:
+            psi (np.ndarray): The N + 1 Dicke-basis amplitudes, like `CollectiveSpin.psi`.
+
+        Returns:
+            HusimiSphere: self, for chaining.
+        """
+        q = np.clip(husimi_q(psi, self.resolution).ravel(), 0, 1)
+        self._face_rgbas[:, 0, :3] = self._color_table[(q * (len(self._color_table) - 1)).astype(int)]
+        self._face_rgbas[:, 0, 3] = self.opacity_range[0] + q * (self.opacity_range[1] - self.opacity_range[0])
+        # Animations replace fill_rgbas with new arrays, so the views are handed back every time
+        for face, rgbas in zip(self._faces, self._face_rows):
+            face.fill_rgbas = rgbas
+        return self
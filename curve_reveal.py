@@ -0,0 +1,113 @@
+from manim import *
+import numpy as np
+from level_of_detail import lod_samples
+
+# The Bezier control points of a straight segment, at the thirds
+_SEGMENT_ALPHAS = np.linspace(0, 1, 4)[:, None]
+
+
+def _line_points(start, end):
+    """A straight segment from start to end as one cubic Bezier, shape (4, 3)."""
+    return start + _SEGMENT_ALPHAS * (end - start)
+
+
+class CurveReveal(VGroup):
+    """
+    A function's graph on a set of axes and the area under it, revealed from left to right.
+
+    The graph is sampled and smoothed once, when the reveal is built. Changing
+    `fraction_tracker` then shows a prefix of those Bezier points: every full segment is a
+    slice of the precomputed array, the last one is cut at the right place, and the area closes
+    along the x axis. Each frame rewrites a few points whatever the number of samples, instead
+    of plotting the graph and rebuilding the area again.
+
+        reveal = CurveReveal(axes, normal_pdf, x_range=(-3, 3))
+        self.play(reveal.fraction_tracker.animate.set_value(1), run_time=3)
+
+    The points are computed where the axes are when the reveal is built, and the curve and area
+    show views of its buffers. Clear its updaters before moving or scaling it.
+
+    Attributes:
+        x_range (tuple): The x values the graph runs between.
+        curve (VMobject): The revealed part of the graph.
+        area (VMobject): The area between the revealed graph and the x axis.
+        fraction_tracker (ValueTracker): How much of the x range is revealed, from 0 to 1.
+    """
+
+    def __init__(
+        self,
+        axes,
+        function,
+        x_range=(-3, 3),
+        n_samples=None,
+        fraction=0.0,
+        color=WHITE,
+        stroke_width=DEFAULT_STROKE_WIDTH,
+        area_color=(BLUE, GREEN),
+        fill_opacity=0.3,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.x_range = tuple(x_range)
+        x = np.linspace(*self.x_range, (lod_samples(200) if n_samples is None else n_samples) + 1)
+        graph = VMobject().set_points_smoothly([axes.c2p(x_value, function(x_value)) for x_value in x])
+        # The graph's Bezier points, padded with the 16 rows a cut can write past its end
+        self._graph = np.concatenate([graph.points, np.zeros((16, 3))])
+        self._graph.flags.writeable = False
+        self._n_segments = len(x) - 1
+        self._baseline = (axes.c2p(x[0], 0), axes.c2p(x[-1], 0))
+
+        # The curve shows a prefix of its buffer, the area a prefix of its own plus the three
+        # sides that close it; both only differ from the graph in the 16 rows from the cut
+        self._curve_buffer = self._graph.copy()
+        self._area_buffer = self._graph.copy()
+        self._patched = 0
+
+        self.curve = VMobject(stroke_color=color, stroke_width=stroke_width)
+        # Styled like Axes.get_area: a faint outline and fill of the same gradient
+        self.area = VMobject().set_color(area_color).set_opacity(fill_opacity)
+        self.add(self.area, self.curve)
+
+        self.fraction = None
+        self.fraction_tracker = ValueTracker(fraction)
+        self.set_fraction(fraction)
+        self.add_updater(lambda mob: mob.set_fraction(mob.fraction_tracker.get_value()))
+
+    def set_fraction(self, fraction):
+        """
+        Reveals the graph and area up to a fraction of the x range.
+
+        Args:
+            fraction (float): The revealed fraction, from 0 to 1.
+
+        Returns:
+            CurveReveal: self, for chaining.
+        """
+        fraction = float(np.clip(fraction, 0, 1))
+        if fraction == self.fraction:
+            return self
+        segment, alpha = divmod(fraction * self._n_segments, 1)
+        segment = int(segment)
+        if segment == self._n_segments:
+            segment, alpha = segment - 1, 1.0
+        start = 4 * segment
+
+        # Put back the graph rows the last cut overwrote, then cut segment `segment` at alpha
+        for buffer in (self._curve_buffer, self._area_buffer):
+            buffer[self._patched : self._patched + 16] = self._graph[self._patched : self._patched + 16]
+        partial = partial_bezier_points(self._graph[start : start + 4], 0, alpha)
+        self._curve_buffer[start : start + 4] = partial
+        self._area_buffer[start : start + 4] = partial
+
+        # Down to the x axis, back along it, and up to the start of the graph
+        base_start, base_end = self._baseline
+        base = base_start + fraction * (base_end - base_start)
+        self._area_buffer[start + 4 : start + 8] = _line_points(partial[-1], base)
+        self._area_buffer[start + 8 : start + 12] = _line_points(base, base_start)
+        self._area_buffer[start + 12 : start + 16] = _line_points(base_start, self._graph[0])
+        self._patched = start
+
+        self.curve.points = self._curve_buffer[: start + 4]
+        self.area.points = self._area_buffer[: start + 16]
+        self.fraction = fraction
+        return self
@@ -0,0 +1,292 @@
+from manim import *
+import argparse
+import functools
+import importlib
+import json
+import os
+import sys
+import time
+import numpy as np
+
+# Opt-in per-updater frame profiler
+# python frame_profiler.py bar_magnet_rotation.py DipoleRotation --trace dipole_trace.json
+
+
+def _updater_name(mob, updater):
+    """A readable name for an updater: its owner, function name and source line."""
+    code = getattr(updater, "__code__", None)
+    location = f"@{os.path.basename(code.co_filename)}:{code.co_firstlineno}" if code else ""
+    owner = f"{type(mob).__name__}." if mob is not None else "Scene."
+    return f"{owner}{getattr(updater, '__qualname__', type(updater).__name__)}{location}"
+
+
+class FrameProfiler:
+    """
+    Attributes per-frame time to updaters, rasterization and encoding.
+
+    While attached, every mobject and scene updater is wrapped with a timer,
+    including updaters added later (e.g. by `always_redraw`), and removing an
+    updater by its original function removes its wrapper too. The renderer's
+    frame drawing and frame writing are timed. Each rendered frame becomes one
+    record, tagged with the play call it belongs to.
+
+    Attributes:
+        scene (Scene): The profiled scene.
+        frames (list): One dict per frame with "play", "update", "rasterize",
+            "encode" and "updaters" (updater name -> seconds).
+        events (list): Chrome trace events, in microseconds.
+    """
+
+    def __init__(self, scene):
+        self.scene = scene
+        self.frames = []
+        self.events = []
+        self._play_label = "setup"
+        self._n_plays = 0
+        self._pending = self._empty_frame()
+        self._restore = []
+        self._t0 = time.perf_counter()
+
+    def _empty_frame(self):
+        return {"play": None, "update": 0.0, "rasterize": 0.0, "encode": 0.0, "updaters": {}}
+
+    def _record(self, name, category, start, end):
+        self.events.append({
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self._t0) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": 0,
+            "tid": 0,
+        })
+
+    def _wrap_updater(self, mob, updater):
+        """Wraps an updater with a timer, keeping its signature so manim still passes dt."""
+        if getattr(updater, "_frame_profiler", None) is self:
+            return updater
+        name = _updater_name(mob, updater)
+
+        @functools.wraps(updater)
+        def timed_updater(*args, **kwargs):
+            start = time.perf_counter()
+            result = updater(*args, **kwargs)
+            end = time.perf_counter()
+            updaters = self._pending["updaters"]
+            updaters[name] = updaters.get(name, 0.0) + end - start
+            self._record(name, "updater", start, end)
+            return result
+
+        timed_updater._frame_profiler = self
+        return timed_updater
+
+    def _wrappers_of(self, updaters, updater):
+        """The updaters in a list that are this profiler's wrappers of `updater`."""
+        return [
+            wrapper for wrapper in updaters
+            if getattr(wrapper, "_frame_profiler", None) is self and wrapper.__wrapped__ is updater
+        ]
+
+    def _patch(self, owner, attribute, replacement):
+        self._restore.append((owner, attribute, owner.__dict__.get(attribute)))
+        setattr(owner, attribute, replacement)
+
+    def attach(self):
+        """
+        Starts profiling.
+
+        Returns:
+            FrameProfiler: self, for chaining.
+        """
+        profiler = self
+        scene = self.scene
+        renderer = scene.renderer
+
+        # Updaters that already exist
+        for mob in scene.mobjects:
+            for sub in mob.get_family():
+                sub.updaters = [self._wrap_updater(sub, updater) for updater in sub.updaters]
+        scene.updaters = [self._wrap_updater(None, updater) for updater in scene.updaters]
+
+        # Updaters added from now on
+        add_updater = Mobject.add_updater
+
+        def profiled_add_updater(mob, update_function, *args, **kwargs):
+            return add_updater(mob, profiler._wrap_updater(mob, update_function), *args, **kwargs)
+
+        self._patch(Mobject, "add_updater", profiled_add_updater)
+        scene_add_updater = scene.add_updater
+        self._patch(scene, "add_updater", lambda func: scene_add_updater(self._wrap_updater(None, func)))
+
+        # Mobjects and scenes remove updaters by identity, so removing the original removes its wrappers
+        remove_updater = Mobject.remove_updater
+
+        def profiled_remove_updater(mob, update_function):
+            for wrapper in profiler._wrappers_of(mob.updaters, update_function):
+                remove_updater(mob, wrapper)
+            return remove_updater(mob, update_function)
+
+        self._patch(Mobject, "remove_updater", profiled_remove_updater)
+        scene_remove_updater = scene.remove_updater
+
+        def profiled_scene_remove_updater(func):
+            for wrapper in profiler._wrappers_of(scene.updaters, func):
+                scene_remove_updater(wrapper)
+            scene_remove_updater(func)
+
+        self._patch(scene, "remove_updater", profiled_scene_remove_updater)
+
+        # Label frames with the play call they belong to
+        play = scene.play
+
+        def profiled_play(*animations, **kwargs):
+            profiler._n_plays += 1
+            names = ", ".join(type(animation).__name__ for animation in animations)
+            profiler._play_label = f"{profiler._n_plays}: {names}"
+            start = time.perf_counter()
+            result = play(*animations, **kwargs)
+            profiler._record(profiler._play_label, "play", start, time.perf_counter())
+            return result
+
+        self._patch(scene, "play", profiled_play)
+
+        # Split each frame into updating, rasterizing and encoding
+        for owner, attribute, category in (
+            (scene, "update_to_time", "update"),
+            (renderer, "update_frame", "rasterize"),
+            (renderer, "add_frame", "encode"),
+        ):
+            self._patch(owner, attribute, self._timed_stage(getattr(owner, attribute), category))
+
+        render = renderer.render
+
+        def profiled_render(*args, **kwargs):
+            render(*args, **kwargs)
+            frame = profiler._pending
+            frame["play"] = profiler._play_label
+            profiler.frames.append(frame)
+            profiler._pending = profiler._empty_frame()
+
+        self._patch(renderer, "render", profiled_render)
+        return self
+
+    def _timed_stage(self, func, category):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            end = time.perf_counter()
+            self._pending[category] += end - start
+            self._record(category, "stage", start, end)
+            return result
+
+        return timed
+
+    def detach(self):
+        """Stops profiling and restores everything that was patched."""
+        for owner, attribute, original in reversed(self._restore):
+            if original is None:
+                delattr(owner, attribute)
+            else:
+                setattr(owner, attribute, original)
+        self._restore = []
+
+    def __enter__(self):
+        return self.attach()
+
+    def __exit__(self, *exc_info):
+        self.detach()
+
+    def report(self, top_updaters=5):
+        """
+        Summarizes frame times per play call.
+
+        Args:
+            top_updaters (int): How many of the slowest updaters to list per play call.
+
+        Returns:
+            dict: Play label -> frame count, mean and p95 ms per stage, and the updaters
+                with the most total time.
+        """
+        by_play = {}
+        for frame in self.frames:
+            by_play.setdefault(frame["play"], []).append(frame)
+
+        report = {}
+        for label, frames in by_play.items():
+            summary = {"frames": len(frames)}
+            for stage in ("update", "rasterize", "encode"):
+                times_ms = 1000 * np.array([frame[stage] for frame in frames])
+                summary[f"{stage}_mean_ms"] = float(times_ms.mean())
+                summary[f"{stage}_p95_ms"] = float(np.percentile(times_ms, 95))
+            totals = {}
+            for frame in frames:
+                for name, seconds in frame["updaters"].items():
+                    totals[name] = totals.get(name, 0.0) + seconds
+            slowest = sorted(totals.items(), key=lambda item: -item[1])[:top_updaters]
+            summary["updaters_total_ms"] = {name: 1000 * seconds for name, seconds in slowest}
+            report[label] = summary
+        return report
+
+    def dump_report(self, path):
+        """Writes `report()` as JSON."""
+        with open(path, "w") as report_file:
+            json.dump(self.report(), report_file, indent=2)
+
+    def dump_chrome_trace(self, path):
+        """Writes the recorded events in Chrome trace format, for chrome://tracing or Perfetto."""
+        with open(path, "w") as trace_file:
+            json.dump({"traceEvents": self.events, "displayTimeUnit": "ms"}, trace_file)
+
+
+def profile_scene(file_name, scene_name, config_overrides=None):
+    """
+    Renders one scene with a FrameProfiler attached.
+
+    Args:
+        file_name (str): The file defining the scene.
+        scene_name (str): The scene class name.
+        config_overrides (dict): manim config to render with.
+
+    Returns:
+        FrameProfiler: The detached profiler, holding the recorded frames.
+    """
+    sys.path.insert(0, os.path.dirname(os.path.abspath(file_name)))
+    module = importlib.import_module(os.path.splitext(os.path.basename(file_name))[0])
+    with tempconfig(config_overrides or {}):
+        scene = getattr(module, scene_name)()
+        with FrameProfiler(scene) as profiler:
+            scene.render()
+    return profiler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile the per-frame cost of a scene's updaters.")
+    parser.add_argument("file", help="the file defining the scene")
+    parser.add_argument("scene", help="the scene class name")
+    parser.add_argument("--quality", default="low_quality", help="manim quality preset")
+    parser.add_argument("--no-movie", action="store_true", help="skip encoding, timing updaters and rasterization only")
+    parser.add_argument("--report", default=None, help="where to write the per-play JSON report")
+    parser.add_argument("--trace", default=None, help="where to write a Chrome trace")
+    args = parser.parse_args()
+
+    profiler = profile_scene(args.file, args.scene, {
+        "quality": args.quality,
+        "write_to_movie": not args.no_movie,
+        "disable_caching": True,
+        "preview": False,
+    })
+    report = profiler.report()
+    for label, summary in report.items():
+        print(
+            f"{label}: {summary['frames']} frames, "
+            f"update {summary['update_mean_ms']:.2f} ms, "
+            f"rasterize {summary['rasterize_mean_ms']:.2f} ms, "
+            f"encode {summary['encode_mean_ms']:.2f} ms"
+        )
+        for name, total_ms in summary["updaters_total_ms"].items():
+            print(f"    {total_ms:9.2f} ms  {name}")
+    if args.report:
+        profiler.dump_report(args.report)
+    if args.trace:
+        profiler.dump_chrome_trace(args.trace)
@@ -1,5 +1,6 @@
 from manim import *
 import numpy as np
+from level_of_detail import lod_samples
 
 class LaserPulse(VGroup):
     def __init__(
@@ -12,6 +13,7 @@ class LaserPulse(VGroup):
         wave_speed=2.0,
         color=BLUE,
         stroke_width=3,
+        n_samples=None,
         **kwargs
     ):
         super().__init__(**kwargs)
@@ -23,49 +25,69 @@ class LaserPulse(VGroup):
         if self.length == 0:
             return
         self.direction /= self.length 
+        self.perp       = rotate_vector(self.direction, 90 * DEGREES)
         self.amplitude  = amplitude
         self.sigma      = sigma
         self.freq       = freq
         self.wave_speed = wave_speed
         self.color      = color
         self.stroke_width = stroke_width
+        self.n_samples  = n_samples = lod_samples(100) if n_samples is None else n_samples # 100 at full quality
 
         self.time_tracker = ValueTracker(-3 * self.sigma / self.wave_speed)
         self.set_opacity(0)
 
+        # Fixed-size sample and Bezier point buffers, refilled in place every frame
+        self._u = np.linspace(0, 1, n_samples + 1)
+        self._x = np.empty(n_samples + 1)
+        self._anchors = np.empty((n_samples + 1, 3))
+        self._tangents = np.empty((n_samples + 1, 3))
+        self._points = np.empty((4 * n_samples, 3))
 
-        self.curve = always_redraw(self._make_pulse_curve)
+        self.curve = VMobject(color=self.color, stroke_width=self.stroke_width)
+        self._update_pulse_curve(self.curve)
+        self.curve.add_updater(self._update_pulse_curve)
         self.add(self.curve)
 
-    def _make_pulse_curve(self):
+    def _update_pulse_curve(self, curve):
         t = self.time_tracker.get_value()
         center_pos = self.wave_speed * t
-
+        points = self._points
+        curve.points = points
 
         left_bound  = max(0, center_pos - 3*self.sigma)
         right_bound = min(self.length, center_pos + 3*self.sigma)
 
         if right_bound < left_bound:
-            return ParametricFunction(lambda u: self.start_point, t_range=[0, 0])
+            points[:] = self.start_point
+            return
 
-        def param_func(u):
-            x = interpolate(left_bound, right_bound, u)
-            point_on_line = self.start_point + x * self.direction
+        # Sample envelope x oscillation over the visible window in one pass
+        x = self._x
+        np.multiply(self._u, right_bound - left_bound, out=x)
+        x += left_bound - center_pos
+        envelope = np.exp(-(x**2) / (2 * self.sigma**2))
+        wave_arg = 2 * PI * self.freq * x
+        oscillation = np.sin(wave_arg)
+        offset = self.amplitude * envelope * oscillation
+        # d(offset)/dx, used for the Bezier handles so the curve stays smooth
+        slope = self.amplitude * envelope * (2 * PI * self.freq * np.cos(wave_arg) - x / self.sigma**2 * oscillation)
+        x += center_pos
 
-            envelope = np.exp(-((x - center_pos)**2)/(2 * self.sigma**2))
-            wave_arg = 2 * PI * self.freq * (x - center_pos)
-            oscillation = np.sin(wave_arg)
-            perp = rotate_vector(self.direction, 90 * DEGREES)
+        anchors = self._anchors
+        np.multiply.outer(x, self.direction, out=anchors)
+        anchors += np.multiply.outer(offset, self.perp)
+        anchors += self.start_point
 
-            offset = self.amplitude * envelope * oscillation
-            return point_on_line + offset * perp
+        tangents = self._tangents
+        np.multiply.outer(slope, self.perp, out=tangents)
+        tangents += self.direction
+        tangents *= (right_bound - left_bound) / (3 * self.n_samples)
 
-        return ParametricFunction(
-            param_func,
-            t_range=[0, 1, 0.01],
-            color=self.color,
-            stroke_width=self.stroke_width,
-        )
+        points[0::4] = anchors[:-1]
+        points[1::4] = anchors[:-1] + tangents[:-1]
+        points[2::4] = anchors[1:] - tangents[1:]
+        points[3::4] = anchors[1:]
 
     def animate_pulse(self, run_time=None):
         self.set_opacity(1)
@@ -2,6 +2,9 @@ from manim import *
 import numpy as np
 import random
 from laserbeam import * # laserbeam.py
+from spatial_index import * # spatial_index.py
+from narration import NarrationMixin # narration.py
+from section_cache import SectionCacheMixin # section_cache.py
 # from manim_voiceover import *
 
 # from manim_voiceover.services.azure import AzureService
@@ -10,7 +13,7 @@ from laserbeam import * # laserbeam.py
 
 # manim -pqh lattice_engineering.py Lattice_Engineering_Animation
 
-class Lattice_Engineering_Animation(Scene):
+class Lattice_Engineering_Animation(SectionCacheMixin, NarrationMixin, Scene):
     def construct(self):
         # self.set_speech_service(AzureService(voice="en-US-AriaNeural",style="newscast-casual",global_speed=1.25)) # MS Azure Voice
         
@@ -45,8 +48,8 @@ class Lattice_Engineering_Animation(Scene):
             
         init_group = AnimationGroup(Write(square), FadeIn(nv_label), dots_spawning, lag_ratio=1)
         # Add the square to the scene
-        # with self.voiceover(text="We developed a technique called lattice engineering to address this problem and create usable ordered structures of Nitrogen Vacancy Centers") as tracker:
-        self.play(init_group, run_time = tracker.duration)
+        with self.voiceover(text="We developed a technique called lattice engineering to address this problem and create usable ordered structures of Nitrogen Vacancy Centers") as tracker:
+            self.play(init_group, run_time = tracker.duration)
         
         # Turn the dimers red, and then back to white
         
@@ -54,18 +57,13 @@ class Lattice_Engineering_Animation(Scene):
         normals = VGroup()
         
         # Separating the dots into dimers and normal NV Centers
-        for i, dot1 in enumerate(dots):
-            close_to_others = False
-            for j, dot2 in enumerate(dots):
-                if i != j:  # Avoid comparing the dot with itself
-                    distance = np.linalg.norm(dot1.get_center() - dot2.get_center())
-                    if distance < 0.1:
-                        close_to_others = True
-                        break  # Stop checking further neighbors for this dot
+        dot_positions = np.array([dot.get_center() for dot in dots])
+        is_dimer = has_neighbor(dot_positions, 0.1)
+        for dot, close_to_others in zip(dots, is_dimer):
             if close_to_others:
-                dimers.add(dot1)
+                dimers.add(dot)
             else:
-                normals.add(dot1)
+                normals.add(dot)
         
         self.wait(1)
         dimer_mark = AnimationGroup(
@@ -149,8 +147,8 @@ class Lattice_Engineering_Animation(Scene):
             [FadeIn(x) for x in [dimer, normal]],
             lag_ratio=1.0)
         
-        # with self.voiceover(text="Since NV centers require higher energy the closer together they are,") as tracker:
-        self.play(energy_table_animations)
+        with self.voiceover(text="Since NV centers require higher energy the closer together they are,") as tracker:
+            self.play(energy_table_animations)
         
         
         # Excite and return arrows:
@@ -176,8 +174,8 @@ class Lattice_Engineering_Animation(Scene):
         laser_gun.set_stroke(color=WHITE, width=4)
         
         # Add the open shape to the scene
-        # with self.voiceover(text="we can apply a low energy light pulse") as tracker:
-        self.play(FadeIn(laser_gun),Write(laser_label))
+        with self.voiceover(text="we can apply a low energy light pulse") as tracker:
+            self.play(FadeIn(laser_gun),Write(laser_label))
 
         pulse_green = LaserPulse(
             start = np.array([-5, 0, 0]),  
@@ -203,47 +201,55 @@ class Lattice_Engineering_Animation(Scene):
         self.add(pulse_green,pulse_blue)
 
         # Raise normal NV centers to -1, make green
-        self.wait(1)
-        # with self.voiceover(text="to the diamond to only excite defects") as tracker:
-        self.play(AnimationGroup(pulse_green.animate_pulse(run_time=1)))
-        # self.play( run_time=.25)
-        # self.play(normal.animate.shift(UP))
-        normal_raise = AnimationGroup(normal.animate.shift(UP),normal.animate.set_color(GREEN), normals.animate.set_color(GREEN), run_time=0.5)
-        # with self.voiceover(text="that are far away") as tracker:
-        self.play(normal_raise, run_time = 0.5)
-        # with self.voiceover(text="from other defects,") as tracker:
-        self.play(FadeIn(normal_excite_arrow), normal.animate.shift(UP), run_time = 1)
-        # self.voiceover(text="and bring them into a medium-energy state.")
+        def excite_normals():
+            self.wait(1)
+            with self.voiceover(text="to the diamond to only excite defects") as tracker:
+                self.play(AnimationGroup(pulse_green.animate_pulse(run_time=1)))
+            # self.play( run_time=.25)
+            # self.play(normal.animate.shift(UP))
+            normal_raise = AnimationGroup(normal.animate.shift(UP),normal.animate.set_color(GREEN), normals.animate.set_color(GREEN), run_time=0.5)
+            with self.voiceover(text="that are far away") as tracker:
+                self.play(normal_raise, run_time = 0.5)
+            with self.voiceover(text="from other defects,") as tracker:
+                self.play(FadeIn(normal_excite_arrow), normal.animate.shift(UP), run_time = 1)
+            # self.voiceover(text="and bring them into a medium-energy state.")
+        self.cached_section("excite normals", excite_normals)
         
         
         # Raise dimers to +1, make blue
-        self.wait(1)
-        self.play(FadeOut(normal_excite_arrow), run_time=.25)
-        self.play(pulse_blue.animate_pulse(run_time=1))
-        # self.play(dimer.animate.shift(2 * UP))
-        # self.play(run_time=.25)
-        dimer_raise = AnimationGroup(dimer.animate.set_color(BLUE),dimers.animate.set_color(BLUE), run_time=0.5)
-        self.play(dimer_raise)
-        self.play(FadeIn(dimer_excite_arrow), dimer.animate.shift(2 * UP))
-        # dimer_dot.set_color(BLUE).move_to([3.4,1,0])
-        # dimer_label.set_color(BLUE).move_to([3.4,.6,0])
+        def excite_dimers():
+            self.wait(1)
+            self.play(FadeOut(normal_excite_arrow), run_time=.25)
+            self.play(pulse_blue.animate_pulse(run_time=1))
+            # self.play(dimer.animate.shift(2 * UP))
+            # self.play(run_time=.25)
+            dimer_raise = AnimationGroup(dimer.animate.set_color(BLUE),dimers.animate.set_color(BLUE), run_time=0.5)
+            self.play(dimer_raise)
+            self.play(FadeIn(dimer_excite_arrow), dimer.animate.shift(2 * UP))
+            # dimer_dot.set_color(BLUE).move_to([3.4,1,0])
+            # dimer_label.set_color(BLUE).move_to([3.4,.6,0])
+        self.cached_section("excite dimers", excite_dimers)
         
         
         # Lower normal NV centers to Ground, make white
-        self.wait(1)
-        self.play(FadeOut(dimer_excite_arrow), run_time=.25)
-        self.play(pulse_green.animate_pulse(run_time=1))
-        # self.play( run_time=.25)
-        normal_lower = AnimationGroup(normal.animate.set_color(WHITE),normals.animate.set_color(WHITE), run_time=0.5)
-        self.play(normal_lower)
-        self.play(FadeIn(normal_return_arrow), normal.animate.shift(DOWN))
-        # normal_dot.set_color(WHITE).move_to([4.4,-1,0])
-        # normal_label.set_color(WHITE).move_to([4.4,-1.4,0])
+        def lower_normals():
+            self.wait(1)
+            self.play(FadeOut(dimer_excite_arrow), run_time=.25)
+            self.play(pulse_green.animate_pulse(run_time=1))
+            # self.play( run_time=.25)
+            normal_lower = AnimationGroup(normal.animate.set_color(WHITE),normals.animate.set_color(WHITE), run_time=0.5)
+            self.play(normal_lower)
+            self.play(FadeIn(normal_return_arrow), normal.animate.shift(DOWN))
+            # normal_dot.set_color(WHITE).move_to([4.4,-1,0])
+            # normal_label.set_color(WHITE).move_to([4.4,-1.4,0])
+        self.cached_section("lower normals", lower_normals)
         
         
         # Make blue dimers transparent, show times
-        self.wait(1)
-        self.play(dimers.animate.set_opacity(0.5), run_time=1)
-        self.add(normal_excite_arrow2, dimer_excite_arrow2, dimer_return_arrow)
-        self.play(FadeIn(x) for x in [dimer_arrow_label,normal_arrow_label])
-        self.wait(1)
\ No newline at end of file
+        def show_times():
+            self.wait(1)
+            self.play(dimers.animate.set_opacity(0.5), run_time=1)
+            self.add(normal_excite_arrow2, dimer_excite_arrow2, dimer_return_arrow)
+            self.play(FadeIn(x) for x in [dimer_arrow_label,normal_arrow_label])
+            self.wait(1)
+        self.cached_section("show times", show_times)
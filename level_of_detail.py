@@ -0,0 +1,63 @@
+from manim import *
+import os
+import numpy as np
+
+# Sample counts and tessellations in the project are authored for the final render. Previews at
+# lower resolutions and frame rates scale them down with the render quality:
+#     LaserPulse()                                  # n_samples scaled from the authored 100
+#     LaserPulse(n_samples=400)                     # an explicit count is used as given
+#     BlochSphere(resolution=lod_resolution((24, 48)))
+# LOD_SCALE=1 manim -pql ... previews at full detail.
+
+# The render settings the authored densities are meant for; they and anything above render unchanged
+REFERENCE_PIXEL_HEIGHT = 1080
+REFERENCE_FRAME_RATE = 60
+
+
+def lod_scale():
+    """
+    The fraction of the authored detail to use for the current render quality.
+
+    Spatial detail follows the pixel height, so a curve keeps about the same number of samples
+    per pixel. The frame rate counts for less, through its square root: fewer frames leave
+    less time to notice coarse geometry in motion. The LOD_SCALE environment variable
+    overrides the result.
+
+    Returns:
+        float: 1 at 1080p60 and above, less for previews, e.g. 0.22 for -ql (480p15).
+    """
+    if os.environ.get("LOD_SCALE"):
+        return float(os.environ["LOD_SCALE"])
+    scale = (config.pixel_height / REFERENCE_PIXEL_HEIGHT) * np.sqrt(config.frame_rate / REFERENCE_FRAME_RATE)
+    return min(1.0, scale)
+
+
+def lod_samples(n_samples, minimum=16):
+    """
+    Scales a curve's sample count to the render quality.
+
+    Args:
+        n_samples (int): The sample count authored for the final render.
+        minimum (int): The fewest samples to use, unless fewer were authored.
+
+    Returns:
+        int: The sample count to use.
+    """
+    return max(min(n_samples, minimum), int(round(n_samples * lod_scale())))
+
+
+def lod_resolution(resolution, minimum=4):
+    """
+    Scales a surface's tessellation to the render quality, one dimension at a time.
+
+    Args:
+        resolution (int or tuple): The resolution authored for the final render, like
+            Surface's `resolution`.
+        minimum (int): The fewest faces along a dimension, unless fewer were authored.
+
+    Returns:
+        int or tuple: The resolution to use, in the same form.
+    """
+    if np.ndim(resolution) == 0:
+        return lod_samples(resolution, minimum)
+    return tuple(lod_samples(n, minimum) for n in resolution)
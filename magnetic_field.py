@@ -1,5 +1,6 @@
 from manim import *
 import numpy as np
+from level_of_detail import lod_samples
 
 class MyCurves(VGroup):
     def __init__(
@@ -9,14 +10,15 @@ class MyCurves(VGroup):
         x1_values=None,
         base_color=BLUE,
         family_color=RED,
-        base_n_samples=100,
-        family_n_samples=100,
+        base_n_samples=None,
+        family_n_samples=None,
         show_arrows=True,        
         arrow_count_base=5,       
         arrow_count_family=5,      
         arrow_scale=0.1,           
         arrow_color=WHITE,
         flow_forward=True,         
+        arrow_resolution=None,
         **kwargs
     ):
         super().__init__(**kwargs)
@@ -24,6 +26,11 @@ class MyCurves(VGroup):
         if x1_values is None:
             x1_values = [(k * np.pi/4) for k in range(8)]
 
+        # Unset densities are the full-quality ones, scaled to the render quality
+        base_n_samples = lod_samples(100) if base_n_samples is None else base_n_samples
+        family_n_samples = lod_samples(100) if family_n_samples is None else family_n_samples
+        arrow_resolution = (2, lod_samples(12, minimum=4)) if arrow_resolution is None else arrow_resolution
+
         self.t_min = t_min
         self.t_max = t_max
         self.x1_values = x1_values
@@ -35,90 +42,162 @@ class MyCurves(VGroup):
         self.arrow_scale = arrow_scale
         self.arrow_color = arrow_color
         self.flow_forward = flow_forward
-        base_step = (t_max - t_min) / base_n_samples
-        family_step = (t_max - t_min) / family_n_samples
-
-        def base_func(t):
-            return np.array([
-                (2 / np.sqrt(3)) * np.cos((4/3)*t - np.pi/6),
-                0,
-                np.sin(t),
-            ])
-
-        base_curve = ParametricFunction(
-            base_func,
-            t_range=(t_min, t_max, base_step),
-            color=self.base_color,
+
+        # One cone mesh shared by every arrowhead
+        self.arrow_mesh = Cone(
+            base_radius=self.arrow_scale * 0.5, 
+            height=self.arrow_scale,
+            direction=OUT,  
+            show_base=False,
+            fill_opacity=1.0,
+            color=self.arrow_color,
+            resolution=arrow_resolution,
+        ).set_fill(color = self.arrow_color, opacity = .75)
+        # Only the surface faces: Cone also carries one-point start and end markers
+        faces = [face for face in self.arrow_mesh if isinstance(face, ThreeDVMobject) and len(face.points) == 16]
+        template = faces[0]
+        # One styled face without points, copied for every arrowhead face instead of constructed
+        self._arrow_face = ThreeDVMobject(
+            fill_color=self.arrow_color,
+            fill_opacity=.75,
+            stroke_color=template.get_stroke_color(),
+            stroke_width=template.get_stroke_width(),
+            stroke_opacity=template.get_stroke_opacity(),
         )
+        self._arrow_mesh_points = np.array([face.points for face in faces])
+
+        # The base curve is the x1 = 0 member of the family
+        base_points, base_tangents = self._sample_family([0.0], base_n_samples)
+        base_curve = self._make_curve(base_points[0], base_tangents[0], self.base_color)
         self.add(base_curve)
 
         if self.show_arrows and self.arrow_count_base > 0:
-            arrows_for_base = self._make_arrows_along_curve(
-                base_curve, base_func, self.arrow_count_base
-            )
+            arrows_for_base = self._make_arrows_along_curve([0.0], self.arrow_count_base)[0]
             self.add(*arrows_for_base)
 
-        def family_func_factory(x1):
-            
-            def f(t):
-                return np.array([
-                    (2 / np.sqrt(3)) * np.cos((4/3)*t - np.pi/6),
-                    np.sin(x1) * np.sin(t),
-                    np.cos(x1) * np.sin(t),
-                ])
-            return f
-
-        for x1 in self.x1_values:
-            ffunc = family_func_factory(x1)
-            family_curve = ParametricFunction(
-                ffunc,
-                t_range=(t_min, t_max, family_step),
-                color=self.family_color,
-            )
-            self.add(family_curve)
+        family_points, family_tangents = self._sample_family(self.x1_values, family_n_samples)
+        if self.show_arrows and self.arrow_count_family > 0:
+            family_arrows = self._make_arrows_along_curve(self.x1_values, self.arrow_count_family)
+        else:
+            family_arrows = [[] for _ in self.x1_values]
 
-            if self.show_arrows and self.arrow_count_family > 0:
-                arrows_for_this = self._make_arrows_along_curve(
-                    family_curve, ffunc, self.arrow_count_family
-                )
-                self.add(*arrows_for_this)
-
-    def _make_arrows_along_curve(self, curve_mobj, func, n_arrows):
-        arrows = []
+        for points, tangents, arrows_for_this in zip(family_points, family_tangents, family_arrows):
+            family_curve = self._make_curve(points, tangents, self.family_color)
+            self.add(family_curve)
+            self.add(*arrows_for_this)
+
+    def _evaluate_family(self, x1_values, t_values):
+        """
+        Evaluates every field line of the family and its derivative at once.
+
+        Args:
+            x1_values (array-like): The (K,) family parameters.
+            t_values (np.ndarray): The (T,) curve parameters.
+
+        Returns:
+            tuple: (K, T, 3) points and (K, T, 3) derivatives with respect to t.
+        """
+        x1 = np.asarray(x1_values, dtype=float)[:, None]
+        t = np.asarray(t_values, dtype=float)[None, :]
+        phase = (4/3)*t - np.pi/6
+
+        points = np.empty((x1.shape[0], t.shape[1], 3))
+        points[..., 0] = (2 / np.sqrt(3)) * np.cos(phase)
+        points[..., 1] = np.sin(x1) * np.sin(t)
+        points[..., 2] = np.cos(x1) * np.sin(t)
+
+        derivatives = np.empty_like(points)
+        derivatives[..., 0] = -(8 / (3 * np.sqrt(3))) * np.sin(phase)
+        derivatives[..., 1] = np.sin(x1) * np.cos(t)
+        derivatives[..., 2] = np.cos(x1) * np.cos(t)
+        return points, derivatives
+
+    def _sample_family(self, x1_values, n_samples):
+        """
+        Samples field lines as cubic Bezier points, with handles from the exact derivative.
+
+        Args:
+            x1_values (array-like): The (K,) family parameters.
+            n_samples (int): The number of curve segments per field line.
+
+        Returns:
+            tuple: (K, n_samples + 1, 3) anchors and handle offsets.
+        """
+        t_values = np.linspace(self.t_min, self.t_max, n_samples + 1)
+        points, derivatives = self._evaluate_family(x1_values, t_values)
+        return points, derivatives * (self.t_max - self.t_min) / (3 * n_samples)
+
+    def _make_curve(self, anchors, handle_offsets, color):
+        """Builds a field line VMobject directly from sampled anchors and handle offsets."""
+        curve = VMobject(color=color)
+        points = np.empty((4 * (len(anchors) - 1), 3))
+        points[0::4] = anchors[:-1]
+        points[1::4] = anchors[:-1] + handle_offsets[:-1]
+        points[2::4] = anchors[1:] - handle_offsets[1:]
+        points[3::4] = anchors[1:]
+        curve.points = points
+        return curve
+
+    def _make_arrows_along_curve(self, x1_values, n_arrows):
+        """
+        Places cone arrowheads along several field lines in one batch.
+
+        Args:
+            x1_values (array-like): The (K,) family parameters.
+            n_arrows (int): The number of arrows per field line.
+
+        Returns:
+            list: K lists of arrows, each a VGroup of cone faces.
+        """
         t_vals = np.linspace(self.t_min, self.t_max, n_arrows)
-
-        for t in t_vals:
-            point = func(t)
-            tangent = self._approx_tangent(func, t)
-
-            if not self.flow_forward:
-                tangent = -tangent
-
-            arrow = Cone(
-                base_radius=self.arrow_scale * 0.5, 
-                height=self.arrow_scale,
-                direction=OUT,  
-                show_base=False,
-                fill_opacity=1.0,
-                color=self.arrow_color
-            ).set_fill(color = self.arrow_color, opacity = .75)
-           
-            arrow.set_direction(tangent)
-
-            arrow.shift(point)
-
-            arrows.append(arrow)
-        return arrows
-
-    def _approx_tangent(self, func, t, eps=1e-5):
-        p1 = func(t + eps)
-        p2 = func(t - eps)
-        tangent = p1 - p2
-        norm = np.linalg.norm(tangent)
-        if norm < 1e-12:
-
-            return OUT
-        return tangent / norm
+        points, tangents = self._evaluate_family(x1_values, t_vals)
+        points, tangents = points.reshape(-1, 3), tangents.reshape(-1, 3)
+
+        norms = np.linalg.norm(tangents, axis=1, keepdims=True)
+        tangents = np.where(norms < 1e-12, OUT, tangents / np.maximum(norms, 1e-12))
+        if not self.flow_forward:
+            tangents = -tangents
+
+        # Rotate the OUT-facing mesh onto each tangent the way Cone.set_direction does
+        theta = np.arccos(np.clip(tangents[:, 2], -1, 1))
+        phi = np.arctan2(tangents[:, 1], tangents[:, 0])
+        rotations = np.einsum("aij,ajk->aik", _z_rotations(phi), _y_rotations(theta))
+        arrow_points = np.einsum("aij,fpj->afpi", rotations, self._arrow_mesh_points)
+        arrow_points += points[:, None, None, :]
+
+        arrows = [self._make_arrow(face_points) for face_points in arrow_points]
+        return [arrows[i:i + n_arrows] for i in range(0, len(arrows), n_arrows)]
+
+    def _make_arrow(self, face_points):
+        """Builds one arrowhead from the shared cone mesh, already rotated and shifted."""
+        faces = []
+        for points in face_points:
+            face = self._arrow_face.copy()
+            face.points = points
+            faces.append(face)
+        return VGroup(*faces)
+
+
+def _z_rotations(angles):
+    """Stacks rotation matrices about the z axis, one per angle."""
+    cos, sin = np.cos(angles), np.sin(angles)
+    zero, one = np.zeros_like(angles), np.ones_like(angles)
+    return np.stack([
+        np.stack([cos, -sin, zero], axis=-1),
+        np.stack([sin, cos, zero], axis=-1),
+        np.stack([zero, zero, one], axis=-1),
+    ], axis=-2)
+
+
+def _y_rotations(angles):
+    """Stacks rotation matrices about the y axis, one per angle."""
+    cos, sin = np.cos(angles), np.sin(angles)
+    zero, one = np.zeros_like(angles), np.ones_like(angles)
+    return np.stack([
+        np.stack([cos, zero, sin], axis=-1),
+        np.stack([zero, one, zero], axis=-1),
+        np.stack([-sin, zero, cos], axis=-1),
+    ], axis=-2)
     
     
 #example implemetnation
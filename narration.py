@@ -0,0 +1,269 @@
+from manim import *
+import argparse
+import hashlib
+import json
+import os
+import re
+import shlex
+import subprocess
+import wave
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from render_all import PROJECT_DIR
+
+# Extracts the voiceover texts of the project, generates their audio and caches their durations
+# python narration.py                                   (silent stand-in, estimated durations)
+# python narration.py --engine "espeak-ng -s 170 -w {output} {text}"
+# python narration.py --import-voiceover-cache          (reuse the recordings in media/voiceovers/cache.json)
+
+VOICEOVER_DIR = os.path.join(PROJECT_DIR, "media", "voiceovers")
+MANIFEST_PATH = os.path.join(VOICEOVER_DIR, "narration_manifest.json")
+
+# `self.voiceover(text="...")`, commented out or not
+VOICEOVER_CALL = re.compile(r"""voiceover\(\s*text\s*=\s*(["'])(.+?)\1""")
+
+
+def text_key(text):
+    """The manifest key of a narration text."""
+    return hashlib.sha256(text.strip().encode()).hexdigest()[:16]
+
+
+def audio_duration(path):
+    """
+    The duration of an audio file in seconds: read from the header for WAV, from ffprobe otherwise.
+    """
+    if path.endswith(".wav"):
+        with wave.open(path) as audio:
+            return audio.getnframes() / audio.getframerate()
+    result = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", path],
+        capture_output=True, text=True, check=True,
+    )
+    return float(result.stdout.strip())
+
+
+class SilentEngine:
+    """
+    A stand-in speech engine: estimates how long a text takes to say and writes that much silence.
+
+    Attributes:
+        words_per_minute (float): The assumed speaking rate.
+        pause (float): Extra seconds for every comma, period or other pause in the text.
+    """
+
+    name = "silent"
+
+    def __init__(self, words_per_minute=180, pause=0.25, sample_rate=22050):
+        self.words_per_minute = words_per_minute
+        self.pause = pause
+        self.sample_rate = sample_rate
+
+    def estimate_duration(self, text):
+        n_words = len(text.split())
+        n_pauses = len(re.findall(r"[,.;:!?]", text))
+        return max(0.5, 60 * n_words / self.words_per_minute + self.pause * n_pauses)
+
+    def synthesize(self, text, output_path):
+        """Writes the silent audio and returns its duration in seconds."""
+        n_frames = int(self.estimate_duration(text) * self.sample_rate)
+        with wave.open(output_path, "wb") as audio:
+            audio.setnchannels(1)
+            audio.setsampwidth(2)
+            audio.setframerate(self.sample_rate)
+            audio.writeframes(bytes(2 * n_frames))
+        return n_frames / self.sample_rate
+
+
+class CommandEngine:
+    """
+    A local speech engine run as a command, e.g. espeak-ng or piper. `{text}` and
+    `{output}` in the command are replaced by the text and the WAV file to write.
+
+    Attributes:
+        command (list): The command and its arguments.
+    """
+
+    def __init__(self, command, name=None):
+        self.command = command
+        self.name = name or os.path.basename(command[0])
+
+    def synthesize(self, text, output_path):
+        """Runs the engine and returns the duration of the audio it wrote."""
+        arguments = [part.replace("{text}", text).replace("{output}", output_path) for part in self.command]
+        subprocess.run(arguments, check=True, capture_output=True)
+        return audio_duration(output_path)
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """
+    Returns:
+        dict: Text key -> {"text", "duration", "audio", "engine"}.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path) as manifest_file:
+        return json.load(manifest_file)
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """Writes the manifest atomically, so scenes reading it mid-update never see half a file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    os.replace(temporary_path, path)
+
+
+def collect_narration(project_dir=PROJECT_DIR):
+    """
+    Collects the voiceover texts of the project's files, in order of appearance.
+
+    Returns:
+        list: The unique texts.
+    """
+    texts = []
+    for file_name in sorted(os.listdir(project_dir)):
+        if not file_name.endswith(".py") or file_name == os.path.basename(__file__):
+            continue
+        with open(os.path.join(project_dir, file_name)) as source:
+            for match in VOICEOVER_CALL.finditer(source.read()):
+                if match.group(2) not in texts:
+                    texts.append(match.group(2))
+    return texts
+
+
+def generate_narration(texts, engine=None, jobs=4, force=False, manifest_path=MANIFEST_PATH):
+    """
+    Generates audio for the texts without audio yet, in a worker pool, and records their
+    durations in the manifest as each one finishes.
+
+    Args:
+        texts (list): The narration texts.
+        engine: A speech engine with `name` and `synthesize(text, output_path)`, by default SilentEngine.
+        jobs (int): How many texts to synthesize at once.
+        force (bool): Whether to regenerate texts that already have audio.
+        manifest_path (str): The manifest to update.
+
+    Returns:
+        dict: Text -> error message, for the texts that failed.
+    """
+    engine = engine or SilentEngine()
+    manifest = load_manifest(manifest_path)
+    audio_dir = os.path.join(os.path.dirname(manifest_path), "narration")
+    os.makedirs(audio_dir, exist_ok=True)
+
+    pending = [
+        text for text in texts
+        if force or text_key(text) not in manifest or not os.path.exists(manifest[text_key(text)]["audio"])
+    ]
+    failures = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(pending)))) as pool:
+        futures = {}
+        for text in pending:
+            output_path = os.path.join(audio_dir, f"{text_key(text)}.wav")
+            futures[pool.submit(engine.synthesize, text, output_path)] = (text, output_path)
+        for future in as_completed(futures):
+            text, output_path = futures[future]
+            if future.exception() is not None:
+                failures[text] = f"{type(future.exception()).__name__}: {future.exception()}"
+                continue
+            manifest[text_key(text)] = {
+                "text": text, "duration": future.result(), "audio": output_path, "engine": engine.name,
+            }
+            save_manifest(manifest, manifest_path)
+    return failures
+
+
+def import_voiceover_cache(cache_path=os.path.join(VOICEOVER_DIR, "cache.json"), manifest_path=MANIFEST_PATH):
+    """
+    Adds the recordings that manim_voiceover cached to the manifest, measuring their durations.
+
+    Returns:
+        int: How many texts were added.
+    """
+    manifest = load_manifest(manifest_path)
+    with open(cache_path) as cache_file:
+        entries = json.load(cache_file)
+    added = 0
+    for entry in entries:
+        audio = os.path.join(os.path.dirname(cache_path), entry.get("final_audio") or entry["original_audio"])
+        if not os.path.exists(audio):
+            continue
+        manifest[text_key(entry["input_text"])] = {
+            "text": entry["input_text"],
+            "duration": audio_duration(audio),
+            "audio": audio,
+            "engine": entry["input_data"].get("service", "voiceover_cache"),
+        }
+        added += 1
+    save_manifest(manifest, manifest_path)
+    return added
+
+
+class NarrationTracker:
+    """What a voiceover block knows about its narration, like manim_voiceover's tracker."""
+
+    def __init__(self, text, duration, audio=None):
+        self.text = text
+        self.duration = duration
+        self.audio = audio
+
+
+class NarrationMixin:
+    """
+    Lays scenes out around narration without synthesizing speech during the render.
+
+    `voiceover` reads the text's duration (and audio, if generated) from the
+    narration manifest. Texts not generated yet get the silent engine's estimate,
+    so a render never waits on speech synthesis. Like manim_voiceover, the block
+    waits at its end until the narration has finished.
+
+        class MyScene(NarrationMixin, Scene):
+            def construct(self):
+                with self.voiceover(text="...") as tracker:
+                    self.play(Create(square), run_time=tracker.duration)
+    """
+
+    def narration_manifest(self):
+        if not hasattr(self, "_narration_manifest"):
+            self._narration_manifest = load_manifest(os.path.join(config.media_dir, "voiceovers", "narration_manifest.json"))
+        return self._narration_manifest
+
+    @contextmanager
+    def voiceover(self, text):
+        entry = self.narration_manifest().get(text_key(text))
+        if entry is None:
+            logger.warning(f"No narration generated for '{text}', using an estimated duration")
+            tracker = NarrationTracker(text, SilentEngine().estimate_duration(text))
+        else:
+            tracker = NarrationTracker(text, entry["duration"], entry["audio"])
+            if os.path.exists(entry["audio"]):
+                self.add_sound(entry["audio"])
+
+        start = self.renderer.time
+        yield tracker
+        remaining = tracker.duration - (self.renderer.time - start)
+        if remaining > 1 / config.frame_rate:
+            self.wait(remaining)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate narration audio and cache its durations.")
+    parser.add_argument("--engine", default=None, help='speech command with {text} and {output}, e.g. "espeak-ng -w {output} {text}"')
+    parser.add_argument("--jobs", type=int, default=4, help="texts to synthesize at once")
+    parser.add_argument("--force", action="store_true", help="regenerate texts that already have audio")
+    parser.add_argument("--import-voiceover-cache", action="store_true", help="add the recordings in media/voiceovers/cache.json first")
+    args = parser.parse_args()
+
+    if args.import_voiceover_cache:
+        print(f"Imported {import_voiceover_cache()} cached recordings")
+    engine = CommandEngine(shlex.split(args.engine)) if args.engine else SilentEngine()
+    texts = collect_narration()
+    failures = generate_narration(texts, engine, args.jobs, args.force)
+    for text, error in failures.items():
+        print(f"FAILED '{text}': {error}")
+    manifest = load_manifest()
+    for text in texts:
+        entry = manifest.get(text_key(text))
+        if entry is not None:
+            print(f"{entry['duration']:6.2f} s  {entry['engine']:>8}  {text}")
@@ -0,0 +1,127 @@
+from manim import *
+import numpy as np
+
+DIGITS = "0123456789"
+
+
+class NumericReadout(VGroup):
+    """
+    A number with fixed text around it, e.g. "t = 1.25 s", that can change every frame.
+
+    The text is typeset once, with a slot for every digit, and the digits 0-9 are
+    typeset once and placed into every slot. Changing the value only copies the
+    cached glyph outlines into the slots whose digit changed, instead of running
+    Pango and parsing SVG again like rebuilding a MarkupText would. The readout
+    can be moved, scaled or rotated like any other mobject; the cached glyphs
+    follow it.
+
+    Attributes:
+        value (float): The number shown.
+        num_decimal_places (int): How many digits follow the decimal point.
+        integer_digits (int): How many digits the integer part may have. Leading zeros are left blank.
+        include_sign (bool): Whether there is a slot for a minus sign.
+    """
+
+    def __init__(
+        self,
+        value=0,
+        prefix="",
+        suffix="",
+        num_decimal_places=2,
+        integer_digits=1,
+        include_sign=False,
+        font_size=DEFAULT_FONT_SIZE,
+        **text_kwargs
+    ):
+        self.num_decimal_places = num_decimal_places
+        self.integer_digits = integer_digits
+        self.include_sign = include_sign
+
+        # Typeset the fixed text with zeros in every digit slot
+        number = "0" * integer_digits + ("." + "0" * num_decimal_places if num_decimal_places else "")
+        sign = "-" if include_sign else ""
+        template_string = f"{prefix}{sign}{number}{suffix}"
+        template = MarkupText(template_string, font_size=font_size, **text_kwargs)
+        super().__init__(*template.submobjects)
+
+        # Spaces have no glyph, so count glyphs only over the visible characters
+        glyph_index = len("".join(prefix.split()))
+        self._slots = []
+        self._slot_glyphs = []
+        if include_sign:
+            minus = self.submobjects[glyph_index]
+            self._slots.append(minus)
+            self._slot_glyphs.append({"-": minus.points.copy(), None: np.zeros((0, 3))})
+            glyph_index += 1
+
+        # Typeset every digit once and place a copy in each slot, sitting on the slot's baseline
+        digit_glyphs = MarkupText(DIGITS, font_size=font_size, **text_kwargs)
+        for char in number:
+            slot = self.submobjects[glyph_index]
+            glyph_index += 1
+            if char == ".":
+                continue
+            glyphs = {None: np.zeros((0, 3))}
+            for digit, glyph in zip(DIGITS, digit_glyphs):
+                glyphs[digit] = glyph.points + (slot.get_bottom() - glyph.get_bottom())
+            self._slots.append(slot)
+            self._slot_glyphs.append(glyphs)
+
+        # Map from the layout above to wherever the readout is now, refit when it moves
+        self._affine = np.vstack([np.eye(3), np.zeros((1, 3))])
+        self._reference = len(self._slots) - num_decimal_places - 1
+        self._shown = ["-"] * include_sign + ["0"] * (integer_digits + num_decimal_places)
+        self._reference_points = self._slots[self._reference].points.copy()
+        self.value = None
+        self.set_value(value)
+
+    def _update_frame(self):
+        """Refits the layout-to-scene map if the readout was moved since the last update."""
+        reference = self._slots[self._reference]
+        if np.array_equal(reference.points, self._reference_points):
+            return
+        layout_points = self._slot_glyphs[self._reference][self._shown[self._reference]]
+        homogeneous = np.hstack([layout_points, np.ones((len(layout_points), 1))])
+        self._affine = np.linalg.lstsq(homogeneous, reference.points, rcond=None)[0]
+        self._reference_points = reference.points.copy()
+
+    def _characters(self, value):
+        """The character shown in each slot for a value, None for blank slots."""
+        text = f"{abs(value):.{self.num_decimal_places}f}"
+        integer_part, _, decimal_part = text.partition(".")
+        if len(integer_part) > self.integer_digits:
+            raise ValueError(f"{value} needs more than {self.integer_digits} integer digits")
+        if value < 0 and not self.include_sign:
+            raise ValueError(f"{value} is negative but the readout has no sign slot")
+
+        characters = [None] * (self.integer_digits - len(integer_part)) + list(integer_part) + list(decimal_part)
+        if self.include_sign:
+            is_negative = value < 0 and float(text) != 0
+            characters.insert(0, "-" if is_negative else None)
+        return characters
+
+    def set_value(self, value):
+        """
+        Shows a new value, swapping only the digits that changed.
+
+        Args:
+            value (float): The number to show.
+
+        Returns:
+            NumericReadout: self, for chaining.
+        """
+        if value == self.value:
+            return self
+        self._update_frame()
+        for i, char in enumerate(self._characters(value)):
+            if char == self._shown[i]:
+                continue
+            layout_points = self._slot_glyphs[i][char]
+            self._slots[i].points = layout_points @ self._affine[:3] + self._affine[3]
+            self._shown[i] = char
+        self._reference_points = self._slots[self._reference].points.copy()
+        self.value = value
+        return self
+
+    def get_value(self):
+        return self.value
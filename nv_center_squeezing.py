@@ -4,6 +4,7 @@ import random
 import matplotlib as plt
 from waveform import * # waveform.py
 from carbon_lattice import * # carbon_lattice.py
+from level_of_detail import * # level_of_detail.py
 # from manim.opengl import *
 # config.renderer="opengl"
 # config.write_to_movie=True
@@ -28,39 +29,15 @@ class NVCenter(ThreeDScene):
         lattice_yrange = [-1,0]
         lattice_zrange = [0]
         
-        diamond_lattice = VGroup()
-        lattice_bonds = VGroup()
-        
-        # Base objects
-        base_sphere = Sphere(radius=a * 0.1,resolution=8, color=BLACK).move_to(a*np.array([0,0,0])).set_fill(color=BLACK, opacity=1)
-        # base_sphere.z_index = 2
-        rounded_sqrt = np.round(( 0.1 /np.sqrt(2)), 4)
-        base_bonds = VGroup(
-            Line(a*np.array([0 + rounded_sqrt,0 + rounded_sqrt,0 + rounded_sqrt]),a*np.array([0.25 - rounded_sqrt,0.25 - rounded_sqrt,0.25 - rounded_sqrt])),
-            Line(a*np.array([0.25 + rounded_sqrt,0.25 - rounded_sqrt,0.25 + rounded_sqrt]),a*np.array([0.5 - rounded_sqrt, 0 + rounded_sqrt, 0.5 - rounded_sqrt])),
-            Line(a*np.array([0.25 - rounded_sqrt,0.25 + rounded_sqrt,0.25 + rounded_sqrt]),a*np.array([0 + rounded_sqrt, 0.5 - rounded_sqrt, 0.5 - rounded_sqrt])),
-            Line(a*np.array([0.25 + rounded_sqrt,0.25 + rounded_sqrt,0.25 - rounded_sqrt]),a*np.array([0.5 - rounded_sqrt, 0.5 - rounded_sqrt, 0 + rounded_sqrt])),
+        carbon_lattice = CarbonLattice(
+            lattice_xrange=lattice_xrange,
+            lattice_yrange=lattice_yrange,
+            lattice_zrange=lattice_zrange,
+            scaling=a,
+            bond_inset=np.round(0.1 / np.sqrt(2), 4),
         )
-        # base_bonds.z_index = 1
-        for x in lattice_xrange:
-            for y in lattice_yrange:
-                for z in lattice_zrange:
-                    lattice_bonds.add(
-                        base_bonds.copy().shift(a/2*np.array([x,y,z]))
-                    )
-        #Make the solid shape
-        for x in range(lattice_xrange[0], lattice_xrange[-1] + 2):
-            for y in range(lattice_yrange[0], lattice_yrange[-1] + 2):
-                for z in range(lattice_zrange[0], lattice_zrange[-1] + 2):
-                    diamond_lattice.add(
-                        base_sphere.copy().shift(a/2*np.array([x,y,z]))
-                    )
-        for x in lattice_xrange:
-            for y in lattice_yrange:
-                for z in lattice_zrange:
-                    diamond_lattice.add(
-                        base_sphere.copy().shift(a/2*np.array([x+.5,y+.5,z+.5]))
-                    )
+        diamond_lattice = carbon_lattice.diamond_lattice
+        lattice_bonds = carbon_lattice.lattice_bonds
                                 
         diamond_lattice.scale(0.5).move_to([0,0,0])
         lattice_bonds.scale(0.5).move_to([0,0,0])
@@ -88,18 +65,10 @@ class NVCenter(ThreeDScene):
         replacement_location = np.array([1,-1,0])
         
         # nitrogen = Sphere(radius=a * 0.1,resolution=8, color=BLUE, stroke_opacity=0).move_to(replacement_location).set_fill(color=BLUE, opacity=1)
-        error_tolerance = 0.05
-        
-        for carbon in diamond_lattice:
-            print(carbon.get_center().tolist())
-            if (all(abs(a - b) <= error_tolerance for a, b in zip(np.array(carbon.get_center().tolist()), replacement_location))):
-                a1 = carbon.animate.set_style(fill_color=BLUE, stroke_opacity=0).set_z_index(1)
-                
-        for bond_group in lattice_bonds:
-            for bond in bond_group:
-                print(bond.get_center().tolist())
-                if all(abs(a - b) <= error_tolerance for a, b in zip(bond.get_center().tolist(), replacement_location + np.array([-0.5, 0.5, 0.5]))):
-                    a2 = FadeOut(bond)
+        carbon_lattice.update_index()  # Follow the lattice through the zoom
+        carbon = carbon_lattice.atoms[carbon_lattice.site_at(replacement_location, strict=True)]
+        a1 = carbon.animate.set_style(fill_color=BLUE, stroke_opacity=0).set_z_index(1)
+        a2 = carbon_lattice.remove_bond(replacement_location + np.array([-0.5, 0.5, 0.5]), strict=True)
         
         NV_replacement = AnimationGroup(a1, a2)
         self.play(NV_replacement)
@@ -108,16 +77,13 @@ class NVCenter(ThreeDScene):
         # Add nitrogen electron pair
         e1_pos = replacement_location + np.array([-0.35,0.35,0.35]) + np.array([0.15, 0.15, 0])
         e2_pos = replacement_location + np.array([-0.35,0.35,0.35]) - np.array([0.15, 0.15, 0])
-        e1 = Sphere(radius=a * 0.025,resolution=8, color=BLUE, stroke_opacity=0).move_to(e1_pos).set_fill(color=BLUE, opacity=0.5)
-        e2 = Sphere(radius=a * 0.025,resolution=8, color=BLUE, stroke_opacity=0).move_to(e2_pos).set_fill(color=BLUE, opacity=0.5)
+        e1 = Sphere(radius=a * 0.025,resolution=lod_resolution(8), color=BLUE, stroke_opacity=0).move_to(e1_pos).set_fill(color=BLUE, opacity=0.5)
+        e2 = Sphere(radius=a * 0.025,resolution=lod_resolution(8), color=BLUE, stroke_opacity=0).move_to(e2_pos).set_fill(color=BLUE, opacity=0.5)
         electron_pair = VGroup(e1, e2)
         self.play(FadeIn(electron_pair))
         
         # Create Vacancy
-        for carbon in diamond_lattice:
-            if all(abs(a - b) <= error_tolerance for a, b in zip(carbon.get_center().tolist(), vacancy_location)):
-                # print('removed carbon')
-                self.play(FadeOut(carbon))
+        self.play(carbon_lattice.remove_atom(vacancy_location, strict=True))
         
         self.wait(1)
         # Move electron pair into hole, and make it into a spinning wave equation
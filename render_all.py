@@ -0,0 +1,238 @@
+import argparse
+import os
+import re
+import shlex
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Renders every scene of the final video in parallel and joins them without re-encoding
+# python render_all.py --quality h
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Scenes in the order they appear in the final video
+VIDEO_ORDER = [
+    "Intro_Scene",
+    "Lattice_Engineering_Animation",
+    "NVCenter",
+    "DipoleRotation",
+    "ClassicalLimitAnimation",
+    "StatisticalDistribution",
+]
+
+# The longest scenes, rendered as parallel chunks of their timeline (see chunked_render.py)
+CHUNKED_SCENES = ["Lattice_Engineering_Animation", "NVCenter"]
+
+# manim quality flag -> output folder under media/videos/<file>/
+QUALITY_DIRS = {
+    "l": "480p15",
+    "m": "720p30",
+    "h": "1080p60",
+    "p": "1440p60",
+    "k": "2160p60",
+}
+
+# Render command comments, e.g. "# manim -pqh intro_scene.py Intro_Scene"
+RENDER_COMMENT = re.compile(r"^\s*#\s*manim\s+(.*)$")
+
+# Flags that would change the output format or open a player; the orchestrator sets these itself
+FORMAT_FLAGS = {"--fps", "--frame_rate", "-r", "--resolution"}
+SWITCH_FLAGS = {"-p", "--preview"}
+
+
+def discover_scenes(project_dir=PROJECT_DIR):
+    """
+    Collects the scenes listed in the `# manim ...` render comments of the project files.
+
+    Args:
+        project_dir (str): The directory holding the scene files.
+
+    Returns:
+        dict: Scene name -> (file name, extra manim flags), from the first comment naming each scene.
+    """
+    scenes = {}
+    for file_name in sorted(os.listdir(project_dir)):
+        if not file_name.endswith(".py"):
+            continue
+        with open(os.path.join(project_dir, file_name)) as source:
+            for line in source:
+                match = RENDER_COMMENT.match(line)
+                if match is None:
+                    continue
+                tokens = shlex.split(match.group(1))
+                if file_name not in tokens:
+                    continue
+                position = tokens.index(file_name)
+                if position + 1 >= len(tokens):
+                    continue
+                scene = tokens[position + 1]
+                flags = _strip_format_flags(tokens[:position] + tokens[position + 2:])
+                scenes.setdefault(scene, (file_name, flags))
+    return scenes
+
+
+def _strip_format_flags(tokens):
+    """Drops preview, quality and frame-format flags, keeping the rest (e.g. --disable_caching)."""
+    kept = []
+    skip_next = False
+    for token in tokens:
+        if skip_next:
+            skip_next = False
+        elif token in FORMAT_FLAGS:
+            skip_next = True
+        elif token in SWITCH_FLAGS or re.fullmatch(r"-p?q[lmhpk]p?", token):
+            continue
+        else:
+            kept.append(token)
+    return kept
+
+
+def render_scene(scene, file_name, flags, quality="h", project_dir=PROJECT_DIR):
+    """
+    Renders one scene with the manim CLI.
+
+    Args:
+        scene (str): The scene class name.
+        file_name (str): The file defining the scene.
+        flags (list): Extra manim flags for this scene.
+        quality (str): The manim quality letter shared by every scene.
+        project_dir (str): The directory holding the scene files.
+
+    Returns:
+        str: The path of the rendered movie.
+    """
+    command = ["manim", "render", f"-q{quality}", *flags, file_name, scene]
+    subprocess.run(command, cwd=project_dir, check=True)
+    return os.path.join(
+        project_dir, "media", "videos", os.path.splitext(file_name)[0],
+        QUALITY_DIRS[quality], f"{scene}.mp4",
+    )
+
+
+def render_scene_chunked(scene, file_name, flags, quality="h", chunks=None, project_dir=PROJECT_DIR):
+    """
+    Renders one scene as parallel chunks of its timeline, in its own process like `render_scene`.
+
+    Args:
+        scene (str): The scene class name.
+        file_name (str): The file defining the scene.
+        flags (list): Extra manim flags for this scene; only --disable_caching is passed on.
+        quality (str): The manim quality letter shared by every scene.
+        chunks (int): How many chunks to render at once, by default one per CPU core.
+        project_dir (str): The directory holding the scene files.
+
+    Returns:
+        str: The path of the rendered movie.
+    """
+    from chunked_render import chunked_movie_path
+
+    command = [sys.executable, "chunked_render.py", file_name, scene, "--quality", quality]
+    if chunks:
+        command += ["--chunks", str(chunks)]
+    if "--disable_caching" in flags:
+        command.append("--disable_caching")
+    subprocess.run(command, cwd=project_dir, check=True)
+    return chunked_movie_path(file_name, scene, quality, project_dir)
+
+
+def concatenate(movies, output_path, audio=True):
+    """
+    Joins movies end to end with ffmpeg's concat demuxer, copying the streams.
+    Every movie must share the same codec, resolution and frame rate.
+
+    Args:
+        movies (list): The movie paths, in order.
+        output_path (str): Where to write the joined movie.
+        audio (bool): Whether to keep the audio streams, which then every movie must have.
+    """
+    list_path = output_path + ".txt"
+    with open(list_path, "w") as list_file:
+        for movie in movies:
+            list_file.write(f"file '{os.path.abspath(movie)}'\n")
+    subprocess.run(
+        ["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+         "-i", list_path, "-c", "copy", *([] if audio else ["-an"]), output_path],
+        check=True,
+    )
+    os.remove(list_path)
+
+
+def render_all(order=VIDEO_ORDER, quality="h", jobs=None, output_path=None, project_dir=PROJECT_DIR, warm_tex=True,
+               narrate=True, chunked=CHUNKED_SCENES):
+    """
+    Renders the scenes of the final video in parallel, then joins them in order.
+    The LaTeX cache is filled first, so no scene waits on LaTeX one expression at a time.
+    Missing narration is generated alongside the renders; scenes meanwhile use the timings
+    already in the narration manifest, or estimates.
+
+    Args:
+        order (list): The scene names, in video order.
+        quality (str): The manim quality letter shared by every scene.
+        jobs (int): How many scenes to render at once, by default one per CPU core.
+        output_path (str): Where to write the joined movie.
+        project_dir (str): The directory holding the scene files.
+        warm_tex (bool): Whether to compile the project's LaTeX expressions in parallel first.
+        narrate (bool): Whether to generate missing narration with the silent stand-in engine.
+        chunked (list): The scenes to split into chunks rendered in parallel. Each gets an equal
+            share of the jobs, so the chunks and the other scenes together stay within `jobs`.
+
+    Returns:
+        str: The path of the joined movie.
+    """
+    scenes = discover_scenes(project_dir)
+    missing = [scene for scene in order if scene not in scenes]
+    if missing:
+        raise ValueError(f"No '# manim ...' render comment found for: {', '.join(missing)}")
+    if output_path is None:
+        output_path = os.path.join(project_dir, "media", "videos", f"Norm_Video_{QUALITY_DIRS[quality]}.mp4")
+
+    jobs = jobs or os.cpu_count() or 1
+    if warm_tex:
+        from tex_warmup import warm_tex_cache
+
+        for (class_name, strings, _), error in warm_tex_cache(project_dir, jobs).items():
+            print(f"LaTeX warm-up failed for {class_name}{strings}: {error}")
+
+    # Each render runs in its own manim process; the pool just keeps the cores busy
+    movies = {}
+    workers = min(jobs, len(order))
+    # A chunked scene takes one of the pool's slots and renders its chunks in processes of its own
+    chunks = max(1, jobs // workers)
+    with ThreadPoolExecutor(max_workers=workers + narrate) as pool:
+        if narrate:
+            from narration import collect_narration, generate_narration
+
+            narration = pool.submit(generate_narration, collect_narration(project_dir))
+        futures = {}
+        for scene in order:
+            if scene in chunked:
+                futures[pool.submit(render_scene_chunked, scene, *scenes[scene], quality, chunks, project_dir)] = scene
+            else:
+                futures[pool.submit(render_scene, scene, *scenes[scene], quality, project_dir)] = scene
+        for future in as_completed(futures):
+            movies[futures[future]] = future.result()
+        if narrate:
+            for text, error in narration.result().items():
+                print(f"Narration failed for '{text}': {error}")
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    concatenate([movies[scene] for scene in order], output_path)
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render every project scene in parallel and join them.")
+    parser.add_argument("--quality", choices=sorted(QUALITY_DIRS), default="h", help="manim quality letter")
+    parser.add_argument("--jobs", type=int, default=None, help="scenes to render at once (default: CPU cores)")
+    parser.add_argument("--output", default=None, help="path of the joined movie")
+    parser.add_argument("--scenes", nargs="+", default=VIDEO_ORDER, help="scene names, in video order")
+    parser.add_argument("--no-tex-warmup", action="store_true", help="skip compiling LaTeX ahead of the renders")
+    parser.add_argument("--no-narration", action="store_true", help="skip generating missing narration")
+    parser.add_argument("--chunked", nargs="*", default=CHUNKED_SCENES,
+                        help="scenes to render as parallel chunks (pass none to render every scene whole)")
+    args = parser.parse_args()
+    print(render_all(
+        args.scenes, args.quality, args.jobs, args.output,
+        warm_tex=not args.no_tex_warmup, narrate=not args.no_narration, chunked=args.chunked,
+    ))
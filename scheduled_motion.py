@@ -0,0 +1,168 @@
+from manim import *
+import numpy as np
+
+# Gauss-Legendre nodes and weights on [0, 1], for integrating eased rate ramps
+_NODES, _WEIGHTS = np.polynomial.legendre.leggauss(16)
+_NODES = 0.5 * (_NODES + 1)
+_WEIGHTS = 0.5 * _WEIGHTS
+
+
+def _eased_integral(rate_func, u):
+    """The integral of rate_func from 0 to u, for u in [0, 1]."""
+    if u <= 0:
+        return 0.0
+    return u * float(np.dot(_WEIGHTS, [rate_func(u * node) for node in _NODES]))
+
+
+class RateSchedule:
+    """
+    A rotation rate over time, made of steps and eased ramps, with the angle
+    turned so far in closed form. Nothing depends on frame rate or on which
+    frames were rendered, so the angle at any time can be looked up directly.
+
+    Changes must be added in time order, as a scene's construct does.
+
+    Attributes:
+        initial_rate (float): The rate before the first change, in turns per second.
+    """
+
+    def __init__(self, rate=0):
+        self.initial_rate = rate
+        # (start, duration, from rate, to rate, rate function); steps have duration 0
+        self._segments = []
+
+    def set_rate(self, rate, at):
+        """
+        Jumps to a new rate.
+
+        Args:
+            rate (float): The new rate, in turns per second.
+            at (float): When to change it.
+
+        Returns:
+            RateSchedule: self, for chaining.
+        """
+        return self.ramp_rate(rate, at, duration=0)
+
+    def ramp_rate(self, rate, at, duration=1, rate_func=smooth):
+        """
+        Eases from the current rate to a new one, like animating a rate ValueTracker.
+
+        Args:
+            rate (float): The rate at the end of the ramp, in turns per second.
+            at (float): When the ramp starts.
+            duration (float): How long the ramp takes.
+            rate_func (function): The easing of the ramp.
+
+        Returns:
+            RateSchedule: self, for chaining.
+        """
+        if self._segments and at < self._segments[-1][0]:
+            raise ValueError(f"Rate changes must be added in time order, got {at} after {self._segments[-1][0]}")
+        self._segments.append((at, duration, self.rate_at(at), rate, rate_func))
+        return self
+
+    def rate_at(self, t):
+        """The rate at time t, in turns per second."""
+        rate = self.initial_rate
+        for start, duration, from_rate, to_rate, rate_func in self._segments:
+            if t < start:
+                break
+            if t < start + duration:
+                rate = from_rate + (to_rate - from_rate) * rate_func((t - start) / duration)
+            else:
+                rate = to_rate
+        return rate
+
+    def turns_at(self, t):
+        """The number of turns made between time 0 and time t."""
+        ends = [segment[0] for segment in self._segments[1:]] + [np.inf]
+        first_start = self._segments[0][0] if self._segments else np.inf
+        turns = self.initial_rate * max(0.0, min(t, first_start))
+        for (start, duration, from_rate, to_rate, rate_func), end in zip(self._segments, ends):
+            if t <= start:
+                break
+            # Each change holds until the next one: an eased ramp, then its final rate
+            span = min(t, end) - start
+            ramp = min(span, duration)
+            if ramp > 0:
+                turns += from_rate * ramp + (to_rate - from_rate) * duration * _eased_integral(rate_func, ramp / duration)
+            turns += to_rate * max(0.0, span - duration)
+        return turns
+
+    def angle_at(self, t):
+        """The angle turned between time 0 and time t, in radians."""
+        return TAU * self.turns_at(t)
+
+
+class ScheduledRotation:
+    """
+    Rotates a mobject to the angle a RateSchedule gives for the current time.
+
+    The mobject's points are stored once, and every frame sets them from that
+    reference rotated by the scheduled angle, instead of adding up small
+    rotations. The pose at any time is therefore exact and can be reached
+    directly with `seek`. The time advances by each frame's dt, which manim
+    also passes in one step when animations are skipped.
+
+        spin = ScheduledRotation(magnet, RateSchedule(rate=0.5))
+        magnet.add_updater(spin.updater)
+        self.wait(1)
+        spin.ramp_rate(1, duration=1)
+        self.play(..., run_time=1)
+
+    Attributes:
+        mobject (Mobject): The rotated mobject.
+        schedule (RateSchedule): The rotation rate over time.
+        axis (np.ndarray): The rotation axis.
+        about_point (np.ndarray): The point the mobject rotates about.
+        time (float): Seconds since the motion started.
+    """
+
+    def __init__(self, mobject, schedule, axis=OUT, about_point=None):
+        self.mobject = mobject
+        self.schedule = schedule
+        self.axis = np.asarray(axis, dtype=float)
+        self.about_point = mobject.get_center() if about_point is None else np.asarray(about_point, dtype=float)
+        self.time = 0.0
+        self._reference_points = [sub.points.copy() for sub in mobject.get_family()]
+        self._applied_angle = 0.0
+
+    @property
+    def angle(self):
+        """The current angle, in radians."""
+        return self.schedule.angle_at(self.time)
+
+    def set_rate(self, rate):
+        """Jumps to a new rate now."""
+        self.schedule.set_rate(rate, self.time)
+        return self
+
+    def ramp_rate(self, rate, duration=1, rate_func=smooth):
+        """Eases to a new rate, starting now."""
+        self.schedule.ramp_rate(rate, self.time, duration, rate_func)
+        return self
+
+    def seek(self, t):
+        """
+        Moves the mobject to its pose at time t.
+
+        Args:
+            t (float): Seconds since the motion started.
+
+        Returns:
+            ScheduledRotation: self, for chaining.
+        """
+        self.time = t
+        angle = self.angle
+        if angle == self._applied_angle:
+            return self
+        matrix = rotation_matrix(angle, self.axis)
+        for sub, reference in zip(self.mobject.get_family(), self._reference_points):
+            sub.points = self.about_point + (reference - self.about_point) @ matrix.T
+        self._applied_angle = angle
+        return self
+
+    def updater(self, mob, dt):
+        """Advances the motion by one frame; pass to `add_updater`."""
+        self.seek(self.time + dt)
@@ -0,0 +1,281 @@
+from manim import *
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import time
+from contextlib import contextmanager
+import numpy as np
+from narration import VOICEOVER_CALL, NarrationMixin, text_key
+
+# Per-mobject arrays that decide how it is drawn
+_STYLE_ATTRIBUTES = (
+    "fill_rgbas",
+    "stroke_rgbas",
+    "background_stroke_rgbas",
+    "stroke_width",
+    "background_stroke_width",
+    "rgbas",
+    "pixel_array",
+)
+
+# Scenes with a section cache are seeded with this unless given a seed, so that each run builds
+# the same mobjects; it is the seed chunked_render uses, so both kinds of render share sections
+RANDOM_SEED = 5318008
+
+
+def _update_with_mobject(hasher, mob):
+    """Feeds the geometry, style and updaters of a mobject family into a hash."""
+    for sub in mob.get_family():
+        hasher.update(type(sub).__name__.encode())
+        hasher.update(np.ascontiguousarray(sub.points, dtype=float).tobytes())
+        for attr in _STYLE_ATTRIBUTES:
+            value = getattr(sub, attr, None)
+            if value is not None:
+                hasher.update(np.ascontiguousarray(value).tobytes())
+        hasher.update(repr(sub.z_index).encode())
+        for updater in sub.get_updaters():
+            hasher.update(getattr(updater, "__qualname__", "").encode())
+
+
+def _update_with_value(hasher, value, seen=None):
+    """
+    Feeds a value captured by a section function into a hash. Helper objects, like a
+    ScheduledRotation, are hashed through their attributes, since their state decides
+    what the section plays; the scene itself and functions only by their names.
+    """
+    seen = set() if seen is None else seen
+    if isinstance(value, Mobject):
+        _update_with_mobject(hasher, value)
+    elif isinstance(value, np.ndarray):
+        hasher.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (int, float, complex, str, bool, type(None))):
+        hasher.update(repr(value).encode())
+    elif id(value) in seen:
+        hasher.update(b"seen")
+    elif isinstance(value, (list, tuple, dict)):
+        seen.add(id(value))
+        items = value.items() if isinstance(value, dict) else value
+        for item in items:
+            _update_with_value(hasher, item, seen)
+    elif hasattr(value, "__dict__") and not isinstance(value, Scene) and not callable(value):
+        seen.add(id(value))
+        hasher.update(type(value).__qualname__.encode())
+        for attr, attr_value in sorted(vars(value).items()):
+            hasher.update(attr.encode())
+            _update_with_value(hasher, attr_value, seen)
+    else:
+        hasher.update(getattr(value, "__qualname__", type(value).__qualname__).encode())
+
+
+def scene_state_hash(scene):
+    """
+    Hashes everything on screen: every mobject in the scene, its style and
+    updaters, and the camera orientation of 3D scenes.
+
+    Args:
+        scene (Scene): The scene to hash.
+
+    Returns:
+        str: A hex digest of the scene state.
+    """
+    hasher = hashlib.sha256()
+    for mob in scene.mobjects:
+        _update_with_mobject(hasher, mob)
+    camera = scene.renderer.camera
+    hasher.update(type(camera).__qualname__.encode())
+    if hasattr(camera, "get_value_trackers"):
+        for tracker in camera.get_value_trackers():
+            hasher.update(repr(tracker.get_value()).encode())
+    return hasher.hexdigest()
+
+
+@contextmanager
+def _manifest_lock(manifest_path, timeout=30):
+    """
+    Holds a lock file next to a manifest, so that concurrent renders, like the chunks of a
+    chunked render, update it one at a time. A lock older than `timeout` seconds was left by
+    a render that died, and is taken over.
+    """
+    lock_path = manifest_path + ".lock"
+    while True:
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(lock_path) > timeout:
+                    os.remove(lock_path)
+            except FileNotFoundError:
+                pass
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.remove(lock_path)
+
+
+def _load_manifest(manifest_path):
+    """Reads a section manifest: section key -> {"files", "sounds"}."""
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path) as manifest_file:
+        return json.load(manifest_file)
+
+
+def _store_manifest_entry(manifest_path, key, entry):
+    """
+    Adds one section to the manifest on disk. The manifest is re-read under the lock, so
+    entries other renders stored meanwhile are kept, and replaced atomically, so readers
+    never see half a file.
+    """
+    with _manifest_lock(manifest_path):
+        manifest = _load_manifest(manifest_path)
+        manifest[key] = entry
+        temporary_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        os.replace(temporary_path, manifest_path)
+
+
+class SectionCacheMixin:
+    """
+    Reuses rendered sections across runs when nothing they depend on changed.
+
+    A section is keyed on the scene state where it starts, the source code of
+    the function that plays it, the values that function captures, and the
+    render quality, and in narrated scenes the narration it voices. On a hit
+    the section runs with animations skipped, which only advances the scene
+    state, and its cached segments and sounds are spliced back into the movie.
+    On a miss it renders normally and its segments are copied into
+    `media/section_cache` for the next run. Renders of part of a scene, like
+    the chunks of chunked_render, bypass the cache. Sections can only match if the
+    scene builds the same mobjects every run, so the mixin seeds `random` and
+    numpy unless the scene is given a `random_seed`.
+
+    Mix it in ahead of the scene class, and play sections through `cached_section`:
+
+        class DipoleRotation(SectionCacheMixin, ThreeDScene):
+            def construct(self):
+                ...
+                def spin_up():
+                    self.play(Transform(vector_field, long_vector_field))
+                self.cached_section("spin up", spin_up)
+    """
+
+    def __init__(self, *args, random_seed=RANDOM_SEED, **kwargs):
+        super().__init__(*args, random_seed=random_seed, **kwargs)
+
+    def add_sound(self, sound_file, time_offset=0, gain=None, **kwargs):
+        # Inside a section, sounds are recorded relative to its start; a reused section's
+        # sounds come from the manifest instead
+        sounds = getattr(self, "_section_sounds", None)
+        if sounds is not None:
+            sounds.append((self.time + time_offset - self._section_start, os.path.abspath(sound_file), gain))
+            if self._section_reused:
+                return
+        super().add_sound(sound_file, time_offset, gain, **kwargs)
+
+    def section_cache_dir(self):
+        """
+        Locates the cached segments for this scene. Each render quality gets its own directory.
+
+        Returns:
+            str: The cache directory for this scene at the current quality.
+        """
+        quality = f"{config.pixel_height}p{config.frame_rate:g}"
+        return os.path.join(config.media_dir, "section_cache", type(self).__name__, quality)
+
+    def section_key(self, name, section_func):
+        """
+        Hashes everything a section's rendered frames depend on.
+
+        Args:
+            name (str): The section name.
+            section_func (function): The function that plays the section.
+
+        Returns:
+            str: A hex digest keying the section.
+        """
+        hasher = hashlib.sha256()
+        hasher.update(name.encode())
+        hasher.update(f"{config.pixel_width}x{config.pixel_height}@{config.frame_rate}".encode())
+        hasher.update(scene_state_hash(self).encode())
+        source = inspect.getsource(section_func)
+        hasher.update(source.encode())
+        if isinstance(self, NarrationMixin):
+            # Voiceovers last as long as their narration, so regenerated narration changes the section
+            narration = self.narration_manifest()
+            texts = [match.group(2) for match in VOICEOVER_CALL.finditer(source)]
+            if len(texts) < source.count("voiceover("):
+                # Some texts aren't literals, so any narration might be voiced
+                entries = [narration[key] for key in sorted(narration)]
+            else:
+                entries = [narration.get(text_key(text)) for text in texts]
+            hasher.update(json.dumps(entries, sort_keys=True).encode())
+        for cell in section_func.__closure__ or ():
+            _update_with_value(hasher, cell.cell_contents)
+        _update_with_value(hasher, section_func.__defaults__)
+        return hasher.hexdigest()
+
+    def cached_section(self, name, section_func):
+        """
+        Plays a section, reusing its rendered segments from an earlier run if possible.
+
+        Args:
+            name (str): The section name.
+            section_func (function): A function taking no arguments that plays the section.
+        """
+        # A partial render skips the plays outside its range, which would leave holes in a cached
+        # section and splice segments of other plays into its own movie
+        partial_render = config.from_animation_number > 0 or config.upto_animation_number >= 0
+        if not config.write_to_movie or config.dry_run or partial_render:
+            section_func()
+            return
+        file_writer = self.renderer.file_writer
+
+        cache_dir = self.section_cache_dir()
+        manifest_path = os.path.join(cache_dir, "manifest.json")
+        key = self.section_key(name, section_func)
+        entry = _load_manifest(manifest_path).get(key)
+        reused = (
+            isinstance(entry, dict)
+            and all(path is not None and os.path.exists(path) for path in entry["files"])
+            and all(os.path.exists(path) for _, path, _ in entry["sounds"])
+        )
+
+        # The flat list of partial movie files has one entry per play, so a section's
+        # segments go back at the indices of the plays that made them
+        start = len(file_writer.partial_movie_files)
+        self._section_start = self.time
+        self._section_sounds = []
+        self._section_reused = reused
+        try:
+            self.next_section(name, skip_animations=reused)
+            section_func()
+        finally:
+            sounds, self._section_sounds = self._section_sounds, None
+
+        if reused:
+            logger.info(f"Section '{name}' unchanged, reusing its cached segments")
+            section_files = file_writer.sections[-1].partial_movie_files
+            for i, path in enumerate(entry["files"]):
+                file_writer.partial_movie_files[start + i] = path
+                section_files[i] = path
+            for offset, path, gain in entry["sounds"]:
+                file_writer.add_sound(path, self._section_start + offset, gain)
+        else:
+            rendered = file_writer.partial_movie_files[start:]
+            # Plays skipped for any other reason leave no segment, and the section can't be reused
+            if rendered and None not in rendered:
+                os.makedirs(cache_dir, exist_ok=True)
+                cached_files = []
+                for i, path in enumerate(rendered):
+                    cached_path = os.path.join(cache_dir, f"{key}_{i:03d}{os.path.splitext(path)[1]}")
+                    shutil.copy2(path, cached_path)
+                    cached_files.append(cached_path)
+                _store_manifest_entry(manifest_path, key, {"files": cached_files, "sounds": sounds})
+
+        # Whatever follows the section renders normally
+        self.next_section()
@@ -0,0 +1,227 @@
+import numpy as np
+
+def _half_stencil(dim):
+    """
+    Lists the cell offsets that visit each pair of neighboring cells once: the
+    zero offset followed by every offset whose first nonzero component is positive.
+
+    Args:
+        dim (int): The number of spatial dimensions.
+
+    Returns:
+        np.ndarray: A (K, dim) integer array of offsets, zero offset first.
+    """
+    offsets = np.stack(np.meshgrid(*[[-1, 0, 1]] * dim, indexing="ij"), axis=-1).reshape(-1, dim)
+    # In lexicographic order the zero offset sits exactly in the middle
+    return offsets[len(offsets) // 2:]
+
+
+# Cell offsets for the 2D and 3D neighbor stencils
+_STENCILS = {dim: _half_stencil(dim) for dim in (2, 3)}
+
+
+def _cell_keys(cells):
+    """
+    Views each row of integer cell coordinates as one opaque key, so cells can be sorted and
+    looked up however far apart they are, without flattening them into a dense grid.
+
+    Args:
+        cells (np.ndarray): An (N, dim) int64 array of cell coordinates.
+
+    Returns:
+        np.ndarray: An (N,) array of keys, equal exactly when the cells are.
+    """
+    cells = np.ascontiguousarray(cells, dtype=np.int64)
+    return cells.view(np.dtype((np.void, cells.dtype.itemsize * cells.shape[1]))).ravel()
+
+
+def _neighbor_ranks(cells):
+    """
+    Numbers the cell coordinates along each axis that the points' cells and their neighbors
+    use, so the occupied cells and their whole stencils fit in a compact mixed-radix key
+    however far apart the points are.
+
+    Args:
+        cells (np.ndarray): An (N, dim) int64 array of cell coordinates.
+
+    Returns:
+        tuple: An (N, dim, 3) array, the ranks of each coordinate minus 1, itself and plus 1
+            along each axis, and the (dim,) strides turning ranks into keys, or None if the
+            keys could overflow int64.
+    """
+    shifted = cells[:, :, None] + np.arange(-1, 2)
+    ranks = np.empty(shifted.shape, dtype=np.int64)
+    sizes = []
+    for axis in range(cells.shape[1]):
+        values, inverse = np.unique(shifted[:, axis], return_inverse=True)
+        ranks[:, axis] = inverse.reshape(-1, 3)
+        sizes.append(len(values))
+    if np.prod(np.array(sizes, dtype=float)) >= 2.0**62:
+        return ranks, None
+    strides = np.cumprod([1] + sizes[:0:-1])[::-1].astype(np.int64)
+    return ranks, strides
+
+
+class GridIndex:
+    """
+    A uniform grid hash over a fixed set of 2D or 3D points.
+    Points are bucketed into cubic cells of side `cell_size` and sorted by cell,
+    so every neighbor query is a handful of vectorized `searchsorted` calls
+    instead of a Python loop over point pairs. Cells are keyed by integers: the
+    key of a neighboring cell is a sum of per-axis ranks, and looking it up is a
+    `searchsorted` over int64 keys.
+
+    Attributes:
+        points (np.ndarray): The (N, dim) array of indexed points.
+        cell_size (float): The side length of a grid cell, and the largest radius
+            that can be queried.
+    """
+
+    def __init__(self, points, cell_size):
+        points = np.asarray(points, dtype=float)
+        if points.ndim != 2 or points.shape[1] not in _STENCILS:
+            raise ValueError("points must be an (N, 2) or (N, 3) array")
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+
+        self.points = points
+        self.cell_size = float(cell_size)
+
+        # Only occupied cells are keyed, so sparse points spread far apart compared with
+        # the cell size need no more memory than dense ones
+        if len(points):
+            origin = points.min(axis=0)
+        else:
+            origin = np.zeros(points.shape[1])
+        self._cells = np.floor((points - origin) / self.cell_size).astype(np.int64)
+        self._ranks, self._strides = _neighbor_ranks(self._cells)
+        self._cell_keys, cell_ids = np.unique(self._neighbor_keys(np.arange(len(points)), 0), return_inverse=True)
+        cell_ids = cell_ids.ravel()
+        self._order = np.argsort(cell_ids, kind="stable")
+        self._cell_counts = np.bincount(cell_ids, minlength=len(self._cell_keys))
+        self._cell_starts = np.cumsum(self._cell_counts) - self._cell_counts
+
+    def _neighbor_keys(self, query, offset):
+        """The keys of the cells at an offset from the query points' cells."""
+        if self._strides is None:
+            # Too many distinct coordinates for integer keys
+            return _cell_keys(self._cells[query] + offset)
+        offset = np.broadcast_to(offset, (self.points.shape[1],))
+        keys = np.zeros(len(query), dtype=np.int64)
+        for axis, (shift, stride) in enumerate(zip(offset, self._strides)):
+            keys += self._ranks[query, axis, shift + 1] * stride
+        return keys
+
+    def __len__(self):
+        return len(self.points)
+
+    def query_pairs(self, radius, chunk_size=65536):
+        """
+        Finds every pair of points closer together than `radius`.
+
+        Args:
+            radius (float): The neighbor distance threshold, at most `cell_size`.
+            chunk_size (int): How many query points to expand at once, bounding memory.
+
+        Returns:
+            np.ndarray: An (M, 2) integer array of index pairs (i, j) with i < j.
+        """
+        if radius > self.cell_size:
+            raise ValueError("radius cannot exceed the grid cell_size")
+
+        pairs = [np.empty((0, 2), dtype=np.int64)]
+        for start in range(0, len(self.points), chunk_size):
+            # In cell order the neighbor keys of every offset come sorted, which keeps the
+            # `searchsorted` lookups local
+            query = self._order[start : start + chunk_size]
+            i, j = self._candidates(query)
+            dist_sq = np.sum((self.points[i] - self.points[j]) ** 2, axis=1)
+            close = dist_sq < radius**2
+            i, j = i[close], j[close]
+            pairs.append(np.column_stack((np.minimum(i, j), np.maximum(i, j))))
+        return np.concatenate(pairs)
+
+    def has_neighbor(self, radius):
+        """
+        Flags the points that have at least one other point closer than `radius`.
+
+        Args:
+            radius (float): The neighbor distance threshold, at most `cell_size`.
+
+        Returns:
+            np.ndarray: A boolean mask of length N.
+        """
+        mask = np.zeros(len(self.points), dtype=bool)
+        pairs = self.query_pairs(radius)
+        mask[pairs[:, 0]] = True
+        mask[pairs[:, 1]] = True
+        return mask
+
+    def _candidates(self, query):
+        """
+        Lists the candidate pairs between each query point and the points in its
+        half stencil of cells. Every unordered pair of distinct points is listed at
+        most once, in no particular (i, j) order.
+
+        Args:
+            query (np.ndarray): Indices of the query points.
+
+        Returns:
+            tuple: Two equal-length index arrays (i, j).
+        """
+        i_parts, j_parts = [], []
+        for offset in _STENCILS[self.points.shape[1]]:
+            neighbor_keys = self._neighbor_keys(query, offset)
+            cell = np.searchsorted(self._cell_keys, neighbor_keys)
+            cell = np.minimum(cell, len(self._cell_keys) - 1)
+            occupied = self._cell_keys[cell] == neighbor_keys
+            lo = self._cell_starts[cell]
+            counts = np.where(occupied, self._cell_counts[cell], 0)
+            total = counts.sum()
+            if total == 0:
+                continue
+
+            # Expand each [lo, hi) range into the sorted positions it covers
+            run_starts = np.cumsum(counts) - counts
+            positions = np.arange(total) - np.repeat(run_starts - lo, counts)
+            i = np.repeat(query, counts)
+            j = self._order[positions]
+            if not offset.any():
+                # Pairs within the same cell would otherwise be listed twice
+                keep = i < j
+                i, j = i[keep], j[keep]
+            i_parts.append(i)
+            j_parts.append(j)
+
+        if not i_parts:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        return np.concatenate(i_parts), np.concatenate(j_parts)
+
+
+def neighbor_pairs(points, radius):
+    """
+    Finds every pair of points closer together than `radius`.
+
+    Args:
+        points (array-like): An (N, 2) or (N, 3) array of positions.
+        radius (float): The neighbor distance threshold.
+
+    Returns:
+        np.ndarray: An (M, 2) integer array of index pairs (i, j) with i < j.
+    """
+    return GridIndex(points, cell_size=radius).query_pairs(radius)
+
+
+def has_neighbor(points, radius):
+    """
+    Flags the points that have at least one other point closer than `radius`.
+
+    Args:
+        points (array-like): An (N, 2) or (N, 3) array of positions.
+        radius (float): The neighbor distance threshold.
+
+    Returns:
+        np.ndarray: A boolean mask of length N.
+    """
+    return GridIndex(points, cell_size=radius).has_neighbor(radius)
@@ -0,0 +1,244 @@
+from manim import *
+import numpy as np
+
+
+def random_spins(n_spins, length=1, rng=None):
+    """
+    Spin vectors pointing in uniformly random directions.
+
+    Args:
+        n_spins (int): The number of spins.
+        length (float): The length of every spin vector.
+        rng (np.random.Generator): The random generator, by default one seeded from numpy's
+            global random state, so scenes with a random_seed draw the same spins every render.
+
+    Returns:
+        np.ndarray: An (n_spins, 3) array.
+    """
+    rng = np.random.default_rng(np.random.randint(2**31)) if rng is None else rng
+    directions = rng.normal(size=(n_spins, 3))
+    return length * directions / np.linalg.norm(directions, axis=1, keepdims=True)
+
+
+def rotate_spins(spins, angles, axis=OUT):
+    """
+    Rotates spin vectors about an axis through the origin (Rodrigues' formula).
+
+    Args:
+        spins (np.ndarray): The (N, 3) spin vectors.
+        angles (float or np.ndarray): One angle for every spin, or an (N,) array of angles,
+            e.g. precession rates times time for dephasing.
+        axis (np.ndarray): The rotation axis.
+
+    Returns:
+        np.ndarray: The rotated (N, 3) spin vectors.
+    """
+    axis = np.asarray(axis, dtype=float) / np.linalg.norm(axis)
+    angles = np.asarray(angles, dtype=float)[..., None]
+    cos, sin = np.cos(angles), np.sin(angles)
+    along_axis = (spins @ axis)[:, None] * axis
+    return spins * cos + np.cross(axis, spins) * sin + along_axis * (1 - cos)
+
+
+def squeeze_spins(spins, squeeze_factor, stretch_factor, squeeze_axis=OUT, stretch_axis=UP):
+    """
+    Squeezes spin vectors: their components along one axis shrink while those along another grow.
+
+    Args:
+        spins (np.ndarray): The (N, 3) spin vectors.
+        squeeze_factor (float): The factor for components along `squeeze_axis`.
+        stretch_factor (float): The factor for components along `stretch_axis`.
+        squeeze_axis (np.ndarray): The squeezed direction.
+        stretch_axis (np.ndarray): The stretched direction, perpendicular to `squeeze_axis`.
+
+    Returns:
+        np.ndarray: The squeezed (N, 3) spin vectors.
+    """
+    squeeze_axis = np.asarray(squeeze_axis, dtype=float) / np.linalg.norm(squeeze_axis)
+    stretch_axis = np.asarray(stretch_axis, dtype=float) / np.linalg.norm(stretch_axis)
+    transform = (
+        np.eye(3)
+        + (squeeze_factor - 1) * np.outer(squeeze_axis, squeeze_axis)
+        + (stretch_factor - 1) * np.outer(stretch_axis, stretch_axis)
+    )
+    return spins @ transform.T
+
+
+def camera_direction(camera):
+    """
+    The unit vector from the origin towards a 3D camera.
+
+    Args:
+        camera (ThreeDCamera): The camera.
+
+    Returns:
+        np.ndarray: The direction the camera looks from.
+    """
+    phi, theta = camera.get_phi(), camera.get_theta()
+    return np.array([np.sin(phi) * np.cos(theta), np.sin(phi) * np.sin(theta), np.cos(phi)])
+
+
+def arrow_points(starts, vectors, tip_lengths, tip_widths, view_direction, shaft_out=None, tip_out=None):
+    """
+    The Bezier points of many straight arrows at once: a shaft up to the tip's base,
+    and a flat triangular tip in the plane of the arrow and the view direction's
+    perpendicular. Tips are wound the same way as seen from `view_direction`.
+
+    Args:
+        starts (np.ndarray): The (N, 3) or (3,) arrow starts.
+        vectors (np.ndarray): The (N, 3) arrow vectors, from start to tip point.
+        tip_lengths (float or np.ndarray): The tip lengths, a scalar or (N, 1).
+        tip_widths (float or np.ndarray): The widths of the tips' bases, a scalar or (N, 1).
+        view_direction (np.ndarray): The direction the tips are turned towards.
+        shaft_out (np.ndarray): Optional (N, 4, 3) buffer to write the shafts into.
+        tip_out (np.ndarray): Optional (N, 3, 4, 3) buffer to write the tips into.
+
+    Returns:
+        tuple: The (N, 4, 3) shaft points and (N, 3, 4, 3) tip points, one straight cubic per side.
+    """
+    starts = np.broadcast_to(starts, vectors.shape)
+    lengths = np.linalg.norm(vectors, axis=1, keepdims=True)
+    directions = np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0)
+    ends = starts + vectors
+    bases = ends - directions * tip_lengths
+
+    # Straight shafts as cubic Beziers with handles at the thirds
+    alphas = np.linspace(0, 1, 4)[None, :, None]
+    shaft_points = np.empty((len(vectors), 4, 3)) if shaft_out is None else shaft_out
+    shaft_points[:] = starts[:, None, :] + alphas * (bases - starts)[:, None, :]
+
+    # Tip triangles across the arrow, perpendicular to the view direction
+    widths = np.cross(directions, view_direction)
+    parallel = np.linalg.norm(widths, axis=1) < 1e-6
+    widths[parallel] = np.cross(directions[parallel], RIGHT)
+    widths[parallel & (np.linalg.norm(widths, axis=1) < 1e-6)] = UP
+    widths *= 0.5 * tip_widths / np.linalg.norm(widths, axis=1, keepdims=True)
+    corners = np.stack([bases + widths, ends, bases - widths], axis=1)
+    tip_points = np.empty((len(vectors), 3, 4, 3)) if tip_out is None else tip_out
+    tip_points[:] = corners[:, :, None, :] + alphas[:, None] * (np.roll(corners, -1, axis=1) - corners)[:, :, None, :]
+    return shaft_points, tip_points
+
+
+class SpinEnsemble(VGroup):
+    """
+    Many spin vectors drawn as arrows from a common origin, stored as one (N, 3) array.
+
+    All shafts are subpaths of one stroked VMobject and all tips are subpaths of one
+    filled VMobject, so changing the spins rewrites two point arrays in a few array
+    operations, however many spins there are. Tips are flat triangles turned towards
+    `view_direction`, which keeps them visible and consistently wound so overlapping
+    tips don't cancel each other's fill.
+
+    Move the ensemble with shift/move_to; turn the spins with `precess`, `dephase`
+    and `squeeze`, or animate them with `EvolveSpins`.
+
+    Attributes:
+        spins (np.ndarray): The (N, 3) spin vectors, relative to the origin.
+        tip_length (float): The tip length, shortened for spins less than twice as long.
+        tip_width (float): The width of the tip's base.
+        view_direction (np.ndarray): The direction the tips face, e.g. towards the camera.
+        shafts (VMobject): The shafts of every arrow.
+        tips (VMobject): The tips of every arrow.
+    """
+
+    def __init__(
+        self,
+        spins,
+        origin=ORIGIN,
+        color=BLUE,
+        stroke_width=3,
+        tip_length=0.2,
+        tip_width=0.12,
+        view_direction=OUT,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.tip_length = tip_length
+        self.tip_width = tip_width
+        self.view_direction = np.asarray(view_direction, dtype=float)
+        self._origin = np.asarray(origin, dtype=float)
+        self.shafts = VMobject(stroke_color=color, stroke_width=stroke_width)
+        self.tips = VMobject(fill_color=color, fill_opacity=1, stroke_width=0)
+        self.add(self.shafts, self.tips)
+        self.set_spins(spins)
+
+    def get_origin(self):
+        """The common start of every arrow, wherever the ensemble has been moved."""
+        if len(self.shafts.points):
+            return self.shafts.points[0].copy()
+        return self._origin
+
+    def get_spins(self):
+        return self.spins.copy()
+
+    def set_spins(self, spins):
+        """
+        Replaces the spin vectors and regenerates every arrow.
+
+        Args:
+            spins (np.ndarray): The (N, 3) spin vectors.
+
+        Returns:
+            SpinEnsemble: self, for chaining.
+        """
+        self._origin = self.get_origin()
+        self.spins = np.array(spins, dtype=float).reshape(-1, 3)
+        self._update_arrows()
+        return self
+
+    def face_camera(self, camera):
+        """
+        Turns the tips towards a 3D camera.
+
+        Args:
+            camera (ThreeDCamera): The camera the ensemble is seen through.
+
+        Returns:
+            SpinEnsemble: self, for chaining.
+        """
+        self.view_direction = camera_direction(camera)
+        return self.set_spins(self.spins)
+
+    def precess(self, angle, axis=OUT):
+        """Rotates every spin by the same angle about an axis."""
+        return self.set_spins(rotate_spins(self.spins, angle, axis))
+
+    def dephase(self, angles, axis=OUT):
+        """Rotates each spin by its own angle about an axis, e.g. precession rates times time."""
+        return self.set_spins(rotate_spins(self.spins, angles, axis))
+
+    def squeeze(self, squeeze_factor, stretch_factor, squeeze_axis=OUT, stretch_axis=UP):
+        """Scales the spins' components along one axis down and along another up."""
+        return self.set_spins(squeeze_spins(self.spins, squeeze_factor, stretch_factor, squeeze_axis, stretch_axis))
+
+    def _update_arrows(self):
+        """Writes the shaft and tip points of every arrow from the spin array."""
+        lengths = np.linalg.norm(self.spins, axis=1, keepdims=True)
+        shaft_points, tip_points = arrow_points(
+            self._origin, self.spins, np.minimum(self.tip_length, 0.5 * lengths), self.tip_width, self.view_direction
+        )
+        self.shafts.points = shaft_points.reshape(-1, 3)
+        self.tips.points = tip_points.reshape(-1, 3)
+
+
+class EvolveSpins(Animation):
+    """
+    Animates a SpinEnsemble through a function of its starting spins, so rotations
+    stay rotations instead of interpolating arrow points in a straight line.
+
+        EvolveSpins(ensemble, lambda spins, alpha: squeeze_spins(spins, 1 - 0.8 * alpha, 1 + 0.5 * alpha))
+
+    Attributes:
+        evolve (function): Maps the (N, 3) starting spins and alpha to the spins at alpha.
+    """
+
+    def __init__(self, ensemble, evolve, **kwargs):
+        self.evolve = evolve
+        super().__init__(ensemble, **kwargs)
+
+    def begin(self):
+        self.start_spins = self.mobject.get_spins()
+        super().begin()
+
+    def interpolate_mobject(self, alpha):
+        self.mobject.set_spins(self.evolve(self.start_spins, self.rate_func(alpha)))
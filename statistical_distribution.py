@@ -2,6 +2,8 @@ from manim import *
 import numpy as np
 import random
 import matplotlib as plt
+from particle_drop import * # particle_drop.py
+from curve_reveal import * # curve_reveal.py
 config.media_embed = True
 
 # manim -pqh statistical_distribution.py StatisticalDistribution
@@ -20,13 +22,6 @@ class StatisticalDistribution(Scene):
         run_time_per_drop = 0.02
 
         
-        n_bins = int((x_max - x_min) / bin_width)
-        bin_counts = [0] * n_bins
-
-        
-        all_dots = []
-
-        
         x_axis_line = Line(
             start=[x_min - 0.5, 0, 0],
             end=[x_max + 0.5, 0, 0]
@@ -42,33 +37,22 @@ class StatisticalDistribution(Scene):
 
         np.random.seed(5318008) # Seeding random function for consistency
 
-        for i in range(n_particles):
-        
-            x_rand = random.gauss(mu, sigma)
-            x_rand = max(x_min, min(x_max, x_rand))
-
-            bin_index = int((x_rand - x_min) // bin_width)
-            bin_index = max(0, min(n_bins - 1, bin_index))
-
-            x_final = x_min + (bin_index + 0.5) * bin_width
-            y_final = bin_counts[bin_index] * particle_spacing
-
-            initial_pos = np.array([x_rand, drop_height, 0]) + SHIFT_VECTOR
-            final_pos   = np.array([x_final, y_final, 0]) + SHIFT_VECTOR
-
-            dot = Dot(point=initial_pos, radius=particle_radius)
-            dot.set_fill(WHITE, opacity=0)
-            dot.set_stroke(width=0)
-
-            self.add(dot)
-            all_dots.append(dot)
-
-            self.play(
-                dot.animate.move_to(final_pos).set_opacity(1), # Dropping balls and fading them in as they fall
-                run_time=run_time_per_drop
-            )
-
-            bin_counts[bin_index] += 1
+        # Drop every particle in one batched animation, each starting run_time_per_drop after the last
+        x_rand = np.clip(np.random.normal(mu, sigma, n_particles), x_min, x_max)
+        final_pos, bin_counts = stack_in_bins(x_rand, x_min, x_max, bin_width, particle_spacing)
+        final_pos += SHIFT_VECTOR
+        initial_pos = np.column_stack((x_rand, np.full(n_particles, drop_height), np.zeros(n_particles))) + SHIFT_VECTOR
+
+        particle_drop = ParticleDrop(
+            initial_pos,
+            final_pos,
+            start_offsets=np.arange(n_particles) * run_time_per_drop,
+            drop_time=run_time_per_drop,
+            particle_radius=particle_radius,
+            color=WHITE,
+        )
+        self.play(particle_drop)
+        all_dots = particle_drop.mobject
 
 
         max_count = max(bin_counts)
@@ -102,25 +86,15 @@ class StatisticalDistribution(Scene):
             y_axis_config={"include_ticks": False, "include_numbers": False, "stroke_opacity": 0}
         ).move_to([0,-SHIFT_AMOUNT,0])
         self.add(axes)
-        xmax = ValueTracker(-2.9999)
-        plot = always_redraw(lambda:
-            axes.plot(
-                normal_pdf,
-                x_range=[-3, xmax.get_value()]
-            )
-        )
-        area = always_redraw(lambda:
-            axes.get_area(
-                axes.plot(normal_pdf),
-                x_range=[-3, xmax.get_value()]
-            )
-        )
-        self.add(plot,area)
+        # The PDF is sampled once; sweeping the reveal only slices its precomputed points
+        normal_reveal = CurveReveal(axes, normal_pdf, x_range=(-3, 3))
+        plot, area = normal_reveal.curve, normal_reveal.area
+        self.add(normal_reveal)
         self.wait()
-        self.play(xmax.animate.set_value(3), run_time=3)
+        self.play(normal_reveal.fraction_tracker.animate.set_value(1), run_time=3)
         self.wait()
         
-        self.play(FadeOut(VGroup(*all_dots)), run_time=2)
+        self.play(FadeOut(all_dots), run_time=2)
         
         sd_line = Line(
             start=[0, 0, 0],
@@ -169,7 +143,7 @@ class StatisticalDistribution(Scene):
         self.play(Transform(propto, sd), FadeIn(N_samples))
         
         
-        [obj.clear_updaters() for obj in solid_curve]
+        normal_reveal.clear_updaters()
         self.play(solid_curve.animate.scale(.5, about_edge=DOWN),sd_bar.animate.shift(1.1 * DOWN).scale([.5, 1, 1], about_edge=LEFT), propto.animate.shift(1.1 * DOWN + 0.25 * LEFT))
         self.wait(0.5)
         self.play(solid_curve.animate.scale([1, 4, 1], about_edge=DOWN), sd_bar.animate.shift(3.5 * UP), propto.animate.shift(3.5 * UP), Transform(N_samples, more_samples), run_time=1)
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import DARK_BLUE, YELLOW, color_to_rgb
+from collective_spin import HusimiSphere, coherent_spin_state
+
+
+def test_faces_are_colored_by_husimi_q():
+    theta, phi = 1.0, 0.8
+    sphere = HusimiSphere(coherent_spin_state(50, theta, phi), radius=2, resolution=(24, 48), opacity_range=(0.1, 0.9))
+    assert sphere.opacity_range == (0.1, 0.9)
+
+    rgbas = np.array([face.fill_rgbas[0] for face in sphere.submobjects])
+    assert rgbas.shape == (24 * 48, 4)
+    assert np.all((rgbas[:, 3] >= 0.1) & (rgbas[:, 3] <= 0.9))
+
+    # The most opaque face faces the state, in the upper colors; the far side is the base color
+    state = np.array([np.sin(theta) * np.cos(phi), np.sin(theta) * np.sin(phi), np.cos(theta)])
+    brightest = sphere.submobjects[rgbas[:, 3].argmax()]
+    assert np.dot(brightest.get_center() / np.linalg.norm(brightest.get_center()), state) > 0.99
+    peak_rgb = rgbas[rgbas[:, 3].argmax(), :3]
+    assert rgbas[:, 3].max() > 0.7
+    assert np.linalg.norm(peak_rgb - color_to_rgb(YELLOW)) < np.linalg.norm(peak_rgb - color_to_rgb(DARK_BLUE))
+    opposite = sphere.submobjects[np.argmin([np.dot(face.get_center(), state) for face in sphere.submobjects])]
+    assert np.allclose(opposite.fill_rgbas[0], [*color_to_rgb(DARK_BLUE), 0.1])
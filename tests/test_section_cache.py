@@ -0,0 +1,78 @@
+import os
+import wave
+import pytest
+
+manim = pytest.importorskip("manim")
+av = pytest.importorskip("av")
+
+from manim import FadeOut, Create, Scene, Square, tempconfig
+from section_cache import SectionCacheMixin
+
+
+class TwoSections(SectionCacheMixin, Scene):
+    sound_file = None
+
+    def construct(self):
+        square = Square()
+
+        def grow():
+            self.play(Create(square))
+            if self.sound_file:
+                self.add_sound(self.sound_file, time_offset=0.25)
+            self.wait(0.5)
+        self.cached_section("grow", grow)
+        self.play(FadeOut(square))
+
+
+def frame_count(path):
+    with av.open(str(path)) as container:
+        return sum(1 for _ in container.decode(video=0))
+
+
+def render(tmp_path, **settings):
+    settings = {
+        "media_dir": str(tmp_path),
+        "quality": "low_quality",
+        "disable_caching": True,
+        "write_to_movie": True,
+        "preview": False,
+        **settings,
+    }
+    with tempconfig(settings):
+        scene = TwoSections()
+        scene.render()
+        return scene.renderer.file_writer, scene.section_cache_dir()
+
+
+def test_second_render_reuses_cached_sections(tmp_path):
+    first, cache_dir = render(tmp_path)
+    first_frames = frame_count(first.movie_file_path)
+
+    second, _ = render(tmp_path)
+    files = second.partial_movie_files
+    # One entry per play: the section's play and wait come from the cache, the fade is new
+    assert len(files) == 3
+    assert all(os.path.dirname(path) == cache_dir for path in files[:2])
+    assert os.path.dirname(files[2]) != cache_dir
+    assert second.sections[-2].partial_movie_files == files[:2]
+    assert frame_count(second.movie_file_path) == first_frames
+
+
+def test_reused_section_keeps_its_sounds(tmp_path, monkeypatch):
+    sound_file = tmp_path / "click.wav"
+    with wave.open(str(sound_file), "wb") as audio:
+        audio.setnchannels(1)
+        audio.setsampwidth(2)
+        audio.setframerate(8000)
+        audio.writeframes(b"\x10\x00" * 800)
+    monkeypatch.setattr(TwoSections, "sound_file", str(sound_file))
+
+    first, _ = render(tmp_path)
+    second, _ = render(tmp_path)
+    assert second.includes_sound
+    assert len(second.audio_segment) == len(first.audio_segment)
+
+
+def test_partial_render_bypasses_the_cache(tmp_path):
+    _, cache_dir = render(tmp_path, upto_animation_number=0)
+    assert not os.path.exists(os.path.join(cache_dir, "manifest.json"))
@@ -0,0 +1,138 @@
+import argparse
+import ast
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from render_all import PROJECT_DIR
+
+# Compiles every Tex/MathTex expression in the project into media/Tex before rendering
+# python tex_warmup.py --jobs 8
+
+TEX_CLASSES = {"Tex", "MathTex", "SingleStringMathTex"}
+
+# Skipped when collecting, since they only style the result, not the compiled LaTeX
+STYLE_KEYWORDS = {"color", "font_size", "stroke_width", "fill_opacity", "should_center", "height"}
+
+
+def _literal_keyword(node):
+    """
+    Reads a keyword argument that can be evaluated without running the file.
+
+    Returns:
+        tuple: ("literal", value) or ("template", TexTemplateLibrary attribute name), or None.
+    """
+    if (
+        isinstance(node, ast.Attribute)
+        and isinstance(node.value, ast.Name)
+        and node.value.id == "TexTemplateLibrary"
+    ):
+        return ("template", node.attr)
+    try:
+        return ("literal", ast.literal_eval(node))
+    except (ValueError, TypeError):
+        return None
+
+
+def collect_tex_expressions(project_dir=PROJECT_DIR):
+    """
+    Statically collects the Tex-like calls in the project's files whose strings are constants.
+
+    Args:
+        project_dir (str): The directory holding the scene files.
+
+    Returns:
+        tuple: A list of unique (class name, strings, keyword items) to compile, and a list of
+            "file:line" locations of calls with computed strings, which are left to the render.
+    """
+    expressions = []
+    dynamic = []
+    for file_name in sorted(os.listdir(project_dir)):
+        if not file_name.endswith(".py"):
+            continue
+        with open(os.path.join(project_dir, file_name)) as source:
+            tree = ast.parse(source.read(), filename=file_name)
+        for node in ast.walk(tree):
+            if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in TEX_CLASSES):
+                continue
+            try:
+                strings = tuple(ast.literal_eval(arg) for arg in node.args)
+            except (ValueError, TypeError):
+                dynamic.append(f"{file_name}:{node.lineno}")
+                continue
+            keywords = []
+            for keyword in node.keywords:
+                if keyword.arg is None or keyword.arg in STYLE_KEYWORDS:
+                    continue
+                value = _literal_keyword(keyword.value)
+                if value is None:
+                    dynamic.append(f"{file_name}:{node.lineno}")
+                    break
+                keywords.append((keyword.arg, value))
+            else:
+                expression = (node.func.id, strings, tuple(keywords))
+                if expression not in expressions:
+                    expressions.append(expression)
+    return expressions, dynamic
+
+
+def _compile_expression(expression, media_dir):
+    """
+    Builds one Tex-like mobject, which compiles its LaTeX into the cache unless the SVG is already there.
+    Runs in a worker process; LaTeX cleanup is left to the parent so workers don't delete each other's files.
+    """
+    import manim
+
+    manim.config.media_dir = media_dir
+    manim.config.no_latex_cleanup = True
+    class_name, strings, keywords = expression
+    kwargs = {}
+    for name, (kind, value) in keywords:
+        kwargs[name] = getattr(manim.TexTemplateLibrary, value) if kind == "template" else value
+    getattr(manim, class_name)(*strings, **kwargs)
+
+
+def warm_tex_cache(project_dir=PROJECT_DIR, jobs=None):
+    """
+    Compiles every constant Tex expression of the project in parallel, one LaTeX run per core.
+
+    Args:
+        project_dir (str): The directory holding the scene files.
+        jobs (int): How many expressions to compile at once, by default one per CPU core.
+
+    Returns:
+        dict: Expression -> error message, for the expressions that failed to compile.
+    """
+    from manim import config
+    from manim.utils.tex_file_writing import delete_nonsvg_files
+
+    expressions, dynamic = collect_tex_expressions(project_dir)
+    if dynamic:
+        print(f"Skipping {len(dynamic)} Tex calls with computed strings: {', '.join(dynamic)}")
+
+    media_dir = os.path.join(project_dir, "media")
+    failures = {}
+    jobs = jobs or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=max(1, min(jobs, len(expressions)))) as pool:
+        futures = {pool.submit(_compile_expression, expression, media_dir): expression for expression in expressions}
+        for future in as_completed(futures):
+            if future.exception() is not None:
+                failures[futures[future]] = f"{type(future.exception()).__name__}: {future.exception()}"
+
+    if not config.no_latex_cleanup:
+        config.media_dir = media_dir
+        delete_nonsvg_files()
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile the project's LaTeX expressions in parallel.")
+    parser.add_argument("--jobs", type=int, default=None, help="expressions to compile at once (default: CPU cores)")
+    parser.add_argument("--list", action="store_true", help="only list the expressions that would be compiled")
+    args = parser.parse_args()
+
+    if args.list:
+        for class_name, strings, keywords in collect_tex_expressions()[0]:
+            print(class_name, *strings, *(f"{name}={value}" for name, (_, value) in keywords))
+    else:
+        failures = warm_tex_cache(jobs=args.jobs)
+        for (class_name, strings, _), error in failures.items():
+            print(f"FAILED {class_name}{strings}: {error}")
@@ -1,5 +1,6 @@
 from manim import *
 import numpy as np
+from level_of_detail import lod_samples
 
 class WaveFunc3d(VGroup):
     """
@@ -20,6 +21,8 @@ class WaveFunc3d(VGroup):
         arrow_color (Color): The color of the arrow.
         arrow_show (bool): Whether to show an arrow at the spiral's end/start.
         arrow_endpoint (str): Determines if the arrow points to the "start" or "end" of the spiral.
+        n_samples (int): The number of samples along the spiral. By default one per 0.01 of t,
+            ParametricFunction's default step, scaled to the render quality.
     """
 
     def __init__(
@@ -37,6 +40,7 @@ class WaveFunc3d(VGroup):
         arrow_color=YELLOW,
         arrow_show=True,
         arrow_endpoint="end",  
+        n_samples=None,
         **kwargs
     ):
         super().__init__(**kwargs)
@@ -55,6 +59,8 @@ class WaveFunc3d(VGroup):
         self.arrow_color = arrow_color
         self.arrow_show = arrow_show
         self.arrow_endpoint = arrow_endpoint
+        t_min, t_max = self.param_range
+        self.n_samples = lod_samples(int(round((t_max - t_min) / 0.01))) if n_samples is None else n_samples
 
         # Create the spiral function
         self._spiral_func = self._make_spiral_func()
@@ -72,10 +78,9 @@ class WaveFunc3d(VGroup):
             self.add(self.axes)
 
         # Add the spiral
-        t_min, t_max = self.param_range
         self.spiral = ParametricFunction(
             self._spiral_func,
-            t_range=(t_min, t_max),
+            t_range=self._t_range(),
             color=self.spiral_color
         ).set_z_index(1)  # Ensure spiral appears behind other elements like arrows
         self.add(self.spiral)
@@ -103,6 +108,11 @@ class WaveFunc3d(VGroup):
         self.rotate(z_angle_deg * DEGREES, axis=OUT, about_point=ORIGIN)
         self.shift(self.position)
 
+    def _t_range(self):
+        """The spiral's t_range, with a step giving `n_samples` samples."""
+        t_min, t_max = self.param_range
+        return (t_min, t_max, (t_max - t_min) / self.n_samples)
+
     def _make_spiral_func(self):
         """
         Creates the mathematical function representing the spiral.
@@ -135,30 +145,32 @@ class WaveFunc3d(VGroup):
         # if self.arrow_show:
         #     self.remove(self.arrow)
 
-        # Remove existing spiral and add a collapsed version
-        self.remove(self.spiral)
-        collapsed_spiral = ParametricFunction(
-            self._spiral_func,
-            t_range=(t_min, t_min),
-            color=self.spiral_color
-        )
-        self.spiral = collapsed_spiral
-        self.spiral.set_z_index(1)
-        self.add(self.spiral)
+        # Cache the fully sampled and oriented spiral once. The spiral is sampled
+        # uniformly in t, so revealing up to t only means keeping a prefix of its
+        # cubic curves plus one partial curve at the growing tip.
+        full_points = self.spiral.points.copy()
+        reveal_buffer = full_points.copy()
+        n_points = self.spiral.n_points_per_cubic_curve
+        n_curves = len(full_points) // n_points
+        tip_start = 0
+
+        # Collapse the spiral onto its first point
+        self.spiral.points = np.tile(full_points[0], (n_points, 1))
 
-        # Define updater to dynamically extend the spiral
+        # Define updater to reveal the spiral up to the tracker value
         def partial_draw_updater(mob):
-            current_t = tracker.get_value()
-            new_spiral = ParametricFunction(
-                self._spiral_func,
-                t_range=(t_min, current_t),
-                color=self.spiral_color
+            nonlocal tip_start
+            alpha = np.clip((tracker.get_value() - t_min) / (t_max - t_min), 0, 1)
+            index, residue = integer_interpolate(0, n_curves, alpha)
+
+            # Restore the previously trimmed tip curve, then trim the new one
+            reveal_buffer[tip_start:tip_start + n_points] = full_points[tip_start:tip_start + n_points]
+            start = index * n_points
+            reveal_buffer[start:start + n_points] = partial_bezier_points(
+                full_points[start:start + n_points], 0, residue
             )
-            new_spiral.rotate(self.orientation[0] * DEGREES, axis=RIGHT, about_point=ORIGIN)
-            new_spiral.rotate(self.orientation[1] * DEGREES, axis=UP, about_point=ORIGIN)
-            new_spiral.rotate(self.orientation[2] * DEGREES, axis=OUT, about_point=ORIGIN)
-            new_spiral.shift(self.position)
-            mob.become(new_spiral.set_z_index(1))  # Keep spiral layered properly
+            tip_start = start
+            mob.points = reveal_buffer[:start + n_points]
 
         self.spiral.add_updater(partial_draw_updater)
 
@@ -193,7 +205,7 @@ class WaveFunc3d(VGroup):
 
         # Create a new spiral with updated parameters
         updated_func = self._make_spiral_func()
-        new_spiral = ParametricFunction(updated_func, t_range=(t_min, t_max), color=self.spiral_color)
+        new_spiral = ParametricFunction(updated_func, t_range=self._t_range(), color=self.spiral_color)
         self.spiral = new_spiral.move_to(self.position)
         self.spiral.set_z_index(1)
         self.add(self.spiral)
@@ -0,0 +1,367 @@
+from manim import *
+import numpy as np
+import scipy.fft
+from level_of_detail import lod_samples
+
+# Side of the invisible tripod a WavefunctionCurve carries to follow its own transforms
+_FRAME_SIZE = 1e-3
+
+
+def gaussian_packet(x, amplitude=1.0, spread=5, twist=0.5, center=0):
+    """
+    A Gaussian wave packet with a phase twist, sampled as complex values.
+
+        psi(x) = amplitude * exp(-(x - center)^2 / spread) * exp(2 pi i twist (x - center))
+
+    Args:
+        x (np.ndarray): The sample positions.
+        amplitude (float): The peak of |psi|.
+        spread (float): The Gaussian width parameter; the packet's 1/e half width is sqrt(spread).
+        twist (float): The turns of phase per unit x, which is the packet's mean momentum.
+        center (float): The packet's center.
+
+    Returns:
+        np.ndarray: The complex samples.
+    """
+    offset = np.asarray(x, dtype=float) - center
+    return amplitude * np.exp(-offset**2 / spread) * np.exp(2j * PI * twist * offset)
+
+
+def momentum_space(x, psi, k=None):
+    """
+    The momentum-space wavefunction phi(k) = integral of psi(x) exp(-2 pi i k x) dx, from one FFT.
+    k is in turns per unit x, like `twist`, and the transform keeps the norm of psi.
+
+    Args:
+        x (np.ndarray): Uniformly spaced sample positions. psi should be about zero at both ends,
+            so widen the grid rather than cutting a packet off.
+        psi (np.ndarray): The complex samples of psi at x.
+        k (np.ndarray): Momenta to interpolate phi at, by default the FFT's own momenta.
+
+    Returns:
+        tuple: The momenta and the complex samples of phi there.
+    """
+    dx = x[1] - x[0]
+    k_fft = np.fft.fftshift(np.fft.fftfreq(len(x), dx))
+    # The FFT takes the grid to start at 0; the phase factor moves it back to x[0]
+    phi = np.fft.fftshift(np.fft.fft(psi)) * dx * np.exp(-2j * PI * k_fft * x[0])
+    if k is None:
+        return k_fft, phi
+    return k, np.interp(k, k_fft, phi.real) + 1j * np.interp(k, k_fft, phi.imag)
+
+
+class SplitStepPropagator:
+    """
+    Evolves a 1D wavefunction under the time-dependent Schrodinger equation
+
+        i hbar dpsi/dt = -hbar^2 / (2 mass) d^2psi/dx^2 + V(x) psi
+
+    with the split-step Fourier method: half a potential kick, a full kinetic step in momentum
+    space, and another half kick. Each step is unitary, so the norm holds over any number of
+    steps, and both propagators are diagonal, so a step is two in-place FFTs and three
+    multiplications. The phase factors are computed once for each step size and reused.
+
+    The grid is periodic, so make it wide enough that the packet never reaches its ends.
+
+    Attributes:
+        x (np.ndarray): The uniformly spaced grid.
+        psi (np.ndarray): The wavefunction on the grid, evolved in place.
+        potential (np.ndarray): V on the grid.
+        time (float): How far psi has been evolved.
+        max_step (float): The largest step taken at once; longer steps, e.g. the single dt of a
+            skipped animation, are split into equal substeps no longer than this.
+    """
+
+    def __init__(self, x, psi, potential=None, hbar=1.0, mass=1.0, max_step=1 / 60):
+        self.x = np.asarray(x, dtype=float)
+        self.psi = np.array(psi, dtype=complex)
+        self.hbar = hbar
+        self.mass = mass
+        self.max_step = max_step
+        self.time = 0.0
+        # Angular wavenumbers in the FFT's own order
+        self._wavenumbers = 2 * PI * np.fft.fftfreq(len(self.x), self.x[1] - self.x[0])
+        self._spectrum = np.empty_like(self.psi)
+        self._factors = (None, None)
+        self.set_potential(potential)
+
+    def set_potential(self, potential):
+        """
+        Args:
+            potential: V as a function of an array of positions, an array on the grid, or None for
+                a free particle.
+
+        Returns:
+            SplitStepPropagator: self, for chaining.
+        """
+        if potential is None:
+            potential = np.zeros_like(self.x)
+        elif callable(potential):
+            potential = potential(self.x)
+        self.potential = np.broadcast_to(np.asarray(potential, dtype=float), self.x.shape)
+        self._factors = (None, None)
+        return self
+
+    def _phase_factors(self, dt):
+        """The half kick, full kick and kinetic step for steps of dt, kept until the step size changes."""
+        if self._factors[0] != dt:
+            half_kick = np.exp(-0.5j * dt * self.potential / self.hbar)
+            kinetic = np.exp(-0.5j * dt * self.hbar * self._wavenumbers**2 / self.mass)
+            self._factors = (dt, (half_kick, half_kick**2, kinetic))
+        return self._factors[1]
+
+    def step(self, dt):
+        """
+        Evolves psi in place by dt, in substeps no longer than `max_step`.
+
+        Returns:
+            SplitStepPropagator: self, for chaining.
+        """
+        if dt <= 0:
+            return self
+        n_steps = max(1, int(np.ceil(dt / self.max_step - 1e-9)))
+        half_kick, kick, kinetic = self._phase_factors(dt / n_steps)
+        psi = self.psi
+        # Consecutive half kicks merge into full kicks between the kinetic steps
+        psi *= half_kick
+        for i in range(n_steps):
+            spectrum = scipy.fft.fft(psi, overwrite_x=True)
+            spectrum *= kinetic
+            result = scipy.fft.ifft(spectrum, overwrite_x=True)
+            # overwrite_x lets scipy transform in place, which it does for complex arrays
+            if not np.shares_memory(result, psi):
+                np.copyto(psi, result)
+            psi *= kick if i < n_steps - 1 else half_kick
+        self.time += dt
+        return self
+
+    def spectrum(self):
+        """
+        The FFT of psi, in the FFT's order and without the grid's dx and phase factors. Written
+        into a buffer that the next call reuses.
+        """
+        np.copyto(self._spectrum, self.psi)
+        return scipy.fft.fft(self._spectrum, overwrite_x=True)
+
+    def updater(self, curve, window=slice(None), time_scale=1.0):
+        """
+        An updater that evolves psi by each frame's dt and streams it into a WavefunctionCurve.
+
+        Args:
+            curve (WavefunctionCurve): The curve drawing psi, sampled at x[window].
+            window (slice): The part of the grid the curve shows.
+            time_scale (float): Units of evolution time per second of scene time.
+
+        Returns:
+            function: The updater, to pass to `curve.add_updater`.
+        """
+        def evolve(mob, dt):
+            self.step(dt * time_scale)
+            mob.set_values(self.psi[window])
+        return evolve
+
+
+class WavefunctionCurve(VMobject):
+    """
+    A sampled wavefunction drawn from array data: Re psi against x in the plane, and Im psi out
+    of it when `complex_plane` is set.
+
+    New values are written straight into the curve's points, through the position, rotation and
+    scale the curve has been given since. A tiny invisible tripod submobject moves with the curve
+    and records that transform.
+
+    Attributes:
+        x (np.ndarray): The sample positions, in the curve's own coordinates.
+        values (np.ndarray): The complex samples shown.
+        complex_plane (bool): Whether Im psi is drawn along the curve's z axis.
+        frame (VMobject): The tripod marking the curve's origin and axes.
+    """
+
+    def __init__(self, x, values, complex_plane=False, color=BLUE_E, stroke_width=2, **kwargs):
+        super().__init__(**kwargs)
+        self.x = np.asarray(x, dtype=float)
+        self.complex_plane = complex_plane
+        self.frame = VMobject(stroke_opacity=0, fill_opacity=0)
+        self.frame.points = _FRAME_SIZE * np.array([ORIGIN, RIGHT, UP, OUT], dtype=float)
+        self.add(self.frame)
+
+        # Buffers reused by every redraw, so streaming new values allocates nothing
+        self._anchors = np.zeros((len(self.x), 3))
+        self._anchors[:, 0] = self.x
+        self._scene_anchors = np.empty_like(self._anchors)
+        self._steps = np.empty((len(self.x) - 1, 3))
+        self._points = np.empty((4 * (len(self.x) - 1), 3))
+        self.set_stroke(color, width=stroke_width)
+        self.set_values(values)
+
+    def set_values(self, values):
+        """
+        Redraws the curve for new samples at the same positions.
+
+        Args:
+            values (np.ndarray): The complex samples.
+
+        Returns:
+            WavefunctionCurve: self, for chaining.
+        """
+        self.values = np.asarray(values, dtype=complex)
+        self._anchors[:, 1] = self.values.real
+        self._anchors[:, 2] = self.values.imag if self.complex_plane else 0
+
+        origin = self.frame.points[0]
+        axes = (self.frame.points[1:] - origin) / _FRAME_SIZE
+        anchors = np.matmul(self._anchors, axes, out=self._scene_anchors)
+        anchors += origin
+
+        # Straight segments between the samples, as set_points_as_corners builds them
+        steps = np.subtract(anchors[1:], anchors[:-1], out=self._steps)
+        points = self._points
+        points[0::4] = anchors[:-1]
+        np.multiply(steps, 1 / 3, out=points[1::4])
+        points[1::4] += anchors[:-1]
+        np.multiply(steps, 2 / 3, out=points[2::4])
+        points[2::4] += anchors[:-1]
+        points[3::4] = anchors[1:]
+        self.points = points
+        return self
+
+
+class WavePacketPair(VGroup):
+    """
+    A Gaussian packet in position space and its momentum-space partner, computed from it
+    with an FFT.
+
+    The momentum panel sits `panel_gap` below the position panel and shows phi against
+    k - twist, stretched by `k_scale`. Changing `spread_tracker` squeezes or widens the position
+    packet. The norm is kept, and one FFT per frame redraws the momentum packet, so it widens
+    or narrows in exact inverse proportion. The product of the two widths stays at the
+    Heisenberg bound.
+
+        packets = WavePacketPair(spread=5, twist=0.5)
+        self.play(packets.spread_tracker.animate.set_value(5 * 0.3**2))  # position 0.3x as wide
+
+    `evolve` then hands the packet to a SplitStepPropagator, and from then on both panels follow
+    the Schrodinger equation, e.g. to show dispersion or tunnelling.
+
+    Attributes:
+        x (np.ndarray): The position samples shown.
+        k (np.ndarray): The momenta shown, at the same panel positions as x.
+        k_scale (float): Panel units per unit of momentum.
+        position_curve (WavefunctionCurve): psi(x).
+        momentum_curve (WavefunctionCurve): phi(k), scaled to the position panel's height.
+        spread_tracker (ValueTracker): The spread of the position packet.
+        propagator (SplitStepPropagator): The time evolution once `evolve` was called, else None.
+    """
+
+    def __init__(
+        self,
+        x_range=(-4, 4),
+        amplitude=1.0,
+        spread=5,
+        twist=0.5,
+        n_samples=None,
+        n_fft=None,
+        k_scale=None,
+        complex_plane=False,
+        panel_gap=2.5,
+        position_color=BLUE_E,
+        momentum_color=RED_E,
+        stroke_width=2,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.amplitude = amplitude
+        self.twist = twist
+        self.initial_spread = spread
+        x_min, x_max = x_range
+        center = (x_min + x_max) / 2
+        self.center = center
+        self.x = np.linspace(x_min, x_max, (lod_samples(200) if n_samples is None else n_samples) + 1)
+
+        # The FFT grid extends the shown one, by default to 8x its size, so packets fit whole however wide they get
+        dx = self.x[1] - self.x[0]
+        n_fft = 1 << int(np.ceil(np.log2(8 * len(self.x)))) if n_fft is None else n_fft
+        pad = (n_fft - len(self.x)) // 2
+        self._x_fft = x_min + dx * (np.arange(n_fft) - pad)
+        self._shown = slice(pad, pad + len(self.x))
+
+        # By default the momentum packet starts a quarter as wide as the position packet, with room to widen
+        self.k_scale = PI * spread / 4 if k_scale is None else k_scale
+        self.k = twist + (self.x - center) / self.k_scale
+
+        psi = self._position_values(spread)
+        _, phi = momentum_space(self._x_fft, psi, self.k)
+        self._momentum_height = amplitude / np.abs(phi).max()
+        self.spread = spread
+        self.position_curve = WavefunctionCurve(self.x, psi[self._shown], complex_plane, position_color, stroke_width)
+        self.momentum_curve = WavefunctionCurve(
+            self.x, self._momentum_height * phi, complex_plane, momentum_color, stroke_width
+        ).shift(panel_gap * DOWN)
+        self.add(self.position_curve, self.momentum_curve)
+
+        self.spread_tracker = ValueTracker(spread)
+        self.propagator = None
+        self.add_updater(lambda mob: mob.set_spread(mob.spread_tracker.get_value()))
+
+    def _position_values(self, spread):
+        """psi on the FFT grid, with the norm of the initial packet."""
+        amplitude = self.amplitude * (self.initial_spread / spread) ** 0.25
+        return gaussian_packet(self._x_fft, amplitude, spread, self.twist, self.center)
+
+    def set_spread(self, spread):
+        """
+        Redraws both panels for a new spread of the position packet.
+
+        Args:
+            spread (float): The Gaussian width parameter of psi.
+
+        Returns:
+            WavePacketPair: self, for chaining.
+        """
+        if spread == self.spread:
+            return self
+        psi = self._position_values(spread)
+        _, phi = momentum_space(self._x_fft, psi, self.k)
+        self.position_curve.set_values(psi[self._shown])
+        self.momentum_curve.set_values(self._momentum_height * phi)
+        self.spread = spread
+        return self
+
+    def evolve(self, potential=None, time_scale=1.0):
+        """
+        Lets the position packet evolve under the Schrodinger equation from its current shape,
+        in place of the spread updater. psi streams from a SplitStepPropagator on the FFT grid
+        into the position curve every frame, and the momentum curve is interpolated from one
+        more FFT, through buffers set up here, so frames allocate nothing.
+
+        Args:
+            potential: V(x), as for SplitStepPropagator, in the position panel's units.
+            time_scale (float): Units of evolution time (hbar = mass = 1) per second of scene time.
+
+        Returns:
+            SplitStepPropagator: The propagator, e.g. to change the potential later.
+        """
+        self.propagator = SplitStepPropagator(self._x_fft, self._position_values(self.spread), potential)
+
+        # Linear interpolation from the FFT bins to the shown momenta, with momentum_space's factors
+        dx = self._x_fft[1] - self._x_fft[0]
+        frequencies = np.fft.fftfreq(len(self._x_fft), dx)
+        order = np.argsort(frequencies)
+        above = np.clip(np.searchsorted(frequencies[order], self.k), 1, len(order) - 1)
+        lower, upper = order[above - 1], order[above]
+        weights = (self.k - frequencies[lower]) / (frequencies[upper] - frequencies[lower])
+        scale = self._momentum_height * dx * np.exp(-2j * PI * frequencies * self._x_fft[0])
+        lower_weights, upper_weights = (1 - weights) * scale[lower], weights * scale[upper]
+        phi, upper_phi = np.empty(len(self.k), dtype=complex), np.empty(len(self.k), dtype=complex)
+
+        def evolve(mob, dt):
+            mob.propagator.step(dt * time_scale)
+            mob.position_curve.set_values(mob.propagator.psi[mob._shown])
+            spectrum = mob.propagator.spectrum()
+            np.multiply(np.take(spectrum, lower, out=phi), lower_weights, out=phi)
+            np.multiply(np.take(spectrum, upper, out=upper_phi), upper_weights, out=upper_phi)
+            mob.momentum_curve.set_values(np.add(phi, upper_phi, out=phi))
+
+        self.clear_updaters()
+        self.add_updater(evolve)
+        return self.propagator